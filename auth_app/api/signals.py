@@ -13,4 +13,12 @@ def create_user_profile(sender, instance: CustomUser, created, **kwargs):
             username=instance.username,   
             email=instance.email or "",   
             type=instance.type,           
-        )
\ No newline at end of file
+        )
+
+
+@receiver(post_save, sender=CustomUser)
+def sync_user_profile_type(sender, instance: CustomUser, created, update_fields=None, **kwargs):
+    """Keep UserProfile.type (indexed, used by the profile lists) equal to the user's type."""
+    if created or (update_fields is not None and 'type' not in update_fields):
+        return
+    UserProfile.objects.filter(user=instance).exclude(type=instance.type).update(type=instance.type)
\ No newline at end of file
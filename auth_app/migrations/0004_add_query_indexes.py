@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('auth_app', '0003_alter_customuser_options'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['type'], name='user_type_idx'),
+        ),
+    ]
@@ -20,6 +20,9 @@ class CustomUser(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["id"]  
+        indexes = [
+            models.Index(fields=["type"], name="user_type_idx"),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.type})"
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -99,6 +100,32 @@ DATABASES = {
 }
 
 
+# Cache
+# The offers list response cache should be shared by every worker process. Its
+# namespace version lives in the database (offers_app.OfferListVersion), so
+# invalidations reach every worker with any backend; a per-process LocMemCache
+# just caches each page once per worker. The default is file-based (shared by
+# all workers on one host); for several hosts use Redis, e.g.
+# OFFERS_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# OFFERS_CACHE_LOCATION=redis://127.0.0.1:6379/1
+# Tests use a fresh directory per run (core.test_runner.TestRunner).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'offers': {
+        'BACKEND': os.environ.get('OFFERS_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('OFFERS_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'coderr-offers-list')),
+        'TIMEOUT': int(os.environ.get('OFFERS_CACHE_TIMEOUT', 300)),
+    },
+}
+
+OFFERS_LIST_CACHE_ALIAS = 'offers'
+
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,29 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner that gives every test run its own offers cache directory.
+
+    The file-based default would otherwise share cached pages and hit/miss
+    counters with a local server and with other test runs.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        """Point CACHES['offers'] at a fresh temporary directory."""
+        super().setup_test_environment(**kwargs)
+        self._offers_cache_dir = tempfile.mkdtemp(prefix='coderr-offers-test-')
+        caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+        caches['offers']['LOCATION'] = self._offers_cache_dir
+        self._offers_cache_override = override_settings(CACHES=caches)
+        self._offers_cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        """Restore CACHES and remove the temporary directory."""
+        self._offers_cache_override.disable()
+        shutil.rmtree(self._offers_cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,131 @@
+import json
+from itertools import islice
+
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from offers_app.models import Offer, OfferDetail
+from .cache import offers_list_cache
+from .serializers import OfferSerializer
+
+
+class InvalidRow:
+    """Placeholder for an input row that could not be decoded."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def iter_ndjson(lines):
+    """Yield one decoded object per non-blank NDJSON line (InvalidRow on bad JSON)."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield InvalidRow(f'Invalid JSON: {exc}')
+
+
+class OfferBulkImporter:
+    """Validate and insert many offers with their three details.
+
+    Rows are validated with OfferSerializer field rules plus the same
+    `_validate_details_on_create` check as `POST /api/offers/`. Valid rows
+    are inserted chunk by chunk with bulk_create (one transaction per
+    chunk); min_price/min_delivery_time are computed in memory, so no
+    per-offer recalculation query runs. Every input row gets a result.
+    """
+    default_chunk_size = 500
+
+    def __init__(self, user, chunk_size=None):
+        self.user = user
+        self.chunk_size = chunk_size or self.default_chunk_size
+        self.results = []
+
+    @property
+    def created_count(self):
+        """Number of rows inserted so far."""
+        return sum(1 for r in self.results if r['status'] == 'created')
+
+    @property
+    def failed_count(self):
+        """Number of rows rejected so far."""
+        return sum(1 for r in self.results if r['status'] == 'error')
+
+    def run(self, rows):
+        """Import an iterable of row dicts; return the per-row results."""
+        rows = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+        self.results.sort(key=lambda r: r['row'])
+        return self.results
+
+    def validate_row(self, row):
+        """Return (validated_data, None) or (None, errors) for one input row."""
+        if isinstance(row, InvalidRow):
+            return None, {'non_field_errors': [row.message]}
+        if not isinstance(row, dict):
+            return None, {'non_field_errors': ['Each row must be a JSON object.']}
+        details = row.get('details')
+        if isinstance(details, list) and not all(
+            isinstance(d, dict) and isinstance(d.get('offer_type'), (str, type(None))) for d in details
+        ):
+            return None, {'details': ['Each detail must be an object with a string offer_type.']}
+        serializer = OfferSerializer(data=row)
+        try:
+            serializer._validate_details_on_create(details, serializer._allowed_detail_types())
+        except serializers.ValidationError as exc:
+            return None, exc.detail
+        if not serializer.is_valid():
+            return None, serializer.errors
+        return serializer.validated_data, None
+
+    def _import_chunk(self, chunk):
+        """Validate a chunk, then insert its valid rows in one transaction."""
+        valid = []
+        for row_no, row in chunk:
+            data, errors = self.validate_row(row)
+            if errors is not None:
+                self.results.append({'row': row_no, 'status': 'error', 'errors': errors})
+            else:
+                valid.append((row_no, data))
+        if not valid:
+            return
+
+        try:
+            with transaction.atomic():
+                offers = Offer.objects.bulk_create([self._build_offer(data) for _, data in valid])
+                OfferDetail.objects.bulk_create([
+                    OfferDetail(offer=offer, **detail)
+                    for offer, (_, data) in zip(offers, valid)
+                    for detail in data['details']
+                ])
+                transaction.on_commit(offers_list_cache.invalidate)
+        except DatabaseError as exc:
+            self.results.extend(
+                {'row': row_no, 'status': 'error', 'errors': {'non_field_errors': [str(exc)]}}
+                for row_no, _ in valid
+            )
+            return
+
+        self.results.extend(
+            {'row': row_no, 'status': 'created', 'id': offer.id}
+            for offer, (row_no, _) in zip(offers, valid)
+        )
+
+    def _build_offer(self, data):
+        """Build an unsaved Offer with summary fields computed from its details."""
+        fields = {k: v for k, v in data.items() if k != 'details'}
+        details = data['details']
+        return Offer(
+            user=self.user,
+            min_price=min(d.get('price', 0) for d in details),
+            min_delivery_time=min(d.get('delivery_time_in_days', 0) for d in details),
+            **fields,
+        )
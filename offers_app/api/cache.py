@@ -0,0 +1,106 @@
+import hashlib
+import threading
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from offers_app.models import OfferListVersion
+
+
+class OffersListCache:
+    """Shared response cache for `GET /api/offers/`.
+
+    Entries are keyed on the request's base URL plus its normalized query
+    string (params and values sorted) inside a version namespace. Any write
+    to Offer/OfferDetail bumps the version, which orphans every old entry at
+    once; they then expire via the cache TIMEOUT. The version is a database
+    row (OfferListVersion): bumps are atomic across workers and it cannot be
+    culled like a cache entry.
+    The backend is whatever CACHES[OFFERS_LIST_CACHE_ALIAS] configures and
+    should be shared by all workers: file-based (default, one host) or Redis.
+    Hit/miss counts are kept per process and added to the shared counters
+    every `stats_flush_every` lookups, so a cached GET does not write them.
+    """
+    hits_key = 'offers:list:hits'
+    misses_key = 'offers:list:misses'
+    stats_flush_every = 100
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """Return the configured Django cache backend."""
+        return caches[getattr(settings, 'OFFERS_LIST_CACHE_ALIAS', 'default')]
+
+    def version(self):
+        """Return the current namespace version."""
+        return OfferListVersion.objects.current()
+
+    def fingerprint(self, request):
+        """Return a digest of the base URL plus the normalized query string."""
+        params = sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k))
+        raw = f"{request.build_absolute_uri(request.path)}?{urlencode(params)}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def key_for(self, request, version=None):
+        """Build the cache key for a list request in the given (default: current) namespace."""
+        if version is None:
+            version = self.version()
+        return f'offers:list:v{version}:{self.fingerprint(request)}'
+
+    def get(self, key):
+        """Return the cached entry or None, counting the hit/miss."""
+        data = self.cache.get(key)
+        self._count(self.hits_key if data is not None else self.misses_key)
+        return data
+
+    def set(self, key, data):
+        """Store an entry under key using the backend's TIMEOUT."""
+        self.cache.set(key, data)
+
+    def invalidate(self):
+        """Move to a fresh namespace so every cached page is ignored."""
+        OfferListVersion.objects.bump()
+
+    def stats(self):
+        """Return hit/miss counters and the current namespace version."""
+        self.flush_stats()
+        hits = self.cache.get(self.hits_key, 0)
+        misses = self.cache.get(self.misses_key, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+            'version': self.version(),
+        }
+
+    def flush_stats(self):
+        """Add this process's pending hit/miss counts to the shared counters."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        for key, n in pending.items():
+            self._incr(key, n)
+
+    def _count(self, key):
+        """Count a lookup locally; flush once enough have accumulated."""
+        with self._lock:
+            self._pending[key] += 1
+            due = self._pending.total() >= self.stats_flush_every
+        if due:
+            self.flush_stats()
+
+    def _incr(self, key, delta):
+        """Increment a shared counter, creating it (without expiry) if missing."""
+        try:
+            self.cache.incr(key, delta)
+        except ValueError:
+            if not self.cache.add(key, delta, timeout=None):
+                self.cache.incr(key, delta)
+
+
+offers_list_cache = OffersListCache()
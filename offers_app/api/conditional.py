@@ -0,0 +1,46 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_validators(*parts, last_modified=None):
+    """Return (quoted ETag, Last-Modified timestamp) for the given version parts."""
+    digest = hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    return quote_etag(digest), timestamp
+
+
+class ConditionalGetMixin:
+    """Answer GETs with 304 Not Modified when the client's copy is current.
+
+    Views implement `get_validators()` with a cheap query (timestamps only)
+    and route their GET handler through `conditional_response()`. A 304 is
+    returned before any serializer is instantiated; 200 responses carry the
+    ETag and Last-Modified headers.
+    """
+
+    def get_validators(self):
+        """Return (etag, last_modified_timestamp), or None if the object is missing."""
+        raise NotImplementedError
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        """Return 304 if If-None-Match/If-Modified-Since match, else run handler."""
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        return self.finalize_conditional(request, validators, lambda: handler(request, *args, **kwargs))
+
+    def finalize_conditional(self, request, validators, build_response):
+        """Compare validators with the request, building the full response only if needed."""
+        etag, last_modified = validators
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = build_response()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,92 @@
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+
+from offers_app.models import Offer, OfferDetail
+
+FACETS_PARAM = 'facets'
+# Bucket edges: each bucket is half-open (from, to], so fractional prices match
+# their label; values above the last edge land in an open bucket
+PRICE_EDGES = (50, 100, 250, 500, 1000)
+DELIVERY_TIME_EDGES = (1, 3, 7, 14, 30)
+CREATOR_LIMIT = 20
+FACETS = ('price', 'delivery_time', 'creator')
+
+
+def requested_facets(request):
+    """Return the facet names from `?facets=`, or [] if none were asked for."""
+    names = [n.strip() for n in request.query_params.get(FACETS_PARAM, '').split(',') if n.strip()]
+    unknown = sorted(set(names) - set(FACETS))
+    if unknown:
+        raise ValidationError({FACETS_PARAM: f'Unknown facet(s): {", ".join(unknown)}. Use {", ".join(FACETS)}.'})
+    return [n for n in FACETS if n in names]
+
+
+def _bucket_case(column, edges):
+    """SQL CASE mapping column to its bucket index (NULL stays NULL)."""
+    whens = ' '.join(f'WHEN {column} <= {int(edge)} THEN {i}' for i, edge in enumerate(edges))
+    return f'CASE WHEN {column} IS NULL THEN NULL {whens} ELSE {len(edges)} END'
+
+
+def _buckets(edges, counts):
+    """Return every fixed bucket as {from, to, count} for from < value <= to, including empty ones."""
+    out, lower = [], None
+    for i, edge in enumerate(edges):
+        out.append({'from': lower, 'to': edge, 'count': counts.get(i, 0)})
+        lower = edge
+    out.append({'from': lower, 'to': None, 'count': counts.get(len(edges), 0)})
+    return out
+
+
+def compute_facets(queryset, names):
+    """Count offers per bucket for each requested facet in one grouped statement.
+
+    The filtered/searched queryset becomes an `id IN (...)` subquery. Each
+    offer row is paired with one row per requested facet, and a single
+    GROUP BY (facet, bucket) counts distinct offers. Details are joined
+    only on the delivery_time rows, the owner only on the creator rows.
+    """
+    if not names:
+        return {}
+    qn = connection.ops.quote_name
+    offer, detail = Offer._meta, OfferDetail._meta
+    user = offer.get_field('user').related_model._meta
+    o_id, o_user = f'o.{qn(offer.pk.column)}', f'o.{qn(offer.get_field("user").column)}'
+    price = _bucket_case(f'o.{qn(offer.get_field("min_price").column)}', PRICE_EDGES)
+    delivery = _bucket_case(f'd.{qn(detail.get_field("delivery_time_in_days").column)}', DELIVERY_TIME_EDGES)
+    bucket = f"CASE k.facet WHEN 'price' THEN {price} WHEN 'delivery_time' THEN {delivery} ELSE {o_user} END"
+    username = f'u.{qn(user.get_field("username").column)}'
+    detail_offer = f'd.{qn(detail.get_field("offer").column)}'
+
+    facet_rows = ' UNION ALL '.join('SELECT CAST(%s AS VARCHAR(20)) AS facet' for _ in names)
+    ids_sql, ids_params = queryset.order_by().values('pk').query.sql_with_params()
+    sql = (
+        f"SELECT k.facet, {bucket} AS bucket, COUNT(DISTINCT {o_id}), MAX({username}) "
+        f"FROM {qn(offer.db_table)} o "
+        f"CROSS JOIN ({facet_rows}) k "
+        f"LEFT JOIN {qn(detail.db_table)} d "
+        f"ON k.facet = 'delivery_time' AND {detail_offer} = {o_id} "
+        f"LEFT JOIN {qn(user.db_table)} u ON k.facet = 'creator' AND u.{qn(user.pk.column)} = {o_user} "
+        f"WHERE {o_id} IN ({ids_sql}) "
+        f"GROUP BY k.facet, bucket"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*names, *ids_params])
+        rows = cursor.fetchall()
+
+    counts = {name: {} for name in names}
+    labels = {}
+    for facet, key, count, username in rows:
+        if key is not None:
+            counts[facet][int(key)] = count
+            if facet == 'creator':
+                labels[int(key)] = username
+
+    result = {}
+    if 'price' in counts:
+        result['price'] = _buckets(PRICE_EDGES, counts['price'])
+    if 'delivery_time' in counts:
+        result['delivery_time'] = _buckets(DELIVERY_TIME_EDGES, counts['delivery_time'])
+    if 'creator' in counts:
+        top = sorted(counts['creator'].items(), key=lambda item: (-item[1], item[0]))[:CREATOR_LIMIT]
+        result['creator'] = [{'id': pk, 'username': labels[pk], 'count': n} for pk, n in top]
+    return result
@@ -1,6 +1,10 @@
 from django_filters import rest_framework as filters
-from django.db.models import Q
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
 from ..models import Offer
+from .search import FTS_TABLE, search_tokens, fts5_match_query, pg_tsquery, pg_search_vector, PG_SEARCH_CONFIG
 
 
 class OfferFilter(filters.FilterSet):
@@ -16,10 +20,62 @@ class OfferFilter(filters.FilterSet):
 
     def filter_max_delivery_time(self, queryset, name, value):
         """Filter offers that have at least one OfferDetail with
-        delivery_time_in_days <= value. Uses DISTINCT to avoid duplicates.
+        delivery_time_in_days <= value.
+
+        Answered from the maintained per-offer `min_delivery_time` column
+        (min over the offer's details), so no join and no DISTINCT needed.
         """
         if value is None:
             return queryset
-        return queryset.filter(details__delivery_time_in_days__lte=value).distinct()
+        return queryset.filter(min_delivery_time__lte=value)
+
+
+class OfferSearchFilter(SearchFilter):
+    """Full-text `?search=` over offer title/description.
+
+    Uses the FTS5 table on SQLite and the GIN tsvector index on PostgreSQL.
+    Every word is matched as a prefix and all words must match. Results are
+    ranked by relevance unless the client asks for an explicit `?ordering=`.
+    Other backends fall back to the default icontains search.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Restrict to indexed matches and annotate `search_rank`."""
+        tokens = search_tokens(self.get_search_terms(request))
+        if not tokens:
+            return queryset
+
+        vendor = connection.vendor
+        if vendor == 'sqlite':
+            queryset = self._filter_sqlite(queryset, tokens)
+        elif vendor == 'postgresql':
+            queryset = self._filter_postgresql(queryset, tokens)
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('search_rank', '-created_at')
+        return queryset
+
+    def _filter_sqlite(self, queryset, tokens):
+        """Match via FTS5; bm25() is lower-is-better, so ascending order works."""
+        match = fts5_match_query(tokens)
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = offers_app_offer.id',
+                (match,),
+            )
+        )
+
+    def _filter_postgresql(self, queryset, tokens):
+        """Match via tsvector @@ tsquery; negate ts_rank for ascending order."""
+        from django.contrib.postgres.search import SearchQuery, SearchRank
 
-      
+        query = SearchQuery(pg_tsquery(tokens), search_type='raw', config=PG_SEARCH_CONFIG)
+        vector = pg_search_vector()
+        return queryset.annotate(search_vector=vector).filter(
+            search_vector=query
+        ).annotate(search_rank=-SearchRank(vector, query))
@@ -0,0 +1,128 @@
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from PIL import Image, ImageOps
+
+from offers_app.models import Offer
+from .cache import offers_list_cache
+
+logger = logging.getLogger(__name__)
+
+# name -> (max width, max height); images are only ever scaled down
+VARIANT_SIZES = {
+    'thumbnail': (160, 160),
+    'card': (480, 360),
+    'full': (1600, 1600),
+}
+VARIANT_FORMAT = 'WEBP'
+VARIANT_EXTENSION = 'webp'
+VARIANT_QUALITY = 80
+
+_executor = None
+
+
+def render_variant(image, size):
+    """Return the encoded bytes of `image` scaled to fit within size."""
+    variant = image.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    if variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGBA' if 'A' in variant.getbands() else 'RGB')
+    out = io.BytesIO()
+    variant.save(out, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+    return out.getvalue()
+
+
+def build_variants(source_name, storage=None):
+    """Render and store every variant of one source image; return {variant: name}.
+
+    File names are the SHA-256 of the encoded bytes, so a name never points
+    to different content and can be served with far-future cache headers.
+    Touches storage only (no database), so it is safe in a worker process.
+    """
+    storage = storage or default_storage
+    with storage.open(source_name, 'rb') as fh:
+        image = ImageOps.exif_transpose(Image.open(fh))
+        image.load()
+
+    names = {}
+    for variant, size in VARIANT_SIZES.items():
+        content = render_variant(image, size)
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        name = f'offer_images/{variant}/{digest}.{VARIANT_EXTENSION}'
+        if not storage.exists(name):
+            storage.save(name, ContentFile(content))
+        names[variant] = name
+    return names
+
+
+def save_variants(offer_id, source_name, names):
+    """Store variant names on the offer if its image is still source_name.
+
+    Bumps updated_at so ETags change, and invalidates the list cache.
+    Returns True if the offer was updated.
+    """
+    updated = Offer.objects.filter(pk=offer_id, image=source_name).update(
+        image_variants={'source': source_name, **names},
+        updated_at=timezone.now(),
+    )
+    if updated:
+        transaction.on_commit(offers_list_cache.invalidate)
+    return bool(updated)
+
+
+def generate_variants(offer_id, source_name):
+    """Build and save the variants for one offer; log instead of raising."""
+    try:
+        save_variants(offer_id, source_name, build_variants(source_name))
+    except Exception:
+        logger.exception('Could not build image variants for offer %s (%s)', offer_id, source_name)
+
+
+def _run_in_background(offer_id, source_name):
+    """Worker-thread entry point: own DB connection, closed afterwards."""
+    close_old_connections()
+    try:
+        generate_variants(offer_id, source_name)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(offer):
+    """Queue variant generation for offer.image after the current transaction commits.
+
+    Runs on a small in-process thread pool so the upload request returns
+    immediately; OFFER_IMAGE_VARIANTS_ASYNC = False runs it inline instead.
+    """
+    global _executor
+    offer_id, source_name = offer.pk, offer.image.name
+    if not getattr(settings, 'OFFER_IMAGE_VARIANTS_ASYNC', True):
+        transaction.on_commit(lambda: generate_variants(offer_id, source_name))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='offer-images')
+    transaction.on_commit(lambda: _executor.submit(_run_in_background, offer_id, source_name))
+
+
+def variant_urls(variants, image_name, request=None, storage=None):
+    """Map stored variant names to (absolute) URLs.
+
+    None if none exist yet or if they were rendered from a previous image
+    (`source` differs from the current image_name) and are being replaced.
+    """
+    if not variants or not image_name or variants.get('source') != image_name:
+        return None
+    storage = storage or default_storage
+    urls = {}
+    for variant in VARIANT_SIZES:
+        name = variants.get(variant)
+        url = storage.url(name) if name else None
+        urls[variant] = request.build_absolute_uri(url) if request is not None and url else url
+    return urls
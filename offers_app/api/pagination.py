@@ -1,8 +1,21 @@
 from rest_framework.pagination import PageNumberPagination
 
+from shared_app.pagination import KeysetPagination
+
+
 class OffersGetPagination(PageNumberPagination):
     """Custom pagination for offers with default page size of 6."""
     page_size = 6
     page_size_query_param = 'page_size'
     max_page_size = 100
-    page_query_param = 'page'
\ No newline at end of file
+    page_query_param = 'page'
+
+
+class OffersKeysetPagination(KeysetPagination):
+    """Opt-in keyset (cursor) pagination for offers, enabled via `?cursor=`.
+
+    Same page sizes as OffersGetPagination; see KeysetPagination.
+    """
+    page_size = OffersGetPagination.page_size
+    page_size_query_param = OffersGetPagination.page_size_query_param
+    max_page_size = OffersGetPagination.max_page_size
@@ -0,0 +1,16 @@
+from rest_framework.parsers import BaseParser
+
+from .bulk import iter_ndjson
+
+
+class NDJSONParser(BaseParser):
+    """Parse newline-delimited JSON into a list of row objects.
+
+    Undecodable lines become `InvalidRow` entries so they can be reported
+    per row instead of failing the whole request.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Return one entry per non-blank line of the request body."""
+        return list(iter_ndjson(stream))
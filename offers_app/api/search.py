@@ -0,0 +1,103 @@
+import re
+
+from django.db import connection
+
+FTS_TABLE = 'offers_app_offer_fts'
+PG_SEARCH_CONFIG = 'simple'
+PG_SEARCH_INDEX = 'offers_offer_search_gin'
+
+# External-content FTS5 table plus triggers that keep it in sync with
+# offers_app_offer on every insert/update/delete (admin and shell included).
+SQLITE_INSTALL_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='offers_app_offer', content_rowid='id', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON offers_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON offers_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON offers_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+SQLITE_UNINSTALL_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(terms):
+    """Split raw search terms into plain word tokens (no operators/quotes)."""
+    tokens = []
+    for term in terms:
+        tokens.extend(t.lower() for t in _TOKEN_RE.findall(term))
+    return tokens
+
+
+def fts5_match_query(tokens):
+    """Build an FTS5 MATCH expression: every token as quoted prefix, AND-ed."""
+    return ' '.join(f'"{t}"*' for t in tokens)
+
+
+def pg_tsquery(tokens):
+    """Build a raw to_tsquery expression: every token as prefix, AND-ed."""
+    return ' & '.join(f'{t}:*' for t in tokens)
+
+
+def pg_search_vector():
+    """Return the tsvector expression the GIN index is built on."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('title', 'description', config=PG_SEARCH_CONFIG)
+
+
+def install_search_index(schema_editor, offer_model):
+    """Create the backend-specific full-text index (idempotent on SQLite).
+
+    SQLite rebuilds a table when a migration alters it, which drops its
+    triggers; migrations doing so should call this again afterwards.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_INSTALL_SQL:
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        schema_editor.add_index(offer_model, GinIndex(pg_search_vector(), name=PG_SEARCH_INDEX))
+
+
+def uninstall_search_index(schema_editor, offer_model):
+    """Drop the backend-specific full-text index."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_UNINSTALL_SQL:
+            schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {PG_SEARCH_INDEX}')
+
+
+def rebuild_search_index():
+    """Rebuild the full-text index from offers_app_offer.
+
+    Returns the backend vendor that was handled, or None if unsupported.
+    """
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            for sql in SQLITE_INSTALL_SQL:
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+            return vendor
+        if vendor == 'postgresql':
+            cursor.execute(f'REINDEX INDEX {PG_SEARCH_INDEX}')
+            return vendor
+    return None
@@ -1,13 +1,15 @@
 from decimal import Decimal
 from django.db import transaction
-from collections import OrderedDict
-from urllib.parse import urlparse
+from django.utils import timezone
 
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 
 from offers_app.models import Offer, OfferDetail
 from auth_app.models import CustomUser
+from shared_app.sparse_fields import SparseFieldsetSerializerMixin
+from shared_app.projection import ProjectionSerializerMixin
+from .images import variant_urls
 
 class OfferDetailSerializer(serializers.ModelSerializer):
     """Serializer for a single OfferDetail (pricing tier)."""
@@ -78,51 +80,99 @@ class OfferDetailSerializer(serializers.ModelSerializer):
             return offer_serializer.data
         return super().to_representation(instance)
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(SparseFieldsetSerializerMixin, ProjectionSerializerMixin, serializers.ModelSerializer):
     """Serializer for Offer with nested OfferDetails handling and summaries."""
 
     details = OfferDetailSerializer(many=True, write_only=True, required=False)
     user_details = serializers.SerializerMethodField(read_only=True)
+    image_variants = serializers.SerializerMethodField(read_only=True)
+
+    sparse_columns = {
+        'details': (),
+        'user_details': ('user', 'user__username', 'user__first_name', 'user__last_name'),
+        'image_variants': ('image_variants', 'image'),
+    }
+    projection_columns = {
+        'details': ('id',),
+        'image_variants': ('image_variants', 'image'),
+        'user_details': ('user__first_name', 'user__last_name', 'user__username'),
+    }
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
-        read_only_fields = ('id', 'user', 'created_at', 'updated_at', 'min_price', 'min_delivery_time', 'user_details')
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        read_only_fields = ('id', 'user', 'created_at', 'updated_at', 'min_price', 'min_delivery_time', 'user_details', 'image_variants')
     
     def get_user_details(self, obj):
         """Expose lightweight user info for the offer owner."""
         u: CustomUser = obj.user
+        return self.project_user_details(u.first_name, u.last_name, u.username)
+
+    def get_image_variants(self, obj):
+        """Expose URLs of the resized image variants (None until generated)."""
+        return self.project_image_variants(obj.image_variants, obj.image.name)
+
+    def project_image_variants(self, variants, image_name):
+        """Build the variant URL map from the stored variant names (only if they belong to image_name)."""
+        return variant_urls(variants, image_name, self.context.get('request'))
+
+    def project_user_details(self, first_name, last_name, username):
+        """Build `user_details` from the owner's name columns."""
         return {
-            "first_name": u.first_name or "",
-            "last_name": u.last_name or "",
-            "username": u.username,
+            "first_name": first_name or "",
+            "last_name": last_name or "",
+            "username": username,
         }
 
+    def prepare_projection(self, rows):
+        """Load the thin detail links for a page of value rows in one query."""
+        if 'details' not in self.fields:
+            return
+        template = self._detail_url_template()
+        pk = self.projection_index['id']
+        self._projected_details = {row[pk]: [] for row in rows}
+        links = (
+            OfferDetail.objects.filter(offer_id__in=list(self._projected_details))
+            .order_by('offer_id', 'id').values_list('offer_id', 'id')
+        )
+        for offer_id, detail_id in links:
+            self._projected_details[offer_id].append({"id": detail_id, "url": template.format(detail_id)})
+
+    def project_details(self, pk):
+        """Return the thin detail links prepared for this offer."""
+        return self._projected_details[pk]
+
     def _thin_details(self, instance):
-        """Return minimal detail objects with id and URL, optimized for list views."""
-        request = self.context.get('request')
-        has_pk = request and request.parser_context and request.parser_context.get('kwargs', {}).get('pk')
+        """Return minimal detail objects with id and URL, optimized for list views.
 
-        items = []
-        for d in instance.details.all().only('id'):
-            url = self._detail_url_for_item(d.id, request, bool(has_pk))
-            items.append({"id": d.id, "url": url})
-        return items
+        Reads `instance.details.all()` so the view's prefetch cache is used
+        (no per-offer query) and formats URLs from a template built once.
+        """
+        template = self._detail_url_template()
+        return [{"id": d.id, "url": template.format(d.id)} for d in instance.details.all()]
 
-    def _detail_url_for_item(self, detail_id, request, has_pk):
-        """Build absolute URL when viewing a single offer, else relative path.
+    def _detail_url_template(self):
+        """Return a cached '{}'-template for OfferDetail URLs.
 
         Mirrors previous behavior: absolute URL with request for retrieve views,
-        relative path without leading 'api/' for list views.
+        relative path without leading 'api/' for list views. Resolved with
+        reverse() once per serializer instead of once per detail.
         """
-        rel_url = reverse('offers:offerdetail-detail', args=[detail_id], request=request if has_pk else None)
-        if has_pk:
-            return rel_url
-        path = urlparse(rel_url).path.lstrip('/')
-        if path.startswith('api/'):
-            path = path[3:]
-        return path
+        template = getattr(self, '_detail_url_template_cache', None)
+        if template is not None:
+            return template
 
+        request = self.context.get('request')
+        has_pk = request and request.parser_context and request.parser_context.get('kwargs', {}).get('pk')
+        url = reverse('offers:offerdetail-detail', args=[0], request=request if has_pk else None)
+        if not has_pk:
+            url = url.lstrip('/')
+            if url.startswith('api/'):
+                url = url[3:]
+        head, _, tail = url.rpartition('/0/')
+        template = f'{head}/{{}}/{tail}'
+        self._detail_url_template_cache = template
+        return template
 
     def _full_details(self, instance):
         """Return full nested details payload for create/update responses."""
@@ -197,13 +247,15 @@ class OfferSerializer(serializers.ModelSerializer):
         """Return ordered representation with either thin or full details.
 
         Full details are included after create/update when the request carries
-        a details payload; otherwise a thin list of links is returned.
+        a details payload; otherwise a thin list of links is returned. Fields
+        removed by `?fields=`/`?omit=` are neither computed nor emitted.
         """
         rep = super().to_representation(instance)
+        if 'details' not in self.fields:
+            return rep
         method = self._request_method()
         details_value = self._compute_details_representation(instance, method)
-        ordered_fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
-        return self._ordered_representation(rep, details_value, ordered_fields)
+        return self._ordered_representation(rep, details_value, [f for f in self.Meta.fields if f in self.fields])
 
     def _request_method(self):
         """Return uppercased request method or 'GET' if unavailable."""
@@ -219,26 +271,17 @@ class OfferSerializer(serializers.ModelSerializer):
         return self._thin_details(instance)
 
     def _ordered_representation(self, rep, details_value, ordered_fields):
-        """Rebuild OrderedDict in a stable field order, injecting details."""
-        new = OrderedDict()
-        for f in ordered_fields:
-            if f == 'details':
-                new['details'] = details_value
-            else:
-                new[f] = rep.get(f)
-        return new
+        """Rebuild the dict in a stable field order, injecting details."""
+        return {f: details_value if f == 'details' else rep.get(f) for f in ordered_fields}
     
     def _recalc_min_fields(self, offer: Offer):
-        """Recalculate and persist min_price and min_delivery_time."""
-        qs = offer.details.all()
-        if not qs.exists():
-            offer.min_price = None
-            offer.min_delivery_time = None
-        else:
-            offer.min_price = min(d.price for d in qs)
-            offer.min_delivery_time = min(d.delivery_time_in_days for d in qs)
-        offer.save(update_fields=['min_price', 'min_delivery_time'])
-  
+        """Recalculate min_price and min_delivery_time in the database.
+
+        One aggregate UPDATE (see OfferQuerySet.recalc_min_fields), then the
+        two columns are reloaded onto the instance for the response.
+        """
+        Offer.objects.filter(pk=offer.pk).recalc_min_fields()
+        offer.refresh_from_db(fields=['min_price', 'min_delivery_time'])
 
     @transaction.atomic
     def create(self, validated_data):
@@ -247,9 +290,7 @@ class OfferSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
 
         offer = Offer.objects.create(user=user, **validated_data)
-
-        for detail in details_data:
-            OfferDetail.objects.create(offer=offer, **detail)
+        OfferDetail.objects.bulk_create([OfferDetail(offer=offer, **detail) for detail in details_data])
 
         self._recalc_min_fields(offer)
         return offer
@@ -262,14 +303,17 @@ class OfferSerializer(serializers.ModelSerializer):
 
         if details_data is not None:
             self._update_details(instance, details_data)
-
-        self._recalc_min_fields(instance)
+            self._recalc_min_fields(instance)
         return instance
 
     def _update_details(self, instance: Offer, details_data):
-        """Apply partial updates to existing details matched by offer_type."""
+        """Apply partial updates to existing details matched by offer_type.
+
+        Changed details are written with a single bulk_update.
+        """
         existing_by_type = {d.offer_type: d for d in instance.details.all()}
         allowed = self._allowed_detail_types()
+        changed, changed_fields = {}, set()
         for payload in details_data:
             ot = payload.get('offer_type')
             if ot not in allowed:
@@ -282,4 +326,10 @@ class OfferSerializer(serializers.ModelSerializer):
             for f in updatable_fields:
                 if f in payload:
                     setattr(detail, f, payload[f])
-            detail.save()
+                    changed[detail.pk] = detail
+                    changed_fields.add(f)
+        if changed:
+            now = timezone.now()
+            for detail in changed.values():
+                detail.updated_at = now
+            OfferDetail.objects.bulk_update(changed.values(), sorted(changed_fields | {'updated_at'}))
@@ -0,0 +1,77 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from .cache import offers_list_cache
+from .images import schedule_variants
+
+
+def _invalidate_offers_list_cache():
+    """Bump the version in the writing transaction, so it becomes visible together with the data."""
+    offers_list_cache.invalidate()
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offers_list_cache(sender, **kwargs):
+    """Drop all cached offer list pages whenever an offer or tier changes."""
+    _invalidate_offers_list_cache()
+
+
+# Owner-Felder, die als `user_details` in jeder Angebotsliste stehen
+USER_DETAILS_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_user_details(sender, instance: CustomUser, raw=False, update_fields=None, **kwargs):
+    """Load the stored user_details fields of an existing business user before they are overwritten."""
+    instance._offer_user_details = None
+    if raw or instance._state.adding or instance.pk is None or instance.type != CustomUser.Roles.BUSINESS:
+        return
+    if update_fields is not None and not set(update_fields) & set(USER_DETAILS_FIELDS):
+        return
+    instance._offer_user_details = CustomUser.objects.filter(pk=instance.pk).values_list(*USER_DETAILS_FIELDS).first()
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_offers_list_cache_on_user_change(sender, instance: CustomUser, created=False, **kwargs):
+    """Drop cached offer pages only when a business user's embedded `user_details` changed.
+
+    New users own no offers yet; customers never appear in offer lists.
+    """
+    old = getattr(instance, '_offer_user_details', None)
+    if created or old is None:
+        return
+    if old != tuple(getattr(instance, name) for name in USER_DETAILS_FIELDS):
+        _invalidate_offers_list_cache()
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def recalc_offer_min_fields(sender, instance: OfferDetail, raw=False, origin=None, **kwargs):
+    """Keep Offer.min_price/min_delivery_time in sync for saves outside the serializer.
+
+    Covers admin and shell edits; skipped for fixture loading and for details
+    deleted together with their offer.
+    """
+    if raw or instance.offer_id is None or isinstance(origin, Offer):
+        return
+    Offer.objects.filter(pk=instance.offer_id).recalc_min_fields()
+
+
+@receiver(post_save, sender=Offer)
+def schedule_offer_image_variants(sender, instance: Offer, raw=False, **kwargs):
+    """Render image variants off the request path whenever the offer's image changed."""
+    if raw:
+        return
+    variants = instance.image_variants or {}
+    if not instance.image:
+        if variants:
+            Offer.objects.filter(pk=instance.pk).update(image_variants=None)
+            instance.image_variants = None
+        return
+    if variants.get('source') != instance.image.name:
+        schedule_variants(instance)
@@ -1,9 +1,12 @@
 from django.urls import path
-from .views import OffersView, OfferRetrieveUpdateDeleteView, OfferDetailRetrieveView
+from .views import OffersView, OfferRetrieveUpdateDeleteView, OfferDetailRetrieveView, OffersListCacheStatsView, OfferBulkImportView, OfferExportView
 
 app_name = 'offers_app'
 urlpatterns = [
     path('offers/', OffersView.as_view(), name='offers'),
+    path('offers/export/', OfferExportView.as_view(), name='offers-export'),
+    path('offers/bulk/', OfferBulkImportView.as_view(), name='offers-bulk'),
+    path('offers/cache-stats/', OffersListCacheStatsView.as_view(), name='offers-cache-stats'),
     path('offers/<int:pk>/', OfferRetrieveUpdateDeleteView.as_view(), name='offer-detail'),
     path('offerdetails/<int:pk>/', OfferDetailRetrieveView.as_view(), name='offerdetail-detail'),
 ]
\ No newline at end of file
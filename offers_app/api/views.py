@@ -1,17 +1,32 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from django.http import Http404
+from django.db.models import Prefetch, Max, Count
 
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from rest_framework.views import APIView
+from rest_framework.parsers import JSONParser
 from rest_framework.exceptions import ValidationError, NotFound, PermissionDenied, ParseError
 
 from offers_app.models import Offer, OfferDetail
 from .serializers import OfferSerializer, OfferDetailSerializer
-from .pagination import OffersGetPagination
+from .pagination import OffersGetPagination, OffersKeysetPagination
 from .permissions import isOwnerOrReadOnly, isBusinessUser, isOfferCreator
-from .filters import OfferFilter
+from .filters import OfferFilter, OfferSearchFilter
+from .cache import offers_list_cache
+from .bulk import OfferBulkImporter
+from .parsers import NDJSONParser
+from .conditional import ConditionalGetMixin, make_validators
+from .facets import FACETS_PARAM, compute_facets, requested_facets
+from shared_app.sparse_fields import SparseFieldsetViewMixin
+from shared_app.projection import ProjectionListMixin
+from shared_app.export import StreamingExportView
+
+
+# Details ordered (offer_id, id) so the prefetch is served by the FK index without a sort
+DETAILS_PREFETCH = Prefetch('details', queryset=OfferDetail.objects.order_by('offer_id', 'id'))
 
 
 def internal_error_response_500(exception):
@@ -21,27 +36,166 @@ def internal_error_response_500(exception):
         status=status.HTTP_500_INTERNAL_SERVER_ERROR
     )
 
-class OffersView(generics.ListCreateAPIView):
+class OffersView(SparseFieldsetViewMixin, ConditionalGetMixin, ProjectionListMixin, generics.ListCreateAPIView):
     """List offers (public) and create offers (business users only)."""
-    queryset = Offer.objects.select_related('user').prefetch_related('details')
+    queryset = Offer.objects.select_related('user').prefetch_related(DETAILS_PREFETCH)
     serializer_class = OfferSerializer
     pagination_class = OffersGetPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, OfferSearchFilter]
     filterset_class = OfferFilter
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
 
+    @property
+    def paginator(self):
+        """Use keyset pagination when the client opts in with `?cursor=`."""
+        if not hasattr(self, '_paginator'):
+            if OffersKeysetPagination.cursor_query_param in self.request.query_params:
+                self._paginator = OffersKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def get_queryset(self):
+        """Narrow columns for `?fields=`/`?omit=`; keyset mode keeps its sort key."""
+        extra = ()
+        if isinstance(self.paginator, OffersKeysetPagination):
+            extra = (self.paginator.get_ordering(self.request, self)[0],)
+        return self.sparse_queryset(super().get_queryset(), extra)
+
+    def projection_extra_columns(self):
+        """Keyset mode reads (sort key, id) from the last row of the page."""
+        if isinstance(self.paginator, OffersKeysetPagination):
+            return (self.paginator.get_ordering(self.request, self)[0], 'id')
+        return ()
+
     def get_permissions(self):
         """Require IsAuthenticated+isBusinessUser for POST; AllowAny otherwise."""
         if self.request.method == 'POST':
             return [IsAuthenticated(), isBusinessUser()]
         return [AllowAny()]
 
-class OfferRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
+    def list(self, request, *args, **kwargs):
+        """Serve the list from the shared response cache when possible.
+
+        Cache entries store the page (plus `facets` if `?facets=` was given)
+        together with its ETag/Last-Modified validators, so conditional
+        requests on a hit need no query at all.
+        """
+        facets = requested_facets(request)
+        version = offers_list_cache.version()
+        key = offers_list_cache.key_for(request, version)
+        cached = offers_list_cache.get(key)
+        if cached is not None:
+            data, validators = cached
+            return self.finalize_conditional(
+                request, validators, lambda: Response(data, headers={'X-Cache': 'HIT'})
+            )
+
+        validators = self.get_validators(version)
+
+        def build_response():
+            response = super(OffersView, self).list(request, *args, **kwargs)
+            if facets and response.status_code == status.HTTP_200_OK:
+                response.data[FACETS_PARAM] = compute_facets(self.filter_queryset(self.get_queryset()), facets)
+            if response.status_code == status.HTTP_200_OK:
+                offers_list_cache.set(key, (response.data, validators))
+            response['X-Cache'] = 'MISS'
+            return response
+
+        return self.finalize_conditional(request, validators, build_response)
+
+    def get_validators(self, version=None):
+        """Validators from one max(updated_at) aggregate over the filtered offers.
+
+        The ETag also carries the cache namespace version, which every offer,
+        detail or owner write (including deletes) bumps.
+        """
+        if version is None:
+            version = offers_list_cache.version()
+        agg = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            offers_updated=Max('updated_at'),
+            details_updated=Max('details__updated_at'),
+        )
+        stamps = [t for t in agg.values() if t]
+        return make_validators(
+            'offers-list', version, offers_list_cache.fingerprint(self.request),
+            *stamps, last_modified=max(stamps, default=None),
+        )
+
+class OfferExportView(StreamingExportView):
+    """Stream offers as CSV/NDJSON; same filters as the list plus a created range."""
+    permission_classes = [IsAuthenticated]
+    queryset = Offer.objects.all()
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OfferFilter
+    export_filename = 'offers'
+    export_columns = (
+        ('id', 'id'), ('creator', 'user_id'), ('title', 'title'), ('description', 'description'),
+        ('min_price', 'min_price'), ('min_delivery_time', 'min_delivery_time'),
+        ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
+
+
+class OfferBulkImportView(APIView):
+    """Create many offers in one request from a JSON array or NDJSON body.
+
+    Each row has the same shape as a `POST /api/offers/` payload. Returns
+    per-row results: 201 if all rows were created, 207 if only some were,
+    400 if none were.
+    """
+    permission_classes = [IsAuthenticated, isBusinessUser]
+    parser_classes = [JSONParser, NDJSONParser]
+    max_rows = 1000
+
+    def post(self, request):
+        """Validate and bulk-insert the rows for the requesting business user."""
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError({'detail': 'Expected a JSON array or NDJSON body of offers.'})
+        if not rows or len(rows) > self.max_rows:
+            raise ValidationError({'detail': f'Provide between 1 and {self.max_rows} offers.'})
+
+        importer = OfferBulkImporter(request.user)
+        results = importer.run(rows)
+        if importer.failed_count == 0:
+            code = status.HTTP_201_CREATED
+        elif importer.created_count:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'created': importer.created_count, 'failed': importer.failed_count, 'results': results},
+            status=code,
+        )
+
+class OfferRetrieveUpdateDeleteView(SparseFieldsetViewMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a single offer with owner checks."""
-    queryset = Offer.objects.select_related('user').prefetch_related('details')
+    queryset = Offer.objects.select_related('user').prefetch_related(DETAILS_PREFETCH)
     serializer_class = OfferSerializer
 
+    def get_queryset(self):
+        """Narrow columns and relation loading for `?fields=`/`?omit=`."""
+        return self.sparse_queryset(super().get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the offer, or 304 if the client's ETag/date is current."""
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def get_validators(self):
+        """Validators from one row: offer/detail timestamps and owner name fields."""
+        row = (
+            Offer.objects.filter(pk=self.kwargs['pk'])
+            .annotate(details_updated=Max('details__updated_at'), details_count=Count('details'))
+            .values_list('updated_at', 'details_updated', 'details_count',
+                         'user__username', 'user__first_name', 'user__last_name')
+            .first()
+        )
+        if row is None:
+            return None
+        stamps = [t for t in row[:2] if t]
+        return make_validators('offer', self.kwargs['pk'], *row, last_modified=max(stamps))
+
     def get_permissions(self):
         """Dynamic permission selection by method: update=owner, delete=creator."""
         if self.request.method == 'PATCH' or 'PUT':
@@ -88,8 +242,28 @@ class OfferRetrieveUpdateDeleteView(generics.RetrieveUpdateDestroyAPIView):
         except Exception as e:
             return internal_error_response_500(e)
 
-class OfferDetailRetrieveView(generics.RetrieveAPIView):
+class OfferDetailRetrieveView(ConditionalGetMixin, generics.RetrieveAPIView):
     """Retrieve a single OfferDetail; authentication required."""
     queryset = OfferDetail.objects.select_related('offer', 'offer__user')
     serializer_class = OfferDetailSerializer
     permission_classes = [IsAuthenticated]
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the detail, or 304 if the client's ETag/date is current."""
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def get_validators(self):
+        """Validators from the detail's updated_at only."""
+        updated_at = OfferDetail.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None
+        return make_validators('offerdetail', self.kwargs['pk'], updated_at, last_modified=updated_at)
+
+
+class OffersListCacheStatsView(APIView):
+    """Expose offers list cache hit/miss counters for monitoring (admins only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """Return hits, misses, hit ratio and current namespace version."""
+        return Response(offers_list_cache.stats(), status=status.HTTP_200_OK)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OffersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offers_app'
+
+    def ready(self):
+        # Registers cache invalidation handlers for Offer/OfferDetail writes
+        import offers_app.api.signals  # noqa: F401
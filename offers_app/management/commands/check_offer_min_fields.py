@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.core.management.base import BaseCommand
+
+from offers_app.models import Offer
+from offers_app.api.cache import offers_list_cache
+
+
+def _differs(stored, computed):
+    """NULL-safe `stored IS DISTINCT FROM computed` as a Q object."""
+    return (
+        (Q(**{f'{stored}__isnull': True}) & Q(**{f'{computed}__isnull': False}))
+        | (Q(**{f'{stored}__isnull': False}) & Q(**{f'{computed}__isnull': True}))
+        | (Q(**{f'{stored}__isnull': False}) & Q(**{f'{computed}__isnull': False}) & ~Q(**{stored: F(computed)}))
+    )
+
+
+class Command(BaseCommand):
+    """Find (and optionally repair) offers whose min fields drifted from their details."""
+    help = "Check Offer.min_price/min_delivery_time against OfferDetail; --repair fixes drift in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help="Recalculate drifted offers.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Detect drift in one query; repair with one UPDATE per batch of ids."""
+        drifted = list(
+            Offer.objects.with_detail_minimums()
+            .filter(_differs('min_price', 'detail_min_price') | _differs('min_delivery_time', 'detail_min_delivery_time'))
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All offer min fields are consistent."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"{len(drifted)} offers have drifted min fields."))
+        if not options['repair']:
+            return
+
+        size = options['batch_size']
+        for start in range(0, len(drifted), size):
+            with transaction.atomic():
+                Offer.objects.filter(id__in=drifted[start:start + size]).recalc_min_fields()
+        offers_list_cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Repaired {len(drifted)} offers."))
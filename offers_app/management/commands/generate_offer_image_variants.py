@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from offers_app.models import Offer
+from offers_app.api.images import build_variants, save_variants
+
+
+class Command(BaseCommand):
+    """Backfill thumbnail/card/full variants for existing offer images."""
+    help = "Render missing or stale Offer.image variants in parallel (process pool)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes (0 = render in this process).")
+        parser.add_argument('--force', action='store_true', help="Re-render offers that already have variants.")
+
+    def handle(self, *args, **options):
+        """Render images in worker processes; write results from this process only."""
+        todo = [
+            (offer_id, image)
+            for offer_id, image, variants in Offer.objects.exclude(image__isnull=True).exclude(image='')
+            .order_by('id').values_list('id', 'image', 'image_variants').iterator()
+            if options['force'] or (variants or {}).get('source') != image
+        ]
+        if not todo:
+            self.stdout.write(self.style.SUCCESS("All offer images have variants."))
+            return
+
+        done = failed = 0
+        for offer_id, image, names, error in self._render(todo, options['workers']):
+            if error is not None:
+                failed += 1
+                self.stderr.write(f"offer {offer_id} ({image}): {error}")
+            elif save_variants(offer_id, image, names):
+                done += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {done} offers ({failed} failed)."))
+
+    def _render(self, todo, workers):
+        """Yield (offer_id, image, names, error) for each job, in completion order."""
+        if workers <= 0:
+            for offer_id, image in todo:
+                yield (offer_id, image, *_build(image))
+            return
+
+        # Forked workers must not share this process's DB connection
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_build, image): (offer_id, image) for offer_id, image in todo}
+            for future in as_completed(futures):
+                yield (*futures[future], *future.result())
+
+
+def _build(image):
+    """Process-pool task: return (names, None) or (None, error message)."""
+    try:
+        return build_variants(image), None
+    except Exception as exc:
+        return None, str(exc) or exc.__class__.__name__
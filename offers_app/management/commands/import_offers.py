@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.models import CustomUser
+from offers_app.api.bulk import OfferBulkImporter, iter_ndjson
+
+
+class Command(BaseCommand):
+    """Bulk-import offers for a business user from a JSON array or NDJSON file."""
+    help = "Import offers (same shape as POST /api/offers/) from a .json array or .ndjson file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to a JSON array or NDJSON file.")
+        parser.add_argument('--user', required=True, help="Id or username of the owning business user.")
+        parser.add_argument('--format', choices=['json', 'ndjson'], help="Input format (default: by file extension).")
+        parser.add_argument('--chunk-size', type=int, default=OfferBulkImporter.default_chunk_size)
+
+    def handle(self, *args, **options):
+        """Stream rows from the file through OfferBulkImporter and report results."""
+        user = self._get_business_user(options['user'])
+        fmt = options['format'] or ('ndjson' if options['path'].endswith(('.ndjson', '.jsonl')) else 'json')
+        importer = OfferBulkImporter(user, chunk_size=options['chunk_size'])
+
+        try:
+            with open(options['path'], encoding='utf-8') as fh:
+                if fmt == 'ndjson':
+                    importer.run(iter_ndjson(fh))
+                else:
+                    rows = json.load(fh)
+                    if not isinstance(rows, list):
+                        raise CommandError("JSON input must be an array of offers.")
+                    importer.run(rows)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {options['path']}: {exc}")
+
+        for result in importer.results:
+            if result['status'] == 'error':
+                self.stderr.write(f"row {result['row']}: {json.dumps(result['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {importer.created_count} offers, {importer.failed_count} rows failed."
+        ))
+
+    def _get_business_user(self, ident):
+        """Resolve --user by id or username and require the BUSINESS role."""
+        lookup = {'id': int(ident)} if ident.isdigit() else {'username': ident}
+        try:
+            user = CustomUser.objects.get(**lookup)
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"User '{ident}' does not exist.")
+        if user.type != CustomUser.Roles.BUSINESS:
+            raise CommandError(f"User '{ident}' is not a business user.")
+        return user
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.api.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Rebuild the full-text search index used by `GET /api/offers/?search=`."""
+    help = "Rebuild the offers full-text search index (SQLite FTS5 / PostgreSQL GIN)."
+
+    def handle(self, *args, **options):
+        """Repopulate the index for the configured database backend."""
+        vendor = rebuild_search_index()
+        if vendor is None:
+            self.stdout.write(self.style.WARNING("Database backend has no full-text index; nothing to rebuild."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Offer search index rebuilt ({vendor})."))
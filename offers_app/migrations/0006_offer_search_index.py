@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from offers_app.api.search import install_search_index, uninstall_search_index
+
+
+def forwards(apps, schema_editor):
+    install_search_index(schema_editor, apps.get_model('offers_app', 'Offer'))
+
+
+def backwards(apps, schema_editor):
+    uninstall_search_index(schema_editor, apps.get_model('offers_app', 'Offer'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_alter_offerdetail_offer_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def backfill_min_fields(apps, schema_editor):
+    """Recompute min_price/min_delivery_time so the column-based filter is exact."""
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+    per_offer = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+    Offer.objects.update(
+        min_price=Subquery(per_offer.annotate(m=Min('price')).values('m')),
+        min_delivery_time=Subquery(per_offer.annotate(m=Min('delivery_time_in_days')).values('m')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_offer_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_delivery_time', 'id'], name='offer_min_delivery_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='offer_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='offer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'min_price', 'id'], name='offer_user_min_price_idx'),
+        ),
+        migrations.RunPython(backfill_min_fields, migrations.RunPython.noop),
+    ]
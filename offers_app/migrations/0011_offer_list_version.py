@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0010_offer_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferListVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=1)),
+            ],
+        ),
+    ]
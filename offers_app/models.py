@@ -1,23 +1,66 @@
 from django.db import models
+from django.db.models import F, Min, OuterRef, Subquery
 from auth_app.models import CustomUser
 
 # Create your models here.
 
+def _detail_minimums():
+    """Return correlated Min() subqueries over an offer's details (price, days)."""
+    per_offer = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+    return (
+        Subquery(per_offer.annotate(m=Min('price')).values('m')),
+        Subquery(per_offer.annotate(m=Min('delivery_time_in_days')).values('m')),
+    )
+
+
+class OfferQuerySet(models.QuerySet):
+    """QuerySet with bulk maintenance of the per-offer summary fields."""
+
+    def recalc_min_fields(self):
+        """Set min_price/min_delivery_time from the details in a single UPDATE.
+
+        Works for any number of offers without loading details into Python.
+        Returns the number of rows updated.
+        """
+        min_price, min_delivery_time = _detail_minimums()
+        return self.update(min_price=min_price, min_delivery_time=min_delivery_time)
+
+    def with_detail_minimums(self):
+        """Annotate detail_min_price/detail_min_delivery_time computed from details."""
+        min_price, min_delivery_time = _detail_minimums()
+        return self.annotate(detail_min_price=min_price, detail_min_delivery_time=min_delivery_time)
+
+
 class Offer(models.Model):
     """Top-level offer posted by a business user with summary fields."""
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     image = models.FileField(upload_to='offer_images/', blank=True, null=True)
+    # Resized copies of `image`: {'source': image name, 'thumbnail'|'card'|'full': file name}
+    image_variants = models.JSONField(blank=True, null=True, editable=False)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     min_price = models.DecimalField(max_digits=10, decimal_places=0, blank=True, null=True)
     min_delivery_time = models.IntegerField(blank=True, null=True)
 
+    objects = OfferQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Offer"
         verbose_name_plural = "Offers"
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination: (sort key, id) for every cursor ordering
+            models.Index(fields=['created_at', 'id'], name='offer_created_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='offer_updated_id_idx'),
+            models.Index(fields=['min_price', 'id'], name='offer_min_price_id_idx'),
+            models.Index(fields=['min_delivery_time', 'id'], name='offer_min_delivery_id_idx'),
+            # ?creator_id= combined with each ordering, served without a sort step
+            models.Index(fields=['user', 'created_at', 'id'], name='offer_user_created_idx'),
+            models.Index(fields=['user', 'updated_at', 'id'], name='offer_user_updated_idx'),
+            models.Index(fields=['user', 'min_price', 'id'], name='offer_user_min_price_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -41,6 +84,7 @@ class OfferDetail(models.Model):
         choices=OfferTypes.choices,
         default=OfferTypes.BASIC,
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Offer Detail"
@@ -52,3 +96,35 @@ class OfferDetail(models.Model):
 
     def __str__(self):
         return f"{self.title} - {self.offer_type}"
+
+
+class OfferListVersionQuerySet(models.QuerySet):
+    """Read and bump the single offers list cache version row."""
+
+    ROW_ID = 1
+
+    def current(self):
+        """Return the current version (1 before the first bump)."""
+        return self.filter(pk=self.ROW_ID).values_list('version', flat=True).first() or 1
+
+    def bump(self):
+        """Increment the version with one atomic UPDATE, creating the row on first use."""
+        if not self.filter(pk=self.ROW_ID).update(version=F('version') + 1):
+            _, created = self.get_or_create(pk=self.ROW_ID, defaults={'version': 2})
+            if not created:
+                # Created concurrently by another transaction
+                self.filter(pk=self.ROW_ID).update(version=F('version') + 1)
+
+
+class OfferListVersion(models.Model):
+    """Namespace version of the offers list response cache (one row).
+
+    Lives in the database rather than in the cache: the bump is an atomic
+    UPDATE and the row can never be evicted like a cache entry.
+    """
+    version = models.PositiveBigIntegerField(default=1)
+
+    objects = OfferListVersionQuerySet.as_manager()
+
+    def __str__(self):
+        return f"offers list v{self.version}"
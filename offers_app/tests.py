@@ -0,0 +1,699 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail, OfferListVersion
+from offers_app.api.cache import offers_list_cache
+from shared_app.query_plans import QueryPlanAssertionsMixin
+
+
+class OfferFixtureMixin:
+
+    def create_business(self, username="biz"):
+        return CustomUser.objects.create_user(
+            username=username, email=f"{username}@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+
+    def create_offer(self, user, title, prices=(0, 0, 0), days=(0, 0, 0), **fields):
+        offer = Offer.objects.create(user=user, title=title, description="x", **fields)
+        for ot, price, day in zip(OfferDetail.OfferTypes.values, prices, days):
+            OfferDetail.objects.create(offer=offer, title=ot, offer_type=ot, price=price, delivery_time_in_days=day)
+        return offer
+
+
+class OfferFullTextSearchTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        self.logo = Offer.objects.create(user=self.business, title="Logo Design", description="Vector logo for your brand")
+        self.web = Offer.objects.create(user=self.business, title="Website", description="Responsive web design and logo placement")
+        self.seo = Offer.objects.create(user=self.business, title="SEO Audit", description="Keyword research")
+        self.url = reverse("offers:offers")
+
+    def _ids(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, 200, resp.data)
+        return [o["id"] for o in resp.data["results"]]
+
+    def test_prefix_match_on_title_and_description(self):
+        self.assertCountEqual(self._ids(search="log"), [self.logo.id, self.web.id])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self._ids(search="logo brand"), [self.logo.id])
+
+    def test_ranked_by_relevance(self):
+        self.assertEqual(self._ids(search="logo")[0], self.logo.id)
+
+    def test_index_follows_update_and_delete(self):
+        self.seo.title = "Logo refresh"
+        self.seo.save()
+        self.logo.delete()
+        self.assertCountEqual(self._ids(search="logo"), [self.web.id, self.seo.id])
+        self.assertEqual(self._ids(search="audit"), [])
+
+    def test_rebuild_command(self):
+        call_command("rebuild_offer_search_index", stdout=StringIO())
+        self.assertEqual(self._ids(search="keyword"), [self.seo.id])
+
+
+class OfferKeysetPaginationTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        prices = [50, 20, 20, 20, None, 80, 10, 20, 50]
+        self.offers = [
+            Offer.objects.create(user=self.business, title=f"Offer {i}", description="x", min_price=p)
+            for i, p in enumerate(prices)
+        ]
+        self.url = reverse("offers:offers")
+
+    def _walk(self, url, link="next"):
+        ids, pages = [], 0
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200, resp.data)
+            ids.extend(o["id"] for o in resp.data["results"])
+            url = resp.data[link]
+            pages += 1
+        return ids, pages
+
+    def test_walks_all_pages_in_default_order(self):
+        ids, pages = self._walk(f"{self.url}?cursor=&page_size=4")
+        expected = list(Offer.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_ordering_by_min_price_with_ties_and_nulls(self):
+        for ordering in ("min_price", "-min_price"):
+            ids, _ = self._walk(f"{self.url}?cursor=&page_size=2&ordering={ordering}")
+            direction = "-" if ordering.startswith("-") else ""
+            expected = list(Offer.objects.order_by(ordering, f"{direction}id").values_list("id", flat=True))
+            self.assertEqual(ids, expected, ordering)
+
+    def test_previous_links_walk_back(self):
+        resp = self.client.get(f"{self.url}?cursor=&page_size=2&ordering=min_price")
+        forward = [[o["id"] for o in resp.data["results"]]]
+        while resp.data["next"]:
+            resp = self.client.get(resp.data["next"])
+            forward.append([o["id"] for o in resp.data["results"]])
+        backward, url = [], resp.data["previous"]
+        while url:
+            resp = self.client.get(url)
+            backward.append([o["id"] for o in resp.data["results"]])
+            url = resp.data["previous"]
+        # same pages, each in forward order, visited last to first
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_no_count_query_unless_requested(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(f"{self.url}?cursor=")
+        self.assertNotIn("count", resp.data)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+
+        resp = self.client.get(f"{self.url}?cursor=&count=true")
+        self.assertEqual(resp.data["count"], len(self.offers))
+        self.assertTrue(resp.data["count_is_approximate"])
+
+    def test_invalid_cursor_returns_404(self):
+        resp = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 404)
+
+
+class OfferListQueryCountTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        for i in range(12):
+            self.create_offer(self.business, f"Offer {i}")
+        self.url = reverse("offers:offers")
+
+    def _query_count(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp
+
+    def test_constant_queries_regardless_of_page_size(self):
+        small, _ = self._query_count(page_size=2)
+        large, _ = self._query_count(page_size=12)
+        self.assertEqual(small, large)
+        self.assertEqual(large, 5)  # version, validators, count, offers (+user join), details prefetch
+
+    def test_cursor_mode_skips_count_query(self):
+        queries, _ = self._query_count(cursor="", page_size=12)
+        self.assertEqual(queries, 4)  # version, validators, offers, details prefetch
+
+    def test_thin_detail_urls(self):
+        _, resp = self._query_count(page_size=1)
+        detail = resp.data["results"][0]["details"][0]
+        self.assertEqual(detail["url"], f"/offerdetails/{detail['id']}/")
+
+        self.client.force_authenticate(self.business)
+        offer = Offer.objects.first()
+        resp = self.client.get(reverse("offers:offer-detail", args=[offer.id]))
+        detail = resp.data["details"][0]
+        self.assertEqual(detail["url"], f"http://testserver/api/offerdetails/{detail['id']}/")
+
+
+class OffersListCacheTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        offers_list_cache.flush_stats()
+        offers_list_cache.cache.clear()
+        self.business = self.create_business()
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="x")
+        self.detail = OfferDetail.objects.create(offer=self.offer, title="basic", offer_type="basic")
+        self.url = reverse("offers:offers")
+
+    def test_second_identical_request_is_a_hit_without_page_queries(self):
+        self.assertEqual(self.client.get(self.url, {"page_size": 2, "ordering": "min_price"})["X-Cache"], "MISS")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, {"ordering": "min_price", "page_size": 2})
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(len(ctx.captured_queries), 1)  # namespace version only
+        self.assertIn("offers_app_offerlistversion", ctx.captured_queries[0]["sql"])
+        self.assertEqual(resp.data["results"][0]["id"], self.offer.id)
+
+    def test_offer_and_detail_writes_invalidate(self):
+        self.client.get(self.url)
+        self.offer.title = "Logo v2"
+        self.offer.save()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["results"][0]["title"], "Logo v2")
+
+        self.detail.delete()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["results"][0]["details"], [])
+
+    def test_only_business_user_details_changes_invalidate(self):
+        self.client.get(self.url)
+        customer = CustomUser.objects.create_user(username="cust", email="cust@mail.de", password="pw")
+        customer.first_name = "Eve"
+        customer.save()
+        self.business.email = "new@mail.de"
+        self.business.save()
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+
+        self.business.first_name = "Ada"
+        self.business.save()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertEqual(resp.data["results"][0]["user_details"]["first_name"], "Ada")
+
+    def test_version_is_kept_outside_the_cache(self):
+        self.client.get(self.url)
+        self.offer.save()
+        version = offers_list_cache.version()
+        self.assertEqual(OfferListVersion.objects.get().version, version)
+        # Evicting every cache entry (culling, restart) must not reuse an old namespace
+        offers_list_cache.cache.clear()
+        self.assertEqual(offers_list_cache.version(), version)
+        self.offer.save()
+        self.assertEqual(offers_list_cache.version(), version + 1)
+
+    def test_hits_and_misses_are_flushed_in_batches(self):
+        with mock.patch.object(offers_list_cache, "stats_flush_every", 3):
+            self.client.get(self.url)
+            self.client.get(self.url)
+            self.assertIsNone(offers_list_cache.cache.get(offers_list_cache.hits_key))
+            self.client.get(self.url)
+        self.assertEqual(offers_list_cache.cache.get(offers_list_cache.hits_key), 2)
+        self.assertEqual(offers_list_cache.cache.get(offers_list_cache.misses_key), 1)
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stats_url = reverse("offers:offers-cache-stats")
+        self.client.force_authenticate(self.business)
+        self.assertEqual(self.client.get(stats_url).status_code, 403)
+
+        admin = CustomUser.objects.create_user(username="admin", email="a@mail.de", password="pw", is_staff=True)
+        self.client.force_authenticate(admin)
+        resp = self.client.get(stats_url)
+        self.assertEqual((resp.data["hits"], resp.data["misses"]), (1, 1))
+
+
+class OfferConditionalGetTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        offers_list_cache.cache.clear()
+        self.business = self.create_business()
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="x")
+        self.detail = OfferDetail.objects.create(offer=self.offer, title="basic", offer_type="basic", price=10)
+        self.client.force_authenticate(self.business)
+
+    def _assert_revalidates(self, url, max_queries):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header("ETag") and first.has_header("Last-Modified"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(resp.status_code, 304)
+        self.assertLessEqual(len(ctx.captured_queries), max_queries)
+
+        resp = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(resp.status_code, 304)
+        return first["ETag"]
+
+    def test_offer_retrieve(self):
+        url = reverse("offers:offer-detail", args=[self.offer.id])
+        etag = self._assert_revalidates(url, max_queries=1)
+
+        self.detail.price = 20
+        self.detail.save()
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_offerdetail_retrieve(self):
+        url = reverse("offers:offerdetail-detail", args=[self.detail.id])
+        etag = self._assert_revalidates(url, max_queries=1)
+
+        self.detail.title = "basic v2"
+        self.detail.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_revalidates_from_cache_without_queries(self):
+        url = reverse("offers:offers")
+        etag = self._assert_revalidates(url, max_queries=1)  # namespace version only
+
+        offers_list_cache.cache.delete(offers_list_cache.key_for(Request(APIRequestFactory().get(url))))
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 2)  # version + validators, no page query
+
+        self.offer.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_offer_is_still_404(self):
+        resp = self.client.get(reverse("offers:offer-detail", args=[999]), HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(resp.status_code, 404)
+
+
+class OfferSparseFieldsetTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        offers_list_cache.cache.clear()
+        self.business = self.create_business()
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="long text", min_price=10)
+        OfferDetail.objects.create(offer=self.offer, title="basic", offer_type="basic", price=10)
+        self.url = reverse("offers:offers")
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, 200, resp.data)
+        return resp, [q["sql"] for q in ctx.captured_queries]
+
+    def test_fields_limits_payload_and_columns(self):
+        resp, queries = self._get(fields="id,title,image,min_price")
+        self.assertEqual(list(resp.data["results"][0]), ["id", "title", "image", "min_price"])
+        page_sql = next(q for q in queries if "LIMIT" in q)
+        self.assertNotIn('"description"', page_sql)
+        self.assertNotIn("auth_app_customuser", page_sql)
+        self.assertEqual(len(queries), 4)  # version, validators, count, page; no details prefetch
+
+    def test_omit_drops_fields_and_keeps_order(self):
+        resp, _ = self._get(omit="description,details")
+        self.assertEqual(
+            list(resp.data["results"][0]),
+            ["id", "user", "title", "image", "image_variants", "created_at", "updated_at", "min_price", "min_delivery_time", "user_details"],
+        )
+        self.assertEqual(resp.data["results"][0]["user_details"]["username"], "biz")
+
+    def test_keyset_mode_with_sparse_fields(self):
+        resp, queries = self._get(fields="id", cursor="", ordering="min_price")
+        self.assertEqual(resp.data["results"], [{"id": self.offer.id}])
+        self.assertEqual(len(queries), 3)  # version, validators, page
+
+    def test_unknown_field_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {"fields": "id,nope"}).status_code, 400)
+
+
+class OfferMaxDeliveryTimeFilterTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        self.fast = Offer.objects.create(user=self.business, title="Fast", description="x", min_delivery_time=2)
+        self.slow = Offer.objects.create(user=self.business, title="Slow", description="x", min_delivery_time=10)
+        Offer.objects.create(user=self.business, title="No details", description="x")
+        self.url = reverse("offers:offers")
+
+    def test_filters_on_min_delivery_time_without_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, {"max_delivery_time": 5})
+        self.assertEqual([o["id"] for o in resp.data["results"]], [self.fast.id])
+        self.assertFalse(any("DISTINCT" in q["sql"] for q in ctx.captured_queries))
+
+        resp = self.client.get(self.url, {"max_delivery_time": 10})
+        self.assertEqual(resp.data["count"], 2)
+
+
+class OffersViewQueryPlanTest(QueryPlanAssertionsMixin, OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        offers_list_cache.cache.clear()
+        self.business = self.create_business()
+        for i in range(4):
+            self.create_offer(self.business, f"Logo {i}", min_price=i * 10, min_delivery_time=i)
+        self.url = reverse("offers:offers")
+
+    def _get(self, **params):
+        return lambda: self.client.get(self.url, params)
+
+    def test_list_and_orderings_are_index_served(self):
+        for params in ({}, {"ordering": "min_price"}, {"ordering": "-min_price"},
+                       {"ordering": "updated_at"}, {"ordering": "-updated_at"}):
+            with self.subTest(**params):
+                self.assertIndexedPlans(self._get(**params))
+
+    def test_creator_filter_with_orderings_is_index_served(self):
+        for ordering in ("", "min_price", "-updated_at"):
+            with self.subTest(ordering=ordering):
+                self.assertIndexedPlans(self._get(creator_id=self.business.id, ordering=ordering))
+
+    def test_cursor_pagination_is_index_served(self):
+        resp = self.assertIndexedPlans(self._get(cursor="", page_size=2, ordering="min_price"))
+        self.assertIndexedPlans(lambda: self.client.get(resp.data["next"]))
+
+    def test_range_filters_and_search_avoid_full_scans(self):
+        # Range predicates and relevance ranking sort the (index-selected) matches
+        for params in ({"max_delivery_time": 2}, {"min_price": 10}, {"search": "logo"}):
+            with self.subTest(**params):
+                self.assertIndexedPlans(self._get(**params), allow_sort=True)
+
+
+def offer_payload(title, prices=(100, 200, 300), days=(7, 5, 3)):
+    return {
+        "title": title,
+        "description": "Imported",
+        "details": [
+            {"title": ot, "revisions": 1, "delivery_time_in_days": d, "price": p, "features": ["a"], "offer_type": ot}
+            for ot, p, d in zip(OfferDetail.OfferTypes.values, prices, days)
+        ],
+    }
+
+
+class OfferFacetsTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        offers_list_cache.cache.clear()
+        self.biz = self.create_business()
+        self.other = self.create_business("other")
+        self.create_offer(self.biz, "Logo", prices=(40, 80, 120), days=(1, 2, 10))
+        self.create_offer(self.biz, "Website", prices=(300, 400, 600), days=(20, 40, 60))
+        self.create_offer(self.other, "Logo animation", prices=(90, 100, 2000), days=(5, 6, 7))
+        self.url = reverse("offers:offers")
+
+    def _counts(self, buckets):
+        return [b["count"] for b in buckets]
+
+    def test_all_facets_in_one_grouped_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, {"facets": "price,delivery_time,creator"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(sum("k.facet" in q["sql"] for q in ctx.captured_queries), 1)
+
+        facets = resp.data["facets"]
+        self.assertEqual(self._counts(facets["price"]), [1, 1, 0, 1, 0, 0])
+        self.assertEqual(facets["price"][0], {"from": None, "to": 50, "count": 1})
+        self.assertEqual(facets["price"][1], {"from": 50, "to": 100, "count": 1})
+        self.assertEqual(facets["price"][-1], {"from": 1000, "to": None, "count": 0})
+        self.assertEqual(self._counts(facets["delivery_time"]), [1, 1, 1, 1, 1, 1])
+        self.assertEqual(facets["creator"], [
+            {"id": self.biz.id, "username": "biz", "count": 2},
+            {"id": self.other.id, "username": "other", "count": 1},
+        ])
+
+    def test_fractional_price_lands_in_the_bucket_its_label_covers(self):
+        offer = Offer.objects.get(title="Logo")
+        table, column = (connection.ops.quote_name(n) for n in (Offer._meta.db_table, "min_price"))
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {table} SET {column} = %s WHERE id = %s", ["50.50", offer.id])
+        price = self.client.get(self.url, {"facets": "price"}).data["facets"]["price"]
+        self.assertEqual(price[0]["count"], 0)
+        self.assertEqual(price[1], {"from": 50, "to": 100, "count": 2})
+
+    def test_facets_follow_filters_and_search(self):
+        resp = self.client.get(self.url, {"facets": "creator", "search": "logo"})
+        self.assertEqual([c["count"] for c in resp.data["facets"]["creator"]], [1, 1])
+        self.assertNotIn("price", resp.data["facets"])
+
+        resp = self.client.get(self.url, {"facets": "price", "creator_id": self.other.id})
+        self.assertEqual(self._counts(resp.data["facets"]["price"]), [0, 1, 0, 0, 0, 0])
+
+    def test_facets_are_cached_with_the_page(self):
+        first = self.client.get(self.url, {"facets": "price"})
+        with CaptureQueriesContext(connection) as ctx:
+            second = self.client.get(self.url, {"facets": "price"})
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(len(ctx.captured_queries), 1)  # namespace version only
+        self.assertEqual(second.data["facets"], first.data["facets"])
+
+    def test_unknown_facet_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {"facets": "price,colour"}).status_code, 400)
+
+
+class OfferBulkImportTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        self.url = reverse("offers:offers-bulk")
+        self.client.force_authenticate(self.business)
+
+    def test_json_array_with_per_row_errors(self):
+        bad = offer_payload("Bad")
+        bad["details"] = bad["details"][:2]
+        resp = self.client.post(self.url, [offer_payload("A"), bad, offer_payload("B", prices=(50, 60, 70))], format="json")
+        self.assertEqual(resp.status_code, 207, resp.data)
+        self.assertEqual((resp.data["created"], resp.data["failed"]), (2, 1))
+        self.assertEqual([r["status"] for r in resp.data["results"]], ["created", "error", "created"])
+
+        offer = Offer.objects.get(title="B")
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (50, 3))
+        self.assertEqual(offer.details.count(), 3)
+        self.assertEqual(offer.user, self.business)
+
+    def test_ndjson_body_and_constant_queries(self):
+        def post(n):
+            body = "\n".join(json.dumps(offer_payload(f"Offer {i}")) for i in range(n))
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.post(self.url, body, content_type="application/x-ndjson")
+            self.assertEqual(resp.status_code, 201, resp.data)
+            return len(ctx.captured_queries)
+        self.assertEqual(post(2), post(20))
+        self.assertEqual(Offer.objects.count(), 22)
+
+    def test_invalid_ndjson_line_is_reported(self):
+        body = json.dumps(offer_payload("A")) + "\n{not json\n"
+        resp = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual(resp.data["results"][1]["row"], 2)
+
+    def test_malformed_details_are_row_errors(self):
+        not_objects, list_type = offer_payload("Ints"), offer_payload("List type")
+        not_objects["details"] = [1, 2, 3]
+        list_type["details"][0]["offer_type"] = [1]
+        resp = self.client.post(self.url, [not_objects, list_type, offer_payload("A")], format="json")
+        self.assertEqual(resp.status_code, 207, resp.data)
+        self.assertEqual([r["status"] for r in resp.data["results"]], ["error", "error", "created"])
+        self.assertIn("details", resp.data["results"][0]["errors"])
+
+    def test_customer_cannot_import(self):
+        customer = CustomUser.objects.create_user(username="cust", email="c@mail.de", password="pw")
+        self.client.force_authenticate(customer)
+        self.assertEqual(self.client.post(self.url, [offer_payload("A")], format="json").status_code, 403)
+
+    def test_import_offers_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as fh:
+            fh.write("\n".join(json.dumps(offer_payload(f"Cmd {i}")) for i in range(3)))
+        out = StringIO()
+        call_command("import_offers", fh.name, user="biz", chunk_size=2, stdout=out, stderr=StringIO())
+        os.unlink(fh.name)
+        self.assertIn("Imported 3 offers", out.getvalue())
+        self.assertEqual(OfferDetail.objects.filter(offer__title__startswith="Cmd").count(), 9)
+
+
+class OfferMinFieldsTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.business = self.create_business()
+        self.client.force_authenticate(self.business)
+
+    def test_create_and_update_maintain_min_fields(self):
+        resp = self.client.post(reverse("offers:offers"), offer_payload("A"), format="json")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual((resp.data["min_price"], resp.data["min_delivery_time"]), ("100", 3))
+
+        url = reverse("offers:offer-detail", args=[resp.data["id"]])
+        resp = self.client.patch(url, {"details": [{"offer_type": "premium", "price": 40, "delivery_time_in_days": 9}]}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual((resp.data["min_price"], resp.data["min_delivery_time"]), ("40", 5))
+
+    def test_detail_edits_outside_serializer_update_offer(self):
+        offer = Offer.objects.create(user=self.business, title="Shell", description="x")
+        detail = OfferDetail.objects.create(offer=offer, title="b", offer_type="basic", price=30, delivery_time_in_days=4)
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (30, 4))
+
+        detail.delete()
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (None, None))
+
+    def test_check_command_repairs_drift(self):
+        offer = Offer.objects.create(user=self.business, title="Drift", description="x")
+        OfferDetail.objects.create(offer=offer, title="b", offer_type="basic", price=30, delivery_time_in_days=4)
+        Offer.objects.filter(pk=offer.pk).update(min_price=999, min_delivery_time=None)
+
+        out = StringIO()
+        call_command("check_offer_min_fields", stdout=out)
+        self.assertIn("1 offers have drifted", out.getvalue())
+        call_command("check_offer_min_fields", "--repair", stdout=out)
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time), (30, 4))
+        out = StringIO()
+        call_command("check_offer_min_fields", stdout=out)
+        self.assertIn("consistent", out.getvalue())
+
+
+class OfferImageVariantsTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media, OFFER_IMAGE_VARIANTS_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.business = self.create_business()
+
+    def _png(self, size=(2000, 1000), color="red"):
+        from PIL import Image
+
+        buf = BytesIO()
+        Image.new("RGB", size, color).save(buf, "PNG")
+        return SimpleUploadedFile("photo.png", buf.getvalue(), content_type="image/png")
+
+    def _size(self, name):
+        from PIL import Image
+
+        with default_storage.open(name) as fh:
+            return Image.open(fh).size
+
+    def test_upload_generates_hashed_variants_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = Offer.objects.create(user=self.business, title="Logo", description="x", image=self._png())
+        offer.refresh_from_db()
+        variants = offer.image_variants
+        self.assertEqual(variants["source"], offer.image.name)
+        self.assertEqual(self._size(variants["thumbnail"]), (160, 80))
+        self.assertEqual(self._size(variants["card"]), (480, 240))
+        self.assertEqual(self._size(variants["full"]), (1600, 800))
+        self.assertRegex(variants["card"], r"^offer_images/card/[0-9a-f]{32}\.webp$")
+
+        self.client.force_authenticate(self.business)
+        resp = self.client.get(reverse("offers:offer-detail", args=[offer.id]))
+        self.assertEqual(resp.data["image_variants"]["thumbnail"], f"http://testserver/media/{variants['thumbnail']}")
+
+    def test_variants_of_a_replaced_image_are_not_served(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = Offer.objects.create(user=self.business, title="Logo", description="x", image=self._png())
+        offer.refresh_from_db()
+        # new image, re-render still pending
+        with self.captureOnCommitCallbacks(execute=False):
+            offer.image = self._png(color="blue")
+            offer.save()
+        self.client.force_authenticate(self.business)
+        resp = self.client.get(reverse("offers:offer-detail", args=[offer.id]))
+        self.assertIsNone(resp.data["image_variants"])
+        resp = self.client.get(reverse("offers:offers"))
+        self.assertIsNone(resp.data["results"][0]["image_variants"])
+
+    def test_same_content_reuses_file_names(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            a = Offer.objects.create(user=self.business, title="A", description="x", image=self._png())
+            b = Offer.objects.create(user=self.business, title="B", description="x", image=self._png())
+        a.refresh_from_db()
+        b.refresh_from_db()
+        self.assertNotEqual(a.image.name, b.image.name)
+        self.assertEqual(a.image_variants["card"], b.image_variants["card"])
+
+    def test_backfill_command_uses_process_pool(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            offers = [
+                Offer.objects.create(user=self.business, title=str(i), description="x", image=self._png(color=c))
+                for i, c in enumerate(["red", "blue", "green"])
+            ]
+        Offer.objects.create(user=self.business, title="no image", description="x")
+
+        out = StringIO()
+        call_command("generate_offer_image_variants", workers=2, stdout=out)
+        self.assertIn("Generated variants for 3 offers (0 failed)", out.getvalue())
+        for offer in offers:
+            offer.refresh_from_db()
+            self.assertEqual(offer.image_variants["source"], offer.image.name)
+
+        out = StringIO()
+        call_command("generate_offer_image_variants", workers=0, stdout=out)
+        self.assertIn("All offer images have variants", out.getvalue())
+
+
+class OfferExportTest(OfferFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.biz = self.create_business()
+        self.other = self.create_business("other")
+        self.offers = []
+        for user, title in ((self.biz, "Logo"), (self.other, "Website"), (self.biz, "Flyer")):
+            offer = Offer.objects.create(user=user, title=title, description="x")
+            OfferDetail.objects.create(offer=offer, title="basic", offer_type="basic", price=50, delivery_time_in_days=3)
+            self.offers.append(offer)
+        self.url = reverse("offers:offers-export")
+        self.client.force_authenticate(self.other)
+
+    def test_streams_filtered_offers_in_one_query(self):
+        resp = self.client.get(self.url, {"format": "ndjson", "creator_id": self.biz.id})
+        self.assertEqual(resp.status_code, 200)
+        with CaptureQueriesContext(connection) as ctx:
+            rows = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual([r["title"] for r in rows], ["Logo", "Flyer"])
+        self.assertEqual((rows[0]["creator"], rows[0]["min_price"], rows[0]["min_delivery_time"]), (self.biz.id, "50", 3))
+
+    def test_csv_header_and_created_range(self):
+        resp = self.client.get(self.url, {"created_before": "2000-01-01"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content).decode().splitlines(),
+                         ["id,creator,title,description,min_price,min_delivery_time,created_at,updated_at"])
+        self.assertEqual(self.client.get(self.url, {"created_after": "31.12.2024"}).status_code, 400)
+
+    def test_csv_cells_cannot_start_a_formula(self):
+        formula = '=HYPERLINK("http://evil.example","click")'
+        Offer.objects.filter(pk=self.offers[0].pk).update(title=formula, description="-1+2")
+        resp = self.client.get(self.url, {"creator_id": self.biz.id})
+        rows = list(csv.reader(StringIO(b"".join(resp.streaming_content).decode())))
+        self.assertEqual((rows[1][2], rows[1][3]), ("'" + formula, "'-1+2"))
+        self.assertEqual(rows[2][2], "Flyer")
+
+        resp = self.client.get(self.url, {"format": "ndjson", "creator_id": self.biz.id})
+        first = json.loads(b"".join(resp.streaming_content).decode().splitlines()[0])
+        self.assertEqual(first["title"], formula)
@@ -1,9 +1,14 @@
 from django.contrib import admin
-from .models import Order
+from .models import ArchivedOrder, Order
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
 
     list_display = ('id', 'title', 'customer_user', 'business_user', 'revisions','delivery_time_in_days','price','features', 'offer_type', 'status', 'created_at', 'updated_at')
+    list_select_related = ('customer_user', 'business_user', 'feature_set')
 
-    
\ No newline at end of file
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+
+    list_display = ('id', 'title', 'customer_user', 'business_user', 'price', 'offer_type', 'status', 'created_at', 'archived_at')
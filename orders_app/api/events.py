@@ -0,0 +1,172 @@
+import asyncio
+import itertools
+import json
+import threading
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+# Überschreibbar in settings.py
+REPLAY_BUFFER_SIZE = getattr(settings, 'ORDER_STREAM_REPLAY_SIZE', 1000)
+QUEUE_SIZE = getattr(settings, 'ORDER_STREAM_QUEUE_SIZE', 100)
+HEARTBEAT_SECONDS = getattr(settings, 'ORDER_STREAM_HEARTBEAT', 15)
+RETRY_MILLISECONDS = 3000
+
+
+class Subscription:
+    """One open stream: a bounded queue read on the connection's event loop."""
+
+    def __init__(self, user_id, loop, maxsize):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, message):
+        """Enqueue message (runs on self.loop); on overflow end the stream instead of blocking.
+
+        The client reconnects with Last-Event-ID and catches up from the
+        replay buffer, so a slow reader never holds back the publisher.
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class OrderEventHub:
+    """In-process fan-out of order events to the streams of the involved users.
+
+    Publishers may run in any thread (sync views, signals); delivery is
+    handed to each subscriber's event loop with call_soon_threadsafe. The
+    last `buffer_size` events are kept for `Last-Event-ID` replay. Event ids
+    carry a per-process epoch, so an id from before a restart (or from
+    another worker) is recognised and answered with a `resync` event.
+    """
+
+    def __init__(self, buffer_size=REPLAY_BUFFER_SIZE, queue_size=QUEUE_SIZE):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._last_seq = 0
+        self._buffer = deque(maxlen=buffer_size)  # (seq, user_ids, message)
+        self._subscribers = {}  # user_id -> {Subscription}
+
+    def subscribe(self, user_id, last_event_id=None, loop=None):
+        """Register a stream; return (subscription, missed messages, complete).
+
+        `complete` is False if events after last_event_id may be missing
+        (unknown epoch, or already evicted from the replay buffer).
+        """
+        subscription = Subscription(user_id, loop or asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            replay, complete = self._replay(user_id, last_event_id)
+        return subscription, replay, complete
+
+    def unsubscribe(self, subscription):
+        """Remove a stream; safe to call more than once."""
+        with self._lock:
+            streams = self._subscribers.get(subscription.user_id)
+            if streams is not None:
+                streams.discard(subscription)
+                if not streams:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, event, data, user_ids):
+        """Buffer one event and hand it to every open stream of user_ids; return its id."""
+        user_ids = frozenset(user_ids)
+        payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+        with self._lock:
+            seq = next(self._ids)
+            self._last_seq = seq
+            event_id = f'{self.epoch}-{seq}'
+            message = f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'
+            self._buffer.append((seq, user_ids, message))
+            targets = [s for user_id in user_ids for s in self._subscribers.get(user_id, ())]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:  # Event-Loop bereits geschlossen
+                self.unsubscribe(subscription)
+        return event_id
+
+    def connection_count(self):
+        """Return the number of open streams."""
+        with self._lock:
+            return sum(len(streams) for streams in self._subscribers.values())
+
+    def _replay(self, user_id, last_event_id):
+        """Return (messages after last_event_id for user_id, complete); caller holds the lock."""
+        if not last_event_id:
+            return [], True
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._last_seq:
+            return [], False
+        seq = int(seq)
+        complete = not self._buffer or self._buffer[0][0] <= seq + 1
+        return [message for s, user_ids, message in self._buffer if s > seq and user_id in user_ids], complete
+
+
+hub = OrderEventHub()
+
+
+def order_event_data(order, previous_status=None):
+    """Return the compact event payload for one order."""
+    data = {
+        'id': order.id,
+        'status': order.status,
+        'customer_user': order.customer_user_id,
+        'business_user': order.business_user_id,
+        'title': order.title,
+        'price': order.price,
+        'updated_at': order.updated_at,
+    }
+    if previous_status is not None:
+        data['previous_status'] = previous_status
+    return data
+
+
+def publish_order_event(order, event, previous_status=None):
+    """Publish an order event to its customer and business user once the transaction commits."""
+    data = order_event_data(order, previous_status)
+    user_ids = (order.customer_user_id, order.business_user_id)
+    transaction.on_commit(lambda: hub.publish(event, data, user_ids))
+
+
+async def stream_events(user_id, last_event_id=None, event_hub=None, heartbeat=None):
+    """Yield the SSE stream of one user: replay, then live events with keep-alive comments.
+
+    Ends when the client's queue overflowed (the client reconnects and
+    replays); the subscription is always released when the stream closes.
+    """
+    event_hub = event_hub or hub
+    heartbeat = heartbeat or HEARTBEAT_SECONDS
+    subscription, replay, complete = event_hub.subscribe(user_id, last_event_id)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        if not complete:
+            # Lücke nicht schließbar: Client soll die Liste neu laden
+            yield 'event: resync\ndata: {}\n\n'
+        for message in replay:
+            yield message
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        event_hub.unsubscribe(subscription)
@@ -0,0 +1,31 @@
+from shared_app.pagination import KeysetPagination
+
+
+class OrdersCursorPagination(KeysetPagination):
+    """Cursor pagination over one or more order querysets, newest first.
+
+    `paginate_queryset` accepts a list of querysets (one per indexed lookup).
+    The cursor condition `(created_at, id) < (last_created_at, last_id)` is
+    pushed into every branch, the branches are combined with UNION ALL and
+    the merged result is limited to one page, so each branch is read in
+    index order and only as far as the page needs. The key is always
+    `-created_at` (no `?ordering=`) and no COUNT is run.
+    """
+    default_ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of rows from the UNION ALL of the given branch querysets."""
+        branches = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+        cursor = self.start_page(branches[0].model, request, view)
+        self.total = None
+
+        branches = [b.order_by() for b in branches]
+        if cursor:
+            condition = self._after(cursor['v'], cursor['id'], self.scan_descending)
+            branches = [b.filter(condition) for b in branches]
+        combined = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+        return self.finish_page(combined.order_by(*self._order_by(self.scan_descending)))
+
+    def get_ordering(self, request, view):
+        """Always (created_at, descending); the branch indexes only serve this order."""
+        return self.default_ordering.lstrip('-'), True
@@ -2,7 +2,7 @@ from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 from auth_app.models import CustomUser
 from orders_app.models import Order
-from offers_app.models import OfferDetail
+from .utils import resolve_offer_detail
 
 class IsStaffOrAdminForDelete(BasePermission):
     """Allow DELETE only to staff or superusers; allow all other methods."""
@@ -44,9 +44,8 @@ class NotOrderingOwnOffer(BasePermission):
             od_id_int = int(od_id)
         except (TypeError, ValueError):
             return True
-        try:
-            od = OfferDetail.objects.select_related("offer", "offer__user").get(id=od_id_int)
-        except OfferDetail.DoesNotExist:
+        od = resolve_offer_detail(request, od_id_int)
+        if od is None:
             return True
         return od.offer.user_id != request.user.id
 
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
-from orders_app.models import Order
-from offers_app.models import OfferDetail
+from orders_app.models import FeatureSet, Order
 from auth_app.models import CustomUser
 from rest_framework.exceptions import NotFound
+from shared_app.sparse_fields import SparseFieldsetSerializerMixin
+from shared_app.projection import ProjectionSerializerMixin
+from .utils import resolve_offer_detail
 
 class OrderCreateSerializer(serializers.ModelSerializer):
     """Create serializer for Orders using an OfferDetail as source.
@@ -57,9 +59,7 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("offer_detail_id must be a valid integer.")
         if value <= 0:
             raise serializers.ValidationError("offer_detail_id must be a positive integer.")
-        try:
-            OfferDetail.objects.get(id=value)
-        except OfferDetail.DoesNotExist:
+        if resolve_offer_detail(self.context.get('request'), value) is None:
             raise NotFound("OfferDetail with this id does not exist.")
         return value
     
@@ -74,26 +74,49 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         request = self.context['request']
         customer_user: CustomUser = request.user
 
-        od = OfferDetail.objects.select_related('offer', 'offer__user').get(id=validated_data['offer_detail_id'])
-        related_offer = od.offer
-        business_user = related_offer.user
+        od = resolve_offer_detail(request, validated_data['offer_detail_id'])
+        return Order.objects.create(customer_user=customer_user, **self.snapshot(od))
 
-        return Order.objects.create(
-            offer=related_offer,
+    @staticmethod
+    def snapshot(od, feature_set=None):
+        """Return the Order fields copied from an OfferDetail (with offer loaded) at order time.
+
+        The features list is stored once per distinct content (FeatureSet);
+        pass an already interned feature_set to skip that insert.
+        """
+        return dict(
+            offer=od.offer,
             offer_detail=od,
-            customer_user=customer_user,
-            business_user=business_user,
+            business_user_id=od.offer.user_id,
             title=od.title,
             revisions=od.revisions,
             delivery_time_in_days=od.delivery_time_in_days,
             price=od.price,
-            features=od.features,
+            feature_set=feature_set or FeatureSet.objects.intern(od.features),
             offer_type=od.offer_type,
-            status=Order.OrderStatus.IN_PROGRESS,  
+            status=Order.OrderStatus.IN_PROGRESS,
         )
-    
-class OrderReadSerializer(serializers.ModelSerializer):
-    """Read-only serializer for returning Orders to clients."""
+
+class OrderBatchCreateSerializer(serializers.Serializer):
+    """Input for `POST /api/orders/batch/`: the OfferDetails to order in one checkout."""
+    max_items = 50
+
+    offer_detail_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=max_items,
+    )
+
+class OrderReadSerializer(SparseFieldsetSerializerMixin, ProjectionSerializerMixin, serializers.ModelSerializer):
+    """Read-only serializer for returning Orders to clients (supports ?fields=/?omit=).
+
+    `features` comes from the order's shared FeatureSet: the detail view
+    joins it, list views prefetch it and the projection path loads each
+    distinct set once per page.
+    """
+    sparse_columns = {'features': ('feature_set__features',)}
+    projection_columns = {'features': ('feature_set',)}
+
     class Meta:
         model = Order
         fields = [
@@ -103,29 +126,44 @@ class OrderReadSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields  
 
+    def prepare_projection(self, rows):
+        """Load the feature sets referenced by a page of value rows in one query."""
+        if 'features' not in self.fields:
+            return
+        column = self.projection_index['feature_set']
+        self._feature_sets = FeatureSet.objects.load(row[column] for row in rows)
+
+    def project_features(self, digest):
+        """Return the features list of the row's FeatureSet."""
+        return self._feature_sets[digest]
+
 class OrderStatusUpdateSerializer(serializers.ModelSerializer):
     """Serializer to update Order status with valid transitions only."""
+    not_in_progress_message = "Only orders with status 'in_progress' can be updated."
+
     class Meta:
         model = Order
         fields = ['status']  
 
     def validate_status(self, value):
-        """Enforce allowed status transitions from IN_PROGRESS to final states."""
+        """Enforce allowed status transitions from IN_PROGRESS to final states.
+
+        Without an instance only the target is checked; the source status is
+        then enforced by the conditional UPDATE (Order.objects.transition).
+        """
         instance: Order = self.instance
-        if not instance:
-            return value
 
         allowed_from = [Order.OrderStatus.IN_PROGRESS]
         allowed_to = [Order.OrderStatus.COMPLETED, Order.OrderStatus.CANCELLED]
 
-        if instance.status not in allowed_from:
-            raise serializers.ValidationError("Only orders with status 'in_progress' can be updated.")
+        if instance and instance.status not in allowed_from:
+            raise serializers.ValidationError(self.not_in_progress_message)
 
         if value not in allowed_to:
             raise serializers.ValidationError(f"Status can only transition to {allowed_to}.")
 
         return value
-    
+
 class OrderCountSerializer(serializers.ModelSerializer):
     """Serializer for count responses on orders (read-only)."""
     class Meta:
@@ -0,0 +1,54 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from orders_app.models import ArchivedOrder, Order, OrderStatusCounter
+from .events import publish_order_event
+
+
+@receiver(pre_save, sender=Order)
+def remember_counted_status(sender, instance: Order, raw=False, using=None, **kwargs):
+    """Load the stored (business_user, status) of an existing order before it is overwritten.
+
+    Runs inside Order.save()'s transaction and locks the row, so two
+    concurrent saves cannot both move the counter away from the same status.
+    """
+    instance._counted = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._counted = (
+        Order.objects.using(using).select_for_update().filter(pk=instance.pk)
+        .values_list('business_user_id', 'status').first()
+    )
+
+
+@receiver(post_save, sender=Order)
+def update_order_counters(sender, instance: Order, created=False, raw=False, **kwargs):
+    """Apply the order's create or status change to OrderStatusCounter (same transaction)."""
+    if raw:
+        return
+    new = (instance.business_user_id, instance.status)
+    old = getattr(instance, '_counted', None)
+    if created:
+        OrderStatusCounter.objects.add(*new, 1)
+    elif old is not None and old != new:
+        OrderStatusCounter.objects.add(*old, -1)
+        OrderStatusCounter.objects.add(*new, 1)
+
+
+@receiver(post_save, sender=Order)
+def publish_order_events(sender, instance: Order, created=False, raw=False, **kwargs):
+    """Push order.created / order.status_changed to the participants' streams after commit."""
+    if raw:
+        return
+    old = getattr(instance, '_counted', None)
+    if created:
+        publish_order_event(instance, 'order.created')
+    elif old is not None and old[1] != instance.status:
+        publish_order_event(instance, 'order.status_changed', previous_status=old[1])
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=ArchivedOrder)
+def decrement_order_counters(sender, instance, **kwargs):
+    """Remove a deleted (hot or archived) order from its counter."""
+    OrderStatusCounter.objects.add(instance.business_user_id, instance.status, -1)
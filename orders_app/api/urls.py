@@ -1,11 +1,15 @@
 from django.urls import path
 
-from .views import OrdersView, OrderDetailView, OrderCountView, OrderCompletetdCountView
+from .views import OrdersView, OrderBatchCreateView, OrderExportView, OrderDetailView, OrderCountView, OrderCompletetdCountView, OrderStatsView, order_stream
 
 app_name = 'offers_app'
 urlpatterns = [
     path('orders/', OrdersView.as_view(), name='orders'),
+    path('orders/stream/', order_stream, name='orders-stream'),
+    path('orders/export/', OrderExportView.as_view(), name='orders-export'),
+    path('orders/batch/', OrderBatchCreateView.as_view(), name='orders-batch'),
     path('orders/<int:id>/', OrderDetailView.as_view(), name='order-detail'),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
-    path('completed-order-count/<int:business_user_id>/', OrderCompletetdCountView.as_view(), name='order-count')
+    path('completed-order-count/<int:business_user_id>/', OrderCompletetdCountView.as_view(), name='completed-order-count'),
+    path('order-stats/', OrderStatsView.as_view(), name='order-stats'),
 ]
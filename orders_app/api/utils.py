@@ -0,0 +1,30 @@
+from offers_app.models import OfferDetail
+
+_IDENTITY_MAP_ATTR = '_orders_identity_map'
+
+
+def identity_map(request, model):
+    """Return the request-scoped {pk: instance or None} map for model.
+
+    Lives on the DRF request, so permissions, serializers and views handling
+    the same request share it and it is discarded with the request.
+    """
+    maps = getattr(request, _IDENTITY_MAP_ATTR, None)
+    if maps is None:
+        maps = {}
+        setattr(request, _IDENTITY_MAP_ATTR, maps)
+    return maps.setdefault(model, {})
+
+
+def resolve_offer_detail(request, pk):
+    """Return the OfferDetail (with offer and owner) for pk, or None if it does not exist.
+
+    Loaded at most once per request; misses are remembered as well.
+    """
+    queryset = OfferDetail.objects.select_related('offer', 'offer__user')
+    if request is None:
+        return queryset.filter(pk=pk).first()
+    details = identity_map(request, OfferDetail)
+    if pk not in details:
+        details[pk] = queryset.filter(pk=pk).first()
+    return details[pk]
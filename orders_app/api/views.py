@@ -1,38 +1,207 @@
-from django.db import models
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 
 from rest_framework import generics, status
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied, NotFound
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from rest_framework.response import Response
 
 from auth_app.models import CustomUser
-from orders_app.models import Order
-from .serializers import OrderReadSerializer, OrderCreateSerializer, OrderStatusUpdateSerializer, OrderCountSerializer
+from orders_app.models import ArchivedOrder, FeatureSet, Order, OrderStatusCounter
+from offers_app.models import OfferDetail
+from .serializers import OrderReadSerializer, OrderCreateSerializer, OrderBatchCreateSerializer, OrderStatusUpdateSerializer, OrderCountSerializer
+from shared_app.sparse_fields import SparseFieldsetViewMixin
+from shared_app.projection import ProjectionListMixin
+from shared_app.export import StreamingExportView
+from .pagination import OrdersCursorPagination
+from .events import publish_order_event, stream_events
 from .permissions import IsCustomerForCreate, NotOrderingOwnOffer, IsOrderParticipant, IsBusinessUser, IsStaffOrAdminForDelete
 
-class OrdersView(generics.ListCreateAPIView):
-    """List orders for the current user and create new orders."""
+class OrderBranchesMixin:
+    """Split "orders of the current user" into indexed per-role lookups (list and export)."""
+    roles = ('customer', 'business')
+    boolean_values = {'true': True, '1': True, 'false': False, '0': False}
+
+    def branch_queryset(self, queryset):
+        """Hook: adjust each source queryset (hot/archive) before it is split by role."""
+        return queryset
+
+    def get_branches(self):
+        """Return one indexed lookup per participant role instead of an OR condition.
+
+        Each branch is served by the (customer_user|business_user, status,
+        created_at) or (…, created_at) index. The business branch excludes
+        orders the user is also customer of, so UNION ALL yields no duplicates.
+        With `?include_archived=true` the same lookups run on the archive table.
+        """
+        params = self.request.query_params
+        role, status_value = params.get('role'), params.get('status')
+        if role is not None and role not in self.roles:
+            raise ValidationError({'role': f'Must be one of {list(self.roles)}.'})
+        if status_value is not None and status_value not in Order.OrderStatus.values:
+            raise ValidationError({'status': f'Must be one of {Order.OrderStatus.values}.'})
+
+        user = self.request.user
+        branches = []
+        for source in Order.objects.with_archive(self.include_archived()):
+            base = self.branch_queryset(source)
+            if status_value is not None:
+                base = base.filter(status=status_value)
+            if role in (None, 'customer'):
+                branches.append(base.filter(customer_user=user))
+            if role in (None, 'business'):
+                business = base.filter(business_user=user)
+                branches.append(business.exclude(customer_user=user) if role is None else business)
+        return branches
+
+    def include_archived(self):
+        """Parse `?include_archived=true|false` (default false)."""
+        value = self.request.query_params.get('include_archived', 'false').lower()
+        if value not in self.boolean_values:
+            raise ValidationError({'include_archived': 'Must be true or false.'})
+        return self.boolean_values[value]
+
+
+class OrdersView(OrderBranchesMixin, SparseFieldsetViewMixin, ProjectionListMixin, generics.ListCreateAPIView):
+    """List orders for the current user (cursor-paginated) and create new orders.
+
+    Supports `?role=customer|business` and `?status=`.
+    """
     permission_classes = [IsAuthenticated, IsCustomerForCreate, NotOrderingOwnOffer]
-  
+    pagination_class = OrdersCursorPagination
+
     def get_queryset(self):
-        """Return orders where the user is customer or business participant."""
-        user = self.request.user
-        return Order.objects.filter(
-            models.Q(customer_user=user) | models.Q(business_user=user)
-        )
-    
+        """Return the base order queryset, narrowed for `?fields=`/`?omit=`."""
+        return self.sparse_queryset(Order.objects.all())
+
+    def branch_queryset(self, queryset):
+        """Batch-load feature sets and narrow columns for `?fields=`/`?omit=`."""
+        return self.sparse_queryset(queryset.prefetch_related('feature_set'))
+
+    def list(self, request, *args, **kwargs):
+        """Return one page of the UNION ALL of the per-role lookups.
+
+        Archived branches are always read as value rows (projection), so hot
+        and archive rows line up column by column in the UNION.
+        """
+        branches = self.get_branches()
+        if not self.use_projection and not self.include_archived():
+            page = self.paginate_queryset(branches)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        serializer = self.get_serializer()
+        page = self.paginate_queryset([
+            serializer.projection_queryset(b, extra_columns=('id', 'created_at')) for b in branches
+        ])
+        return self.get_paginated_response(serializer.project(page))
+
     def get_serializer_class(self):
         """Use create serializer on POST; read serializer otherwise."""
         if self.request.method == 'POST':
             return OrderCreateSerializer
         return OrderReadSerializer
 
-class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderExportView(OrderBranchesMixin, StreamingExportView):
+    """Stream the current user's orders as CSV/NDJSON (`?role=`, `?status=`, `?include_archived=`, created range)."""
+    permission_classes = [IsAuthenticated]
+    export_filename = 'orders'
+    export_columns = (
+        ('id', 'id'), ('status', 'status'), ('customer_user', 'customer_user_id'),
+        ('business_user', 'business_user_id'), ('title', 'title'), ('offer_type', 'offer_type'),
+        ('revisions', 'revisions'), ('delivery_time_in_days', 'delivery_time_in_days'), ('price', 'price'),
+        ('features', 'feature_set__features'), ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+    )
+
+    def get_export_rows(self, created):
+        """UNION ALL of the per-role lookups in the created range, oldest first, fetched in chunks."""
+        lookups = [lookup for _, lookup in self.export_columns]
+        branches = [b.filter(**created).order_by().values_list(*lookups) for b in self.get_branches()]
+        combined = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+        return combined.order_by('created_at', 'id').iterator(chunk_size=self.chunk_size)
+
+class OrderBatchCreateView(generics.GenericAPIView):
+    """Place several orders (one per `offer_detail_id`) in one transactional request."""
+    permission_classes = [IsAuthenticated, IsCustomerForCreate]
+    serializer_class = OrderBatchCreateSerializer
+
+    def post(self, request):
+        """Resolve all OfferDetails at once, bulk-insert the valid items, report per item.
+
+        Each result carries the item's `offer_detail_id` and a `status` code:
+        201 with the created `order`, 404 for an unknown OfferDetail or 403
+        for the customer's own offer. The response is 201 if at least one
+        order was placed, otherwise 400.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['offer_detail_ids']
+        details = OfferDetail.objects.select_related('offer').in_bulk(set(ids))
+
+        results, valid = [], []
+        for od_id in ids:
+            od = details.get(od_id)
+            if od is None:
+                results.append({"offer_detail_id": od_id, "status": status.HTTP_404_NOT_FOUND,
+                                "error": "OfferDetail with this id does not exist."})
+            elif od.offer.user_id == request.user.id:
+                results.append({"offer_detail_id": od_id, "status": status.HTTP_403_FORBIDDEN,
+                                "error": NotOrderingOwnOffer.message})
+            else:
+                results.append({"offer_detail_id": od_id, "status": status.HTTP_201_CREATED, "order": None})
+                valid.append(od)
+
+        orders = []
+        if valid:
+            with transaction.atomic():
+                # Ein INSERT für alle neuen Feature-Sets des Warenkorbs
+                feature_sets = FeatureSet.objects.intern_many([od.features for od in valid])
+                orders = Order.objects.bulk_create([
+                    Order(customer_user=request.user, **OrderCreateSerializer.snapshot(od, feature_set))
+                    for od, feature_set in zip(valid, feature_sets)
+                ])
+                # bulk_create sendet keine Signale: Zähler hier nachziehen
+                for business_user_id, n in Counter(o.business_user_id for o in orders).items():
+                    OrderStatusCounter.objects.add(business_user_id, Order.OrderStatus.IN_PROGRESS, n)
+                for order in orders:
+                    publish_order_event(order, 'order.created')
+            data = iter(OrderReadSerializer(orders, many=True).data)
+            for result in results:
+                if "order" in result:
+                    result["order"] = next(data)
+
+        code = status.HTTP_201_CREATED if orders else status.HTTP_400_BAD_REQUEST
+        return Response({"created": len(orders), "results": results}, status=code)
+
+class OrderDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update status, or delete a single order with checks."""
     permission_classes = [IsAuthenticated, IsOrderParticipant]
-    queryset = Order.objects.select_related("customer_user", "business_user", "offer", "offer_detail")
+    queryset = Order.objects.select_related("customer_user", "business_user", "offer", "offer_detail", "feature_set")
     lookup_field = 'id'
-    
+
+    def get_queryset(self):
+        """Narrow columns for `?fields=`/`?omit=` on GET; participants are checked via *_id."""
+        return self.sparse_queryset(super().get_queryset(), extra_columns=('customer_user', 'business_user'))
+
+    def get_object(self):
+        """Return the order; reads of an id missing from the hot table fall back to the archive."""
+        try:
+            return super().get_object()
+        except Http404:
+            if self.request.method not in SAFE_METHODS:
+                raise
+        archive = ArchivedOrder.objects.select_related("customer_user", "business_user", "offer", "offer_detail", "feature_set")
+        queryset = self.sparse_queryset(archive, extra_columns=('customer_user', 'business_user'))
+        obj = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[self.lookup_field]})
+        self.check_object_permissions(self.request, obj)
+        return obj
+
     def get_serializer_class(self):
         """For PUT/PATCH return status update serializer; read otherwise."""
         if self.request.method in ['PUT', 'PATCH']:
@@ -46,48 +215,73 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
             permissions.append(IsStaffOrAdminForDelete())
         return permissions
 
-    def perform_update(self, serializer):
-        """Ensure only the business user of the order can update status."""
-        instance = self.get_object()
-        if instance.business_user_id != self.request.user.id:
-            raise PermissionDenied("You do not have permission to update this order.")
-        serializer.save()
-
     def update(self, request, *args, **kwargs):
-        """Validate and apply status update, then return refreshed order."""
+        """Apply a status change as one conditional UPDATE and return the updated order.
+
+        If no row matched, one lookup decides between 404 (no such order),
+        403 (not a participant / not the business user) and 400 (no longer
+        in progress).
+        """
         partial = kwargs.pop('partial', request.method == 'PATCH')
-        
-        instance = self.get_object()
-        input_serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        input_serializer = self.get_serializer(data=request.data, partial=partial)
         input_serializer.is_valid(raise_exception=True)
-        self.perform_update(input_serializer)
+        new_status = input_serializer.validated_data.get('status')
+        if new_status is None:
+            return Response(OrderReadSerializer(self.get_object()).data)
+
+        order_id = kwargs[self.lookup_field]
+        instance = Order.objects.transition(
+            order_id, request.user.id, Order.OrderStatus.IN_PROGRESS, new_status
+        )
+        if instance is None:
+            self.raise_transition_error(order_id)
+        publish_order_event(instance, 'order.status_changed', previous_status=Order.OrderStatus.IN_PROGRESS)
+        return Response(OrderReadSerializer(instance).data)
+
+    def raise_transition_error(self, order_id):
+        """Explain why the conditional status UPDATE matched no row."""
+        columns = ('customer_user_id', 'business_user_id')
+        row = (Order.objects.filter(pk=order_id).values_list(*columns).first()
+               or ArchivedOrder.objects.filter(pk=order_id).values_list(*columns).first())
+        if row is None:
+            raise NotFound("No Order matches the given query.")
+        customer_user_id, business_user_id = row
+        user_id = self.request.user.id
+        if user_id not in (customer_user_id, business_user_id):
+            raise PermissionDenied()
+        if business_user_id != user_id:
+            raise PermissionDenied("You do not have permission to update this order.")
+        raise ValidationError({'status': [OrderStatusUpdateSerializer.not_in_progress_message]})
 
-        instance.refresh_from_db()
-        output_serializer = OrderReadSerializer(instance)
-        return Response(output_serializer.data)
-    
     def destroy(self, request, *args, **kwargs):
         """Delete an order; protected by IsStaffOrAdminForDelete permission."""
         instance = self.get_object()
         self.perform_destroy(instance)
         return Response(status=status.HTTP_200_OK)  
     
+def counter_value(business_user_id, status):
+    """Return the stored order count for one business user, or raise NotFound.
+
+    One query: the user row (404 if missing) with its counter as a subquery.
+    """
+    counter = OrderStatusCounter.objects.filter(
+        business_user_id=OuterRef('pk'), status=status
+    ).values('count')[:1]
+    row = CustomUser.objects.filter(id=business_user_id).annotate(n=Subquery(counter)).values_list('n').first()
+    if row is None:
+        raise NotFound("Business-User with this id does not exist.")
+    return row[0] or 0
+
+
 class OrderCountView(generics.GenericAPIView):
-    """Return total order count for a given business user id."""
+    """Return the in-progress order count for a given business user id."""
     permission_classes = [IsAuthenticated]
     serializer_class = OrderCountSerializer
-   
 
     def get(self, request, business_user_id):
-        """Validate business user and return count of all related orders."""
-        if not CustomUser.objects.filter(id=business_user_id).exists():
-            raise NotFound("Business-User with this id does not exist.")  
-        
-        order_count = Order.objects.filter(
-            business_user_id=business_user_id,
-            status=Order.OrderStatus.IN_PROGRESS,
-        ).count()
-        return Response({"order_count": order_count}, status=status.HTTP_200_OK)    
+        """Read the maintained counter for in-progress orders."""
+        order_count = counter_value(business_user_id, Order.OrderStatus.IN_PROGRESS)
+        return Response({"order_count": order_count}, status=status.HTTP_200_OK)
 
 class OrderCompletetdCountView(generics.GenericAPIView):
     """Return completed orders count for a given business user id."""
@@ -95,9 +289,59 @@ class OrderCompletetdCountView(generics.GenericAPIView):
     serializer_class = OrderCountSerializer
 
     def get(self, request, business_user_id):
-        """Validate business user and return count of completed orders only."""
-        if not CustomUser.objects.filter(id=business_user_id).exists():
-            raise NotFound("Business-User with this id does not exist.")  
-        
-        order_count = Order.objects.filter(business_user_id=business_user_id, status=Order.OrderStatus.COMPLETED).count()
+        """Read the maintained counter for completed orders."""
+        order_count = counter_value(business_user_id, Order.OrderStatus.COMPLETED)
         return Response({"completed_order_count": order_count}, status=status.HTTP_200_OK)
+
+class OrderStatsView(generics.GenericAPIView):
+    """Return in-progress and completed counts for many business users at once."""
+    permission_classes = [IsAuthenticated]
+    max_ids = 100
+
+    def get(self, request):
+        """Answer `?business_user_ids=1,2,3` from the counters table in one query."""
+        raw = request.query_params.get('business_user_ids', '')
+        try:
+            ids = list(dict.fromkeys(int(v) for v in raw.split(',') if v.strip()))
+        except ValueError:
+            raise ValidationError({'business_user_ids': 'Must be a comma-separated list of integers.'})
+        if not ids or len(ids) > self.max_ids:
+            raise ValidationError({'business_user_ids': f'Provide between 1 and {self.max_ids} ids.'})
+
+        counts = OrderStatusCounter.objects.counts_for(ids)
+        return Response([
+            {
+                "business_user": pk,
+                "order_count": counts[pk].get(Order.OrderStatus.IN_PROGRESS, 0),
+                "completed_order_count": counts[pk].get(Order.OrderStatus.COMPLETED, 0),
+            }
+            for pk in ids
+        ], status=status.HTTP_200_OK)
+
+
+async def order_stream(request):
+    """Server-Sent Events stream of the current user's order events (ASGI only).
+
+    Authenticates with `Authorization: Token <key>`; resumes after the
+    `Last-Event-ID` header (or `?last_event_id=`) from the replay buffer.
+    Under WSGI Django would buffer the endless stream before sending
+    anything, so non-ASGI requests get a 501 right away.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "The order stream needs an ASGI server (e.g. uvicorn core.asgi:application)."}, status=501
+        )
+    if request.method != 'GET':
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    try:
+        auth = await sync_to_async(TokenAuthentication().authenticate)(request)
+    except AuthenticationFailed as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=401)
+    if auth is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    response = StreamingHttpResponse(stream_events(auth[0].id, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from orders_app.models import Order
+
+
+class Command(BaseCommand):
+    """Move finished orders out of the hot Order table into ArchivedOrder."""
+    help = "Archive completed/cancelled orders not updated for --older-than-days days, in batched transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            default=getattr(settings, 'ORDER_ARCHIVE_AFTER_DAYS', 365))
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many orders would move.")
+
+    def handle(self, *args, **options):
+        """Archive batch by batch; each batch commits on its own."""
+        if options['older_than_days'] < 0 or options['batch_size'] <= 0:
+            raise CommandError("--older-than-days must be >= 0 and --batch-size > 0.")
+        before = timezone.now() - timedelta(days=options['older_than_days'])
+        if options['dry_run']:
+            count = Order.objects.filter(status__in=Order.FINISHED_STATUSES, updated_at__lt=before).count()
+            self.stdout.write(f"{count} finished orders last updated before {before:%Y-%m-%d} would be archived.")
+            return
+        moved = Order.objects.archive_finished(before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} orders last updated before {before:%Y-%m-%d}."))
@@ -0,0 +1,107 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import ArchivedOrder, FeatureSet, Order
+from orders_app.api.views import OrderDetailView, OrdersView
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark fixture."""
+
+
+class Command(BaseCommand):
+    """Time the hot order read paths before and after archiving finished orders."""
+    help = "Benchmark order list/detail/count latency before and after archival (data is rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20000)
+        parser.add_argument('--finished-ratio', type=float, default=0.9)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        """Build a throwaway fixture, time the hot paths, archive, time again, roll back."""
+        try:
+            with transaction.atomic():
+                business, open_order = self._create_fixture(options['orders'], options['finished_ratio'])
+                before = self._measure(business, open_order, options['repeat'])
+                moved = Order.objects.filter(business_user=business).archive_finished(
+                    timezone.now() - timedelta(days=30), batch_size=1000
+                )
+                after = self._measure(business, open_order, options['repeat'])
+                self.stdout.write(
+                    f"archived {moved} of {options['orders']} orders "
+                    f"(hot: {Order.objects.filter(business_user=business).count()}, "
+                    f"archive: {ArchivedOrder.objects.filter(business_user=business).count()})"
+                )
+                for label in before:
+                    self.stdout.write(
+                        f"{label:<28} before {before[label]:>7.2f} ms  after {after[label]:>7.2f} ms  "
+                        f"x{before[label] / after[label]:.1f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _measure(self, business, open_order, repeat):
+        """Return the median milliseconds of each hot read path."""
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+        list_view, detail_view = OrdersView.as_view(), OrderDetailView.as_view()
+
+        def get_list(params):
+            request = factory.get('/api/orders/', params)
+            force_authenticate(request, user=business)
+            return list_view(request).render()
+
+        def get_detail():
+            request = factory.get(f'/api/orders/{open_order.id}/')
+            force_authenticate(request, user=business)
+            return detail_view(request, id=open_order.id).render()
+
+        cases = {
+            'list (business, page 1)': lambda: get_list({'role': 'business'}),
+            'list (?status=in_progress)': lambda: get_list({'role': 'business', 'status': 'in_progress'}),
+            'detail (open order)': get_detail,
+            'count (business orders)': lambda: Order.objects.filter(business_user=business).count(),
+        }
+        return {label: self._median_ms(fn, repeat) for label, fn in cases.items()}
+
+    def _median_ms(self, fn, repeat):
+        """Return the median wall time of fn() in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def _create_fixture(self, n, finished_ratio):
+        """Insert n orders for one business user; the finished share is a year old."""
+        business = CustomUser.objects.create(username='bench-archive-biz', email='bench-archive-biz@example.com',
+                                             type=CustomUser.Roles.BUSINESS)
+        customers = CustomUser.objects.bulk_create([
+            CustomUser(username=f'bench-archive-cust-{i}', email=f'bench-archive-{i}@example.com',
+                       type=CustomUser.Roles.CUSTOMER)
+            for i in range(50)
+        ])
+        offer = Offer.objects.create(user=business, title='Archive benchmark', description='x')
+        detail = OfferDetail.objects.create(offer=offer, title='basic', offer_type='basic', price=10,
+                                            delivery_time_in_days=1, features=['a'])
+        finished = int(n * finished_ratio)
+        feature_set = FeatureSet.objects.intern(detail.features)
+        orders = Order.objects.bulk_create([
+            Order(offer=offer, offer_detail=detail, customer_user=customers[i % len(customers)], business_user=business,
+                  title=detail.title, price=detail.price, feature_set=feature_set, offer_type=detail.offer_type,
+                  status=Order.FINISHED_STATUSES[i % 2] if i < finished else Order.OrderStatus.IN_PROGRESS)
+            for i in range(n)
+        ], batch_size=1000)
+        year_ago = timezone.now() - timedelta(days=365)
+        Order.objects.filter(business_user=business, status__in=Order.FINISHED_STATUSES).update(created_at=year_ago, updated_at=year_ago)
+        return business, orders[-1]
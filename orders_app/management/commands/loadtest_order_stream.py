@@ -0,0 +1,77 @@
+import asyncio
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders_app.api.events import OrderEventHub, stream_events
+
+
+class Command(BaseCommand):
+    """Hold many idle order streams open in-process and measure memory and fan-out latency."""
+    help = "Load-test the order SSE hub with thousands of idle connections (no network, no database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=5000)
+        parser.add_argument('--users', type=int, default=0, help="Distinct users (default: one per connection).")
+        parser.add_argument('--events', type=int, default=5)
+
+    def handle(self, *args, **options):
+        """Run the scenario on a fresh event loop and print the measurements."""
+        connections, events = options['connections'], options['events']
+        users = options['users'] or connections
+        if connections <= 0 or events <= 0:
+            raise CommandError("--connections and --events must be positive.")
+        stats = asyncio.run(self._run(connections, users, events))
+        self.stdout.write(
+            f"{connections} idle streams ({users} users): "
+            f"{stats['bytes_per_stream']:.0f} B/stream, "
+            f"fan-out p50 {stats['p50_ms']:.1f} ms, max {stats['max_ms']:.1f} ms"
+        )
+        if stats['delivered'] != connections * events or stats['open_after'] != 0:
+            raise CommandError(
+                f"Delivered {stats['delivered']}/{connections * events} events, "
+                f"{stats['open_after']} streams left open."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Delivered {stats['delivered']} events, all streams released."))
+
+    async def _run(self, connections, users, events):
+        """Open the streams, publish to every user, wait for full delivery, then disconnect."""
+        hub = OrderEventHub(queue_size=events + 1)
+        received = [0] * events
+        done = [asyncio.Event() for _ in range(events)]
+
+        async def client(user_id):
+            async for chunk in stream_events(user_id, event_hub=hub, heartbeat=3600):
+                if chunk.startswith('id: '):
+                    n = int(chunk.split('\n', 1)[0].rsplit('-', 1)[1]) - 1
+                    received[n] += 1
+                    if received[n] == connections:
+                        done[n].set()
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        tasks = [asyncio.create_task(client(i % users)) for i in range(connections)]
+        while hub.connection_count() < connections:
+            await asyncio.sleep(0)
+        bytes_per_stream = (tracemalloc.get_traced_memory()[0] - baseline) / connections
+        tracemalloc.stop()
+
+        latencies = []
+        for n in range(events):
+            started = time.perf_counter()
+            hub.publish('load.test', {'n': n}, range(users))
+            await done[n].wait()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        latencies.sort()
+        return {
+            'bytes_per_stream': bytes_per_stream,
+            'p50_ms': latencies[len(latencies) // 2],
+            'max_ms': latencies[-1],
+            'delivered': sum(received),
+            'open_after': hub.connection_count(),
+        }
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from orders_app.models import OrderStatusCounter
+
+
+class Command(BaseCommand):
+    """Rebuild OrderStatusCounter rows from the Order and ArchivedOrder tables."""
+    help = "Recompute per-business order counters from Order and ArchivedOrder and report drifted (business_user, status) pairs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Rebuild in one transaction and list what had drifted."""
+        drifted = OrderStatusCounter.objects.rebuild(batch_size=options['batch_size'])
+        for business_user_id, status in drifted:
+            self.stdout.write(f"business_user={business_user_id} status={status}: corrected")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt order counters ({len(drifted)} drifted)."))
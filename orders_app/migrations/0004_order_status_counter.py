@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    """Create counters for all existing orders with one grouped query."""
+    Order = apps.get_model('orders_app', 'Order')
+    OrderStatusCounter = apps.get_model('orders_app', 'OrderStatusCounter')
+    rows = Order.objects.order_by().values_list('business_user_id', 'status').annotate(n=models.Count('id'))
+    OrderStatusCounter.objects.bulk_create(
+        [OrderStatusCounter(business_user_id=b, status=s, count=n) for b, s, n in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0003_order_status_created_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('business_user', 'status'), name='order_counter_business_status_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
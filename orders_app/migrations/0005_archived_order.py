@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0010_offer_image_variants'),
+        ('orders_app', '0004_order_status_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('revisions', models.PositiveIntegerField(default=0)),
+                ('delivery_time_in_days', models.PositiveIntegerField(default=0)),
+                ('price', models.DecimalField(decimal_places=0, default=0, max_digits=10)),
+                ('features', models.JSONField(default=list)),
+                ('offer_type', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_business_orders', to=settings.AUTH_USER_MODEL)),
+                ('customer_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_orders', to=settings.AUTH_USER_MODEL)),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='offers_app.offer')),
+                ('offer_detail', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='offers_app.offerdetail')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['customer_user', 'created_at'], name='archived_customer_created_idx'), models.Index(fields=['business_user', 'created_at'], name='archived_business_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def digest_for(features):
+    """Same content address as FeatureSet.digest_for (frozen copy for this migration)."""
+    canonical = json.dumps(features, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def backfill_feature_sets(apps, schema_editor):
+    """Intern every order's features and point the order at its FeatureSet, batch by batch."""
+    FeatureSet = apps.get_model('orders_app', 'FeatureSet')
+    for model_name in ('Order', 'ArchivedOrder'):
+        model = apps.get_model('orders_app', model_name)
+        last_id = 0
+        while True:
+            rows = list(model.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'features')[:BATCH_SIZE])
+            if not rows:
+                break
+            by_digest = {}
+            for pk, features in rows:
+                features = features if features is not None else []
+                by_digest.setdefault(digest_for(features), (features, []))[1].append(pk)
+            FeatureSet.objects.bulk_create(
+                [FeatureSet(digest=d, features=f) for d, (f, _) in by_digest.items()], ignore_conflicts=True
+            )
+            for digest, (_, ids) in by_digest.items():
+                model.objects.filter(id__in=ids).update(feature_set_id=digest)
+            last_id = rows[-1][0]
+
+
+def restore_features(apps, schema_editor):
+    """Copy the referenced features back into each order row."""
+    FeatureSet = apps.get_model('orders_app', 'FeatureSet')
+    for model_name in ('Order', 'ArchivedOrder'):
+        model = apps.get_model('orders_app', model_name)
+        for digest, features in FeatureSet.objects.values_list('digest', 'features').iterator():
+            model.objects.filter(feature_set_id=digest).update(features=features)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders_app', '0005_archived_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureSet',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('features', models.JSONField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='feature_set',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='orders_app.featureset'),
+        ),
+        migrations.AddField(
+            model_name='archivedorder',
+            name='feature_set',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='orders_app.featureset'),
+        ),
+        migrations.RunPython(backfill_feature_sets, restore_features),
+        migrations.RemoveField(
+            model_name='order',
+            name='features',
+        ),
+        migrations.RemoveField(
+            model_name='archivedorder',
+            name='features',
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='feature_set',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='orders_app.featureset'),
+        ),
+        migrations.AlterField(
+            model_name='archivedorder',
+            name='feature_set',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='orders_app.featureset'),
+        ),
+    ]
@@ -1,8 +1,149 @@
-from django.db import models
+import hashlib
+import json
+import logging
+from collections import Counter
+
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F
 from django.utils import timezone
 from auth_app.models import CustomUser 
 from offers_app.models import OfferDetail, Offer
 
+logger = logging.getLogger(__name__)
+
+
+class FeatureSetQuerySet(models.QuerySet):
+    """Interning and batch loading of FeatureSet rows."""
+
+    def intern(self, features):
+        """Return the FeatureSet for features, storing it if it is new (one INSERT ... ON CONFLICT IGNORE)."""
+        return self.intern_many([features])[0]
+
+    def intern_many(self, feature_lists):
+        """Return a FeatureSet per features list; store all new sets with one bulk insert.
+
+        Equal lists share one (unsaved-but-stored) instance, so assigning it
+        to orders needs no further query to read the features back.
+        """
+        sets = {}
+        for features in feature_lists:
+            digest = FeatureSet.digest_for(features)
+            sets.setdefault(digest, FeatureSet(digest=digest, features=features))
+        self.bulk_create(list(sets.values()), ignore_conflicts=True)
+        return [sets[FeatureSet.digest_for(features)] for features in feature_lists]
+
+    def load(self, digests):
+        """Return {digest: features} for the given digests in one query; each set is decoded once."""
+        return dict(self.filter(digest__in=set(digests)).values_list('digest', 'features'))
+
+
+class FeatureSet(models.Model):
+    """Immutable features list, stored once and referenced by every order that snapshots it.
+
+    The primary key is the SHA-256 of the canonical JSON, so equal lists
+    share one row and a row never changes.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    features = models.JSONField()
+
+    objects = FeatureSetQuerySet.as_manager()
+
+    @staticmethod
+    def digest_for(features):
+        """Return the content address of a features list."""
+        canonical = json.dumps(features, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def __str__(self):
+        return f"{self.digest[:12]}: {self.features}"
+
+
+class OrderQuerySet(models.QuerySet):
+    """Order queries that need more than the default manager."""
+
+    def transition(self, pk, business_user_id, from_status, to_status):
+        """Move one order from from_status to to_status in a single conditional UPDATE.
+
+        Only matches if the order belongs to business_user_id and still has
+        from_status, so concurrent transitions cannot both succeed. Returns
+        the updated Order (via UPDATE ... RETURNING on PostgreSQL and
+        SQLite >= 3.35, else via a re-select) or None if no row matched. The
+        status counters are moved in the same transaction, since update()
+        sends no signals.
+        """
+        values = {'status': to_status, 'updated_at': timezone.now()}
+        connection = connections[self.db]
+        with transaction.atomic(using=self.db):
+            if self._supports_update_returning(connection):
+                order = self._update_returning(connection, pk, business_user_id, from_status, values)
+            else:
+                matching = self.filter(pk=pk, business_user_id=business_user_id, status=from_status)
+                order = self.filter(pk=pk).first() if matching.update(**values) else None
+            if order is not None:
+                OrderStatusCounter.objects.using(self.db).move(business_user_id, from_status, to_status)
+        return order
+
+    @staticmethod
+    def _supports_update_returning(connection):
+        """True for backends known to accept UPDATE ... RETURNING (MariaDB/Oracle syntax differs)."""
+        if connection.vendor == 'postgresql':
+            return True
+        return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+
+    def _update_returning(self, connection, pk, business_user_id, from_status, values):
+        """Run the conditional UPDATE as plain SQL with RETURNING; return the Order or None."""
+        meta, qn = self.model._meta, connection.ops.quote_name
+        assignments = ', '.join(f'{qn(meta.get_field(name).column)} = %s' for name in values)
+        params = [meta.get_field(name).get_db_prep_save(value, connection) for name, value in values.items()]
+        columns = ', '.join(qn(f.column) for f in meta.concrete_fields)
+        sql = (
+            f'UPDATE {qn(meta.db_table)} SET {assignments} '
+            f'WHERE {qn(meta.pk.column)} = %s AND {qn(meta.get_field("business_user").column)} = %s '
+            f'AND {qn(meta.get_field("status").column)} = %s RETURNING {columns}'
+        )
+        rows = self.model.objects.db_manager(self.db).raw(sql, params + [pk, business_user_id, from_status])
+        return next(iter(rows), None)
+
+    def with_archive(self, include=True):
+        """Return the querysets a read has to cover: [hot] or, when asked for, [hot, archive].
+
+        The archive table is only touched if include is true; callers apply
+        the same filters to each queryset (both share the field names).
+        """
+        sources = [self.all()]
+        if include:
+            sources.append(ArchivedOrder.objects.using(self.db).all())
+        return sources
+
+    def archive_finished(self, before, batch_size=500):
+        """Move finished orders last updated before `before` into ArchivedOrder; return how many.
+
+        Works in batches of batch_size, one transaction each: copy the rows
+        (same ids) and delete them from the hot table. The delete sends no
+        signals, because OrderStatusCounter counts archived orders too.
+        """
+        finished = self.filter(status__in=Order.FINISHED_STATUSES, updated_at__lt=before).order_by('pk')
+        fields = [f.attname for f in Order._meta.concrete_fields]
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        moved = 0
+        while True:
+            with transaction.atomic(using=self.db):
+                rows = list(finished.select_for_update().values(*fields)[:batch_size])
+                if not rows:
+                    return moved
+                ArchivedOrder.objects.using(self.db).bulk_create([ArchivedOrder(**row) for row in rows])
+                ids = [row['id'] for row in rows]
+                # Plain DELETE statt QuerySet.delete(): kein post_delete, der Zähler
+                # bleibt stehen (nichts verweist per FK auf Order, kein Cascade nötig)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'DELETE FROM {qn(Order._meta.db_table)} '
+                        f'WHERE {qn(Order._meta.pk.column)} IN ({", ".join(["%s"] * len(ids))})',
+                        ids,
+                    )
+            moved += len(rows)
+
 
 class Order(models.Model):
     """Represents a placed order between a customer and business user."""
@@ -25,7 +166,7 @@ class Order(models.Model):
     revisions = models.PositiveIntegerField(default=0)
     delivery_time_in_days = models.PositiveIntegerField(default=0)
     price = models.DecimalField(max_digits=10, decimal_places=0, default=0)
-    features = models.JSONField(default=list)
+    feature_set = models.ForeignKey(FeatureSet, on_delete=models.PROTECT, related_name='+')
     offer_type = models.CharField(max_length=20)
 
     status = models.CharField(max_length=20, choices=OrderStatus.choices, default=OrderStatus.IN_PROGRESS)
@@ -33,8 +174,154 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    # Abgeschlossene Bestellungen, die archiviert werden dürfen
+    FINISHED_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELLED)
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+            # ?status= list filter and the per-status counts
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_status_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save in a transaction so the status counters (signals) commit together with the order."""
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Order #{self.pk} - {self.title} ({self.status})"
+
+    @property
+    def features(self):
+        """Snapshot features list, read from the shared FeatureSet."""
+        return self.feature_set.features
+
+
+class ArchivedOrder(models.Model):
+    """Finished order moved out of the hot Order table (same id and snapshot columns).
+
+    Filled by `python manage.py archive_orders`; read only when a query asks
+    for archived orders (Order.objects.with_archive()).
+    """
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name="archived_orders")
+    offer_detail = models.ForeignKey(OfferDetail, on_delete=models.CASCADE, related_name="archived_orders", null=True, blank=True)
+
+    customer_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='archived_customer_orders')
+    business_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='archived_business_orders')
+
+    title = models.CharField(max_length=255)
+    revisions = models.PositiveIntegerField(default=0)
+    delivery_time_in_days = models.PositiveIntegerField(default=0)
+    price = models.DecimalField(max_digits=10, decimal_places=0, default=0)
+    feature_set = models.ForeignKey(FeatureSet, on_delete=models.PROTECT, related_name='+')
+    offer_type = models.CharField(max_length=20)
+
+    status = models.CharField(max_length=20, choices=Order.OrderStatus.choices)
+
+    # Werte der ursprünglichen Bestellung, nicht neu gesetzt
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer_user', 'created_at'], name='archived_customer_created_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='archived_business_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived order #{self.pk} - {self.title} ({self.status})"
+
+    @property
+    def features(self):
+        """Snapshot features list, read from the shared FeatureSet."""
+        return self.feature_set.features
+
+
+class OrderStatusCounterQuerySet(models.QuerySet):
+    """Delta updates for the per-(business user, status) order counters."""
+
+    def add(self, business_user_id, status, delta):
+        """Add delta to one counter with a single UPDATE, creating the row on first use.
+
+        A decrement without a row means the counters have drifted; it is
+        logged (fix with `rebuild_order_counters`), not silently dropped.
+        """
+        if not delta:
+            return
+        counter = self.filter(business_user_id=business_user_id, status=status)
+        if counter.update(count=F('count') + delta):
+            return
+        if delta < 0:
+            logger.warning(
+                'OrderStatusCounter missing for business_user=%s status=%s (delta %s); run rebuild_order_counters',
+                business_user_id, status, delta,
+            )
+            return
+        try:
+            with transaction.atomic():
+                self.create(business_user_id=business_user_id, status=status, count=delta)
+        except IntegrityError:
+            # Created concurrently by another transaction
+            counter.update(count=F('count') + delta)
+
+    def move(self, business_user_id, old_status, new_status, n=1):
+        """Move n orders of one business user from old_status to new_status."""
+        if old_status == new_status:
+            return
+        self.add(business_user_id, old_status, -n)
+        self.add(business_user_id, new_status, n)
+
+    def rebuild(self, batch_size=1000):
+        """Recompute every counter from Order and ArchivedOrder in one transaction; return the drifted pairs."""
+        with transaction.atomic():
+            expected = Counter()
+            for model in (Order, ArchivedOrder):
+                for b, s, n in model.objects.order_by().values_list('business_user_id', 'status').annotate(
+                    n=models.Count('id')
+                ):
+                    expected[b, s] += n
+            stored = {(b, s): n for b, s, n in self.values_list('business_user_id', 'status', 'count')}
+            drifted = sorted(k for k in expected.keys() | stored.keys() if expected.get(k, 0) != stored.get(k, 0))
+            self.all().delete()
+            self.bulk_create(
+                [OrderStatusCounter(business_user_id=b, status=s, count=n) for (b, s), n in expected.items()],
+                batch_size=batch_size,
+            )
+        return drifted
+
+    def counts_for(self, business_user_ids):
+        """Return {business_user_id: {status: count}} for the given users (one query)."""
+        result = {pk: {} for pk in business_user_ids}
+        for pk, status, count in self.filter(business_user_id__in=business_user_ids).values_list(
+            'business_user_id', 'status', 'count'
+        ):
+            result[pk][status] = count
+        return result
+
+
+class OrderStatusCounter(models.Model):
+    """Number of orders per business user and status, maintained on every order write.
+
+    Rebuild with `python manage.py rebuild_order_counters`.
+    """
+    business_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='order_counters')
+    status = models.CharField(max_length=20, choices=Order.OrderStatus.choices)
+    count = models.IntegerField(default=0)
+
+    objects = OrderStatusCounterQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['business_user', 'status'], name='order_counter_business_status_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.business_user_id}/{self.status}: {self.count}"
@@ -1,3 +1,629 @@
-from django.test import TestCase
+import asyncio
+import csv
+import json
+import os
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import ArchivedOrder, FeatureSet, Order, OrderQuerySet, OrderStatusCounter
+from orders_app.api.events import OrderEventHub, hub as order_hub
+from shared_app.export import EXPORT_CHUNK_SIZE
+from shared_app.query_plans import QueryPlanAssertionsMixin
+
+
+def _rss_bytes():
+    """Current resident set size of this process (Linux)."""
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class OrderFixtureMixin:
+
+    def create_fixture(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.customer = CustomUser.objects.create_user(
+            username="cust", email="cust@mail.de", password="pw", type=CustomUser.Roles.CUSTOMER
+        )
+        self.offer = Offer.objects.create(user=self.business, title="Logo", description="x")
+        self.details = {
+            ot: OfferDetail.objects.create(
+                offer=self.offer, title=f"{ot} tier", offer_type=ot, price=10 * (i + 1),
+                delivery_time_in_days=i + 1, revisions=i, features=[f"{ot} feature"],
+            )
+            for i, ot in enumerate(OfferDetail.OfferTypes.values)
+        }
+
+    def create_order(self, detail=None, status=Order.OrderStatus.IN_PROGRESS):
+        detail = detail or self.details["basic"]
+        return Order.objects.create(
+            offer=self.offer, offer_detail=detail, customer_user=self.customer, business_user=self.business,
+            title=detail.title, revisions=detail.revisions, delivery_time_in_days=detail.delivery_time_in_days,
+            price=detail.price, feature_set=FeatureSet.objects.intern(detail.features), offer_type=detail.offer_type,
+            status=status,
+        )
+
+
+class OrdersQueryPlanTest(QueryPlanAssertionsMixin, OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.create_fixture()
+        for status in Order.OrderStatus.values:
+            self.create_order(status=status)
+        self.client.force_authenticate(self.customer)
+
+    def test_orders_list_is_index_served(self):
+        url = reverse("orders:orders")
+        for params in ({}, {"status": "completed"}, {"role": "business"}, {"role": "customer", "status": "cancelled"}):
+            with self.subTest(params=params):
+                self.assertIndexedPlans(lambda: self.client.get(url, params))
+
+    def test_orders_list_cursor_page_is_index_served(self):
+        first = self.client.get(reverse("orders:orders"), {"page_size": 1})
+        self.assertIndexedPlans(lambda: self.client.get(first.data["next"]))
+
+    def test_order_counts_are_index_served(self):
+        for name in ("orders:order-count", "orders:completed-order-count"):
+            with self.subTest(name=name):
+                self.assertIndexedPlans(lambda: self.client.get(reverse(name, args=[self.business.id])))
+
+
+class OrderSparseFieldsetTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.order = self.create_order()
+        self.client.force_authenticate(self.customer)
+
+    def test_list_and_detail_honour_fields(self):
+        for url in (reverse("orders:orders"), reverse("orders:order-detail", args=[self.order.id])):
+            with self.subTest(url=url), CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(url, {"fields": "id,status,price"})
+            data = resp.data["results"][0] if "results" in resp.data else resp.data
+            self.assertEqual(data, {"id": self.order.id, "status": "in_progress", "price": "10"})
+            self.assertFalse(any('"features"' in q["sql"] for q in ctx.captured_queries))
+
+    def test_omit_on_list(self):
+        resp = self.client.get(reverse("orders:orders"), {"omit": "features,title"})
+        self.assertNotIn("features", resp.data["results"][0])
+        self.assertIn("offer_type", resp.data["results"][0])
+
+
+class OrderListPaginationTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.orders = [
+            self.create_order(status=Order.OrderStatus.COMPLETED if i % 3 == 0 else Order.OrderStatus.IN_PROGRESS)
+            for i in range(7)
+        ]
+        self.url = reverse("orders:orders")
+
+    def _walk(self, url, params):
+        ids, resp = [], self.client.get(url, params)
+        while True:
+            self.assertEqual(resp.status_code, 200, resp.data)
+            ids += [o["id"] for o in resp.data["results"]]
+            if not resp.data["next"]:
+                return ids, resp
+            resp = self.client.get(resp.data["next"])
+
+    def test_cursor_walks_newest_first_and_back(self):
+        self.client.force_authenticate(self.business)
+        ids, last = self._walk(self.url, {"page_size": 3})
+        self.assertEqual(ids, [o.id for o in reversed(self.orders)])
+        self.assertNotIn("count", last.data)
+
+        previous = self.client.get(last.data["previous"])
+        self.assertEqual([o["id"] for o in previous.data["results"]], ids[3:6])
+
+    def test_role_and_status_filters(self):
+        completed = [o.id for o in reversed(self.orders) if o.status == Order.OrderStatus.COMPLETED]
+        self.client.force_authenticate(self.customer)
+        ids, _ = self._walk(self.url, {"status": "completed", "page_size": 2})
+        self.assertEqual(ids, completed)
+        self.assertEqual(self.client.get(self.url, {"role": "business"}).data["results"], [])
+
+        self.client.force_authenticate(self.business)
+        self.assertEqual(len(self.client.get(self.url, {"role": "business"}).data["results"]), 7)
+        self.assertEqual(self.client.get(self.url, {"role": "customer"}).data["results"], [])
+
+    def test_invalid_parameters(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get(self.url, {"role": "admin"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"status": "lost"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+
+class OrderStatusCounterTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+
+    def _counts(self):
+        return OrderStatusCounter.objects.counts_for([self.business.id])[self.business.id]
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        self.client.force_authenticate(self.customer)
+        for _ in range(2):
+            resp = self.client.post(reverse("orders:orders"), {"offer_detail_id": self.details["basic"].id}, format="json")
+            self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(self._counts(), {"in_progress": 2})
+
+        self.client.force_authenticate(self.business)
+        resp = self.client.patch(reverse("orders:order-detail", args=[resp.data["id"]]), {"status": "completed"}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(self._counts(), {"in_progress": 1, "completed": 1})
+
+        Order.objects.get(pk=resp.data["id"]).delete()
+        self.assertEqual(self._counts(), {"in_progress": 1, "completed": 0})
+
+    def test_count_endpoints_read_counters_in_one_query(self):
+        self.create_order()
+        self.create_order(status=Order.OrderStatus.COMPLETED)
+        self.client.force_authenticate(self.customer)
+        for name, key in (("orders:order-count", "order_count"), ("orders:completed-order-count", "completed_order_count")):
+            with self.subTest(name=name), CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse(name, args=[self.business.id]))
+            self.assertEqual(resp.data, {key: 1})
+            self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(self.client.get(reverse("orders:order-count", args=[999])).status_code, 404)
+
+    def test_batch_stats_endpoint(self):
+        self.create_order()
+        other = CustomUser.objects.create_user(
+            username="biz2", email="biz2@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.client.force_authenticate(self.customer)
+        url = reverse("orders:order-stats")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {"business_user_ids": f"{self.business.id},{other.id}"})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(resp.data, [
+            {"business_user": self.business.id, "order_count": 1, "completed_order_count": 0},
+            {"business_user": other.id, "order_count": 0, "completed_order_count": 0},
+        ])
+        self.assertEqual(self.client.get(url, {"business_user_ids": "1,x"}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_status_read_before_save_is_locked_and_missing_counter_is_logged(self):
+        order = self.create_order()
+        order.status = Order.OrderStatus.COMPLETED
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True, side_effect=QuerySet.select_for_update) as lock:
+            order.save()
+        lock.assert_called_once()
+        self.assertEqual(self._counts(), {"in_progress": 0, "completed": 1})
+
+        OrderStatusCounter.objects.all().delete()
+        with self.assertLogs("orders_app.models", "WARNING") as logs:
+            order.delete()
+        self.assertIn("rebuild_order_counters", logs.output[0])
+
+    def test_rebuild_command_repairs_drift(self):
+        self.create_order()
+        self.create_order()
+        Order.objects.filter(business_user=self.business).update(status=Order.OrderStatus.CANCELLED)
+        out = StringIO()
+        call_command("rebuild_order_counters", stdout=out)
+        self.assertIn("2 drifted", out.getvalue())
+        self.assertEqual(self._counts(), {"cancelled": 2})
+
+
+class OrderCreateQueryCountTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.client.force_authenticate(self.customer)
+
+    def _post(self, detail_id):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(reverse("orders:orders"), {"offer_detail_id": detail_id}, format="json")
+        detail_selects = [q for q in ctx.captured_queries if 'FROM "offers_app_offerdetail"' in q["sql"]]
+        return resp, detail_selects, ctx.captured_queries
+
+    def test_offer_detail_is_loaded_once_per_request(self):
+        resp, detail_selects, queries = self._post(self.details["premium"].id)
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(len(detail_selects), 1)
+        self.assertEqual(resp.data["business_user"], self.business.id)
+        self.assertEqual(resp.data["price"], "30")
+        statements = [q["sql"] for q in queries if "SAVEPOINT" not in q["sql"]]
+        # detail lookup, feature set insert-or-ignore, order insert, counter update + first-use counter insert
+        self.assertEqual(len(statements), 5, statements)
+
+    def test_missing_detail_is_looked_up_once(self):
+        resp, detail_selects, _ = self._post(999)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(len(detail_selects), 1)
+
+
+class FeatureSetTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.client.force_authenticate(self.customer)
+
+    def test_equal_features_share_one_row(self):
+        a, b = self.create_order(), self.create_order()
+        self.create_order(self.details["premium"])
+        self.assertEqual(a.feature_set_id, b.feature_set_id)
+        self.assertEqual(FeatureSet.objects.count(), 2)
+        self.assertEqual(FeatureSet.digest_for(["x", "y"]), FeatureSet.digest_for(["x", "y"]))
+        self.assertNotEqual(FeatureSet.digest_for(["x", "y"]), FeatureSet.digest_for(["y", "x"]))
+
+    def test_list_loads_feature_sets_once_per_page(self):
+        for detail in self.details.values():
+            self.create_order(detail)
+            self.create_order(detail)
+        for params in ({}, {"status": "in_progress"}):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(reverse("orders:orders"), params)
+            feature_queries = [q for q in ctx.captured_queries if '"orders_app_featureset"' in q["sql"]]
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(len(feature_queries), 1, feature_queries)
+            self.assertEqual(
+                sorted(row["features"][0] for row in resp.data["results"]),
+                sorted(f"{ot} feature" for ot in self.details for _ in range(2)),
+            )
+
+
+class OrderBatchCreateTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.url = reverse("orders:orders-batch")
+        self.client.force_authenticate(self.customer)
+
+    def test_batch_creates_orders_with_per_item_results(self):
+        own_offer = Offer.objects.create(user=self.customer, title="Own", description="x")
+        own = OfferDetail.objects.create(offer=own_offer, title="own", offer_type="basic", price=5,
+                                         delivery_time_in_days=1, revisions=0, features=[])
+        ids = [self.details["basic"].id, 999, self.details["premium"].id, own.id, self.details["basic"].id]
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(self.url, {"offer_detail_ids": ids}, format="json")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(resp.data["created"], 3)
+        self.assertEqual([r["status"] for r in resp.data["results"]], [201, 404, 201, 403, 201])
+        self.assertEqual([r["offer_detail_id"] for r in resp.data["results"]], ids)
+
+        detail_selects = [q for q in ctx.captured_queries if 'FROM "offers_app_offerdetail"' in q["sql"]]
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "orders_app_order"')]
+        self.assertEqual((len(detail_selects), len(inserts)), (1, 1))
+        self.assertEqual(Order.objects.filter(customer_user=self.customer).count(), 3)
+        self.assertEqual(OrderStatusCounter.objects.get(business_user=self.business, status="in_progress").count, 3)
+
+        # Same snapshot as the single-order endpoint
+        premium = resp.data["results"][2]["order"]
+        single = self.client.post(reverse("orders:orders"), {"offer_detail_id": self.details["premium"].id}, format="json")
+        ignored = {"id", "created_at", "updated_at"}
+        self.assertEqual({k: v for k, v in premium.items() if k not in ignored},
+                         {k: v for k, v in single.data.items() if k not in ignored})
+
+    def test_batch_without_valid_items_is_rejected(self):
+        resp = self.client.post(self.url, {"offer_detail_ids": [998, 999]}, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data["created"], 0)
+        self.assertFalse(Order.objects.exists())
+        for body in ({}, {"offer_detail_ids": []}, {"offer_detail_ids": ["x"]}):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(self.url, body, format="json").status_code, 400)
+
+    def test_only_customers_can_checkout(self):
+        self.client.force_authenticate(self.business)
+        resp = self.client.post(self.url, {"offer_detail_ids": [self.details["basic"].id]}, format="json")
+        self.assertEqual(resp.status_code, 403)
+
+
+class OrderStatusTransitionTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.order = self.create_order()
+        self.url = reverse("orders:order-detail", args=[self.order.id])
+        self.client.force_authenticate(self.business)
+
+    def test_transition_is_one_conditional_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(self.url, {"status": "completed"}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(resp.data["status"], "completed")
+        self.assertEqual(resp.data["price"], "10")
+        self.assertEqual(resp.data["features"], ["basic feature"])
+        self.assertGreater(resp.data["updated_at"], resp.data["created_at"])
+        order_statements = [q["sql"] for q in ctx.captured_queries if '"orders_app_order"' in q["sql"]]
+        self.assertEqual(len(order_statements), 1, order_statements)
+        self.assertTrue(order_statements[0].startswith("UPDATE"))
+        self.assertEqual(self.client.get(self.url).data["status"], "completed")
+
+    def test_backends_without_update_returning_re_select(self):
+        with mock.patch.object(OrderQuerySet, "_supports_update_returning", return_value=False):
+            order = Order.objects.transition(self.order.id, self.business.id, "in_progress", "cancelled")
+            self.assertIsNone(Order.objects.transition(self.order.id, self.business.id, "in_progress", "completed"))
+        self.assertEqual((order.pk, order.status), (self.order.pk, "cancelled"))
+        counts = OrderStatusCounter.objects.counts_for([self.business.id])[self.business.id]
+        self.assertEqual(counts, {"in_progress": 0, "cancelled": 1})
+
+    def test_second_transition_loses(self):
+        first = self.client.patch(self.url, {"status": "completed"}, format="json")
+        second = self.client.patch(self.url, {"status": "cancelled"}, format="json")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(second.data["status"], ["Only orders with status 'in_progress' can be updated."])
+        counts = OrderStatusCounter.objects.counts_for([self.business.id])[self.business.id]
+        self.assertEqual(counts, {"in_progress": 0, "completed": 1})
+
+    def test_zero_rows_map_to_404_403_400(self):
+        outsider = CustomUser.objects.create_user(
+            username="other", email="other@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        cases = (
+            (self.business, reverse("orders:order-detail", args=[999]), {"status": "completed"}, 404),
+            (outsider, self.url, {"status": "completed"}, 403),
+            (self.customer, self.url, {"status": "completed"}, 403),
+            (self.business, self.url, {"status": "in_progress"}, 400),
+            (self.business, self.url, {"status": "bogus"}, 400),
+        )
+        for user, url, body, expected in cases:
+            with self.subTest(user=user.username, body=body, url=url):
+                self.client.force_authenticate(user)
+                self.assertEqual(self.client.patch(url, body, format="json").status_code, expected)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "in_progress")
+
+
+class OrderEventHubTest(SimpleTestCase):
+
+    def test_replay_buffer_and_overflow(self):
+        async def scenario():
+            hub = OrderEventHub(buffer_size=3, queue_size=2)
+            first = hub.publish("order.created", {"id": 1}, [1, 2])
+            hub.publish("order.created", {"id": 2}, [2])
+            third = hub.publish("order.created", {"id": 3}, [1])
+
+            sub, replay, complete = hub.subscribe(1, first)
+            self.assertTrue(complete)
+            self.assertEqual([m.split("\n", 1)[0] for m in replay], [f"id: {third}"])
+            hub.unsubscribe(sub)
+
+            hub.publish("order.created", {"id": 4}, [1])
+            self.assertTrue(hub.subscribe(1, first)[2])
+            hub.publish("order.created", {"id": 5}, [1])  # evicts the event right after `first`
+            self.assertFalse(hub.subscribe(1, first)[2])
+            self.assertFalse(hub.subscribe(1, "otherepoch-1")[2])
+
+            slow, _, _ = hub.subscribe(3)
+            for n in range(3):
+                hub.publish("order.created", {"id": n}, [3])
+            await asyncio.sleep(0)
+            self.assertTrue(slow.overflowed)
+            self.assertIsNone(await slow.queue.get())
+
+        asyncio.run(scenario())
+
+    def test_load_command_with_many_idle_streams(self):
+        out = StringIO()
+        call_command("loadtest_order_stream", connections=2000, users=500, events=2, stdout=out)
+        self.assertIn("Delivered 4000 events, all streams released.", out.getvalue())
+
+
+class OrderStreamTest(OrderFixtureMixin, TestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.token = Token.objects.create(user=self.business)
+        self.url = reverse("orders:orders-stream")
+
+    async def test_requires_token(self):
+        resp = await self.async_client.get(self.url)
+        self.assertEqual(resp.status_code, 401)
+        resp = await self.async_client.get(self.url, headers={"Authorization": "Token nope"})
+        self.assertEqual(resp.status_code, 401)
+
+    def test_wsgi_request_fails_fast(self):
+        resp = self.client.get(self.url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(resp.status_code, 501)
+        self.assertIn("ASGI", resp.json()["detail"])
+        self.assertEqual(order_hub.connection_count(), 0)
+
+    async def test_streams_order_events_to_participants(self):
+        resp = await self.async_client.get(self.url, headers={"Authorization": f"Token {self.token.key}"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        stream = aiter(resp.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry:"))
+
+        def place_and_complete():
+            with self.captureOnCommitCallbacks(execute=True):
+                order = self.create_order()
+            with self.captureOnCommitCallbacks(execute=True):
+                order.status = Order.OrderStatus.COMPLETED
+                order.save()
+            return order
+
+        order = await sync_to_async(place_and_complete)()
+        created = (await asyncio.wait_for(anext(stream), 5)).decode()
+        changed = (await asyncio.wait_for(anext(stream), 5)).decode()
+        self.assertIn("event: order.created\n", created)
+        self.assertIn(f'"id":{order.id}', created)
+        self.assertIn("event: order.status_changed\n", changed)
+        self.assertIn('"previous_status":"in_progress"', changed)
+        self.assertEqual(order_hub.connection_count(), 1)
+
+        # Resume after the first event: only the status change is replayed
+        event_id = created.split("\n", 1)[0][len("id: "):]
+        # Client disconnect: the ASGI handler cancels the task waiting for the next event
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(order_hub.connection_count(), 0)
+        resp = await self.async_client.get(
+            self.url, headers={"Authorization": f"Token {self.token.key}", "Last-Event-ID": event_id}
+        )
+        replay = aiter(resp.streaming_content)
+        await anext(replay)
+        self.assertIn("event: order.status_changed\n", (await anext(replay)).decode())
+
+
+class OrderArchiveTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.old = [self.create_order(status=s) for s in ("completed", "cancelled", "completed")]
+        self.recent_finished = self.create_order(status="completed")
+        self.open = self.create_order()
+        year_ago = timezone.now() - timedelta(days=365)
+        Order.objects.filter(pk__in=[o.pk for o in self.old]).update(updated_at=year_ago)
+        Order.objects.filter(pk=self.open.pk).update(updated_at=year_ago)
+        self.client.force_authenticate(self.customer)
+
+    def _list_ids(self, **params):
+        return [row["id"] for row in self.client.get(reverse("orders:orders"), params).data["results"]]
+
+    def test_command_moves_only_old_finished_orders_in_batches(self):
+        counts = OrderStatusCounter.objects.counts_for([self.business.id])[self.business.id]
+        out = StringIO()
+        call_command("archive_orders", older_than_days=30, dry_run=True, stdout=out)
+        self.assertIn("3 finished orders", out.getvalue())
+        self.assertEqual(ArchivedOrder.objects.count(), 0)
+
+        call_command("archive_orders", older_than_days=30, batch_size=2, stdout=StringIO())
+        self.assertEqual(set(ArchivedOrder.objects.values_list("id", flat=True)), {o.id for o in self.old})
+        self.assertEqual(set(Order.objects.values_list("id", flat=True)), {self.recent_finished.id, self.open.id})
+        archived = ArchivedOrder.objects.get(pk=self.old[0].pk)
+        self.assertEqual((archived.title, archived.price, archived.created_at),
+                         (self.old[0].title, self.old[0].price, self.old[0].created_at))
+        # Counters include archived orders
+        self.assertEqual(OrderStatusCounter.objects.counts_for([self.business.id])[self.business.id], counts)
+        self.assertEqual(OrderStatusCounter.objects.rebuild(), [])
+
+    def test_reads_consult_the_archive_only_when_asked(self):
+        all_ids = self._list_ids()
+        Order.objects.archive_finished(timezone.now() - timedelta(days=30))
+
+        with CaptureQueriesContext(connection) as ctx:
+            hot = self._list_ids()
+        self.assertFalse(any("orders_app_archivedorder" in q["sql"] for q in ctx.captured_queries))
+        self.assertEqual(hot, [self.open.id, self.recent_finished.id])
+        self.assertEqual(self._list_ids(include_archived="true"), all_ids)
+        self.assertEqual(self._list_ids(include_archived="true", status="cancelled"), [self.old[1].id])
+        self.assertEqual(self.client.get(reverse("orders:orders"), {"include_archived": "maybe"}).status_code, 400)
+
+        url = reverse("orders:order-detail", args=[self.old[0].id])
+        resp = self.client.get(url, {"fields": "id,status"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {"id": self.old[0].id, "status": "completed"})
+        self.client.force_authenticate(self.business)
+        self.assertEqual(self.client.patch(url, {"status": "cancelled"}, format="json").status_code, 400)
+        outsider = CustomUser.objects.create_user(username="x", email="x@mail.de", password="pw", type="customer")
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_order_archive", orders=40, repeat=1, stdout=out)
+        self.assertIn("archived 36 of 40 orders", out.getvalue())
+        self.assertFalse(ArchivedOrder.objects.exists())
+
+
+class OrderExportTest(OrderFixtureMixin, APITestCase):
+
+    def setUp(self):
+        self.create_fixture()
+        self.orders = [self.create_order(), self.create_order(self.details["premium"], status="completed")]
+        Order.objects.filter(pk=self.orders[0].pk).update(created_at=timezone.now() - timedelta(days=40))
+        self.url = reverse("orders:orders-export")
+        self.client.force_authenticate(self.business)
+
+    def _export(self, **params):
+        resp = self.client.get(self.url, params)
+        self.assertEqual(resp.status_code, 200)
+        return resp, b"".join(resp.streaming_content).decode()
+
+    def test_csv_and_ndjson(self):
+        resp, body = self._export()
+        self.assertEqual(resp["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="orders.csv"', resp["Content-Disposition"])
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(rows[0][:3], ["id", "status", "customer_user"])
+        self.assertEqual([int(r[0]) for r in rows[1:]], [o.id for o in self.orders])
+        self.assertEqual(rows[2][rows[0].index("features")], '["premium feature"]')
+
+        resp, body = self._export(format="ndjson")
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        self.assertEqual(lines[1]["price"], "30")
+        self.assertEqual(lines[1]["features"], ["premium feature"])
+
+    def test_csv_quotes_formula_like_numbers(self):
+        Order.objects.filter(pk=self.orders[0].pk).update(price=-5, title="+49 30 123")
+        _, body = self._export()
+        rows = list(csv.reader(StringIO(body)))
+        header = rows[0]
+        self.assertEqual((rows[1][header.index("price")], rows[1][header.index("title")]), ("'-5", "'+49 30 123"))
+        self.assertEqual(rows[2][header.index("price")], "30")
+
+        _, body = self._export(format="ndjson")
+        self.assertEqual(json.loads(body.splitlines()[0])["price"], "-5")
+
+    def test_created_range_role_and_validation(self):
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        _, body = self._export(format="ndjson", created_after=since)
+        self.assertEqual([json.loads(line)["id"] for line in body.splitlines()], [self.orders[1].id])
+        _, body = self._export(format="ndjson", created_before=since)
+        self.assertEqual([json.loads(line)["id"] for line in body.splitlines()], [self.orders[0].id])
+        _, body = self._export(format="ndjson", role="customer")
+        self.assertEqual(body, "")
+        for params in ({"format": "xml"}, {"created_after": "yesterday"}, {"status": "nope"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @skipUnless(os.path.exists("/proc/self/statm"), "needs /proc to read the resident set size")
+    def test_peak_memory_is_bounded(self):
+        # 50k rows (25 chunks) by default; RUN_SLOW_TESTS=1 streams 1M rows (~80 MB of CSV)
+        rows = 1_000_000 if os.environ.get("RUN_SLOW_TESTS") else 50_000
+        table = connection.ops.quote_name(Order._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (offer_id, offer_detail_id, customer_user_id, business_user_id, title, revisions, "
+                f"delivery_time_in_days, price, feature_set_id, offer_type, status, created_at, updated_at) "
+                f"WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < %s) "
+                f"SELECT %s, %s, %s, %s, 'Bulk order', 1, 3, 25, %s, 'basic', 'completed', "
+                f"'2024-01-01 00:00:00', '2024-01-01 00:00:00' FROM seq",
+                [rows, self.offer.id, self.details["basic"].id, self.customer.id, self.business.id,
+                 FeatureSet.objects.intern(["a", "b"]).digest],
+            )
+        resp = self.client.get(self.url, {"role": "business"})
+        baseline = peak = _rss_bytes()
+        lines = size = largest = 0
+        for i, chunk in enumerate(resp.streaming_content):
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+            largest = max(largest, chunk.count(b"\n"))
+            if i % 50 == 0:
+                peak = max(peak, _rss_bytes())
+        self.assertEqual(lines, rows + len(self.orders) + 1)
+        self.assertEqual(largest, EXPORT_CHUNK_SIZE)
+        # The CSV is ~80 bytes per row while the process grows by far less
+        self.assertGreater(size, rows * 60)
+        self.assertLess(peak - baseline, 32 * 1024 * 1024)
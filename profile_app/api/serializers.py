@@ -1,6 +1,9 @@
 from rest_framework import serializers
 
 from profile_app.models import UserProfile, FileUpload
+from reviews_app.models import RatingAggregate
+from shared_app.sparse_fields import SparseFieldsetSerializerMixin
+from shared_app.projection import ProjectionSerializerMixin
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for reading/updating a user's profile.
@@ -9,7 +12,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
     Exposes `user` as read-only foreign key (user.id).
     """
 
-    user = serializers.IntegerField(source='user.id', read_only=True)
+    user = serializers.IntegerField(source='user_id', read_only=True)
 
     class Meta:
         model = UserProfile
@@ -74,13 +77,41 @@ class UserProfileSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Description cannot be only digits.")
         return value
 
-class TypeSpecificProfileSerializer(UserProfileSerializer):
-    """Serializer variant for listing by user type (business/customer)."""
+class TypeSpecificProfileSerializer(SparseFieldsetSerializerMixin, ProjectionSerializerMixin, UserProfileSerializer):
+    """Serializer variant for listing by user type (business/customer); supports ?fields=/?omit=."""
 
     class Meta:
         model = UserProfile
         fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type']
         read_only_fields = ['user', 'username', 'type', 'created_at']
+
+
+class BusinessProfileSerializer(TypeSpecificProfileSerializer):
+    """Business profile list item with the user's rating summary (count, average, histogram).
+
+    The summary comes from RatingAggregate; a page loads it in one query.
+    """
+    rating = serializers.SerializerMethodField()
+    sparse_columns = {'rating': ('user',)}
+    projection_columns = {'rating': ('user_id',)}
+
+    class Meta(TypeSpecificProfileSerializer.Meta):
+        fields = TypeSpecificProfileSerializer.Meta.fields + ['rating']
+
+    def prepare_projection(self, rows):
+        """Load the rating aggregates of a page of value rows in one query."""
+        if 'rating' not in self.fields:
+            return
+        column = self.projection_index['user_id']
+        self._ratings = RatingAggregate.objects.summaries(row[column] for row in rows)
+
+    def project_rating(self, user_id):
+        """Return the row's rating summary."""
+        return self._ratings[user_id]
+
+    def get_rating(self, profile):
+        """Return the profile's rating summary (joined by `user__rating_aggregate`)."""
+        return RatingAggregate.summary_of(profile.user)
     
 
 class FileUploadSerializer(serializers.ModelSerializer):
@@ -9,9 +9,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status, generics, serializers
 
 from profile_app.models import UserProfile
-from .serializers import UserProfileSerializer, FileUploadSerializer, TypeSpecificProfileSerializer
+from .serializers import UserProfileSerializer, FileUploadSerializer, TypeSpecificProfileSerializer, BusinessProfileSerializer
 from auth_app.models import CustomUser
 from .permissions import UpdatingUserIsProfileUser
+from shared_app.sparse_fields import SparseFieldsetViewMixin
+from shared_app.projection import ProjectionListMixin
 
 
 class ProfileDetailView(generics.RetrieveUpdateAPIView):
@@ -63,35 +65,27 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
 
         return Response(serializer.data)
     
-class BussinessProfileView(generics.ListAPIView):
-    """List all business user profiles (requires authentication)."""
+class BussinessProfileView(SparseFieldsetViewMixin, ProjectionListMixin, generics.ListAPIView):
+    """List all business user profiles with their rating summary (requires authentication)."""
     permission_classes = [IsAuthenticated]
-    serializer_class = TypeSpecificProfileSerializer
+    serializer_class = BusinessProfileSerializer
     
     def get_queryset(self):
-        """Return queryset of profiles where user type is BUSINESS."""
-        return UserProfile.objects.filter(user__type=CustomUser.Roles.BUSINESS)
+        """Return queryset of profiles where user type is BUSINESS.
 
-    def list(self, request, *args, **kwargs):
-        """Serialize and return the list of business profiles."""
-        qs = self.get_queryset()
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        Filters on the profile's own (indexed) `type`, which is kept in sync
+        with the user's type by auth_app signals.
+        """
+        return self.sparse_queryset(UserProfile.objects.filter(type=CustomUser.Roles.BUSINESS))
 
-class CustomerProfileView(generics.ListAPIView):
+class CustomerProfileView(SparseFieldsetViewMixin, ProjectionListMixin, generics.ListAPIView):
     """List all customer user profiles (requires authentication)."""
     permission_classes = [IsAuthenticated]
     serializer_class = TypeSpecificProfileSerializer
     
     def get_queryset(self):
-        """Return queryset of profiles where user type is CUSTOMER."""
-        return UserProfile.objects.filter(user__type=CustomUser.Roles.CUSTOMER)
-
-    def list(self, request, *args, **kwargs):
-        """Serialize and return the list of customer profiles."""
-        qs = self.get_queryset()
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        """Return queryset of profiles where user type is CUSTOMER (indexed `type`)."""
+        return self.sparse_queryset(UserProfile.objects.filter(type=CustomUser.Roles.CUSTOMER))
     
 class FileUploadView(APIView):
     """Upload a file and persist via FileUpload model."""
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:11
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def sync_profile_type(apps, schema_editor):
+    """Copy the user's type onto every profile; the list views filter on it."""
+    UserProfile = apps.get_model('profile_app', 'UserProfile')
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+    UserProfile.objects.update(
+        type=Subquery(CustomUser.objects.filter(pk=OuterRef('user_id')).values('type')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile_app', '0003_fileupload_alter_userprofile_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type', 'created_at'], name='profile_type_created_idx'),
+        ),
+        migrations.RunPython(sync_profile_type, migrations.RunPython.noop),
+    ]
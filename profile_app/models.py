@@ -24,6 +24,9 @@ class UserProfile(models.Model):
         verbose_name = "Profile"
         verbose_name_plural = "Profiles"
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['type', 'created_at'], name='profile_type_created_idx'),
+        ]
     def __str__(self):
         return self.username
     
@@ -0,0 +1,32 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from auth_app.models import CustomUser
+from shared_app.query_plans import QueryPlanAssertionsMixin
+
+
+class ProfileListQueryPlanTest(QueryPlanAssertionsMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            CustomUser.objects.create_user(
+                username=f"biz{i}", email=f"b{i}@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+            )
+            self.customer = CustomUser.objects.create_user(
+                username=f"cust{i}", email=f"c{i}@mail.de", password="pw", type=CustomUser.Roles.CUSTOMER
+            )
+        self.client.force_authenticate(self.customer)
+
+    def test_profile_lists_are_index_served(self):
+        for name in ("profile_app:business-profile", "profile_app:customer-profile"):
+            with self.subTest(name=name):
+                resp = self.assertIndexedPlans(lambda: self.client.get(reverse(name)))
+                self.assertEqual(len(resp.data), 3)
+
+    def test_profile_type_follows_user_type(self):
+        user = CustomUser.objects.get(username="cust0")
+        user.type = CustomUser.Roles.BUSINESS
+        user.save()
+        resp = self.client.get(reverse("profile_app:business-profile"))
+        self.assertIn(user.id, [p["user"] for p in resp.data])
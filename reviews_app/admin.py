@@ -8,6 +8,7 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ('id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at')
     search_fields = ()
     list_filter = ('business_user', 'reviewer', 'rating', 'created_at', 'updated_at')
+    list_select_related = ('business_user', 'reviewer')
     ordering = ('id',)
 
     verbose_name = 'Review'
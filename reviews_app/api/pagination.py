@@ -0,0 +1,11 @@
+from shared_app.pagination import KeysetPagination
+
+
+class ReviewsCursorPagination(KeysetPagination):
+    """Cursor pagination for reviews, most recently updated first.
+
+    `?ordering=updated_at|rating` (optionally with `-`) picks the sort key;
+    with `?business_user_id=` each page is an index range scan on
+    (business_user, key).
+    """
+    default_ordering = '-updated_at'
@@ -1,13 +1,19 @@
+from django.db import IntegrityError
 from rest_framework import serializers
-from reviews_app.models import Review
+from rest_framework.settings import api_settings
+from reviews_app.models import RatingAggregate, Review
 
 from auth_app.models import CustomUser
+from shared_app.projection import ProjectionSerializerMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(ProjectionSerializerMixin, serializers.ModelSerializer):
     """Serializer for creating and listing reviews.
 
-    Enforces BUSINESS role for `business_user` and prevents self-reviews.
+    Enforces BUSINESS role for `business_user`, prevents self-reviews and
+    duplicate reviews (unique constraint).
+    `business_rating` is the reviewed business user's rating summary from
+    RatingAggregate, loaded once per list.
     """
     business_user = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.filter(type=CustomUser.Roles.BUSINESS),
@@ -17,6 +23,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         },
     )
     rating = serializers.IntegerField(min_value=1, max_value=5)
+    business_rating = serializers.SerializerMethodField()
+    duplicate_review_message = "You have already reviewed this business user."
+    projection_columns = {'business_rating': ('business_user',)}
 
     class Meta:
         model = Review
@@ -27,22 +36,24 @@ class ReviewSerializer(serializers.ModelSerializer):
             'rating', 
             'description',
             'created_at', 
-            'updated_at'
+            'updated_at',
+            'business_rating',
         ]
         read_only_fields = ['id', 'created_at', 'reviewer', 'updated_at']
         write_only_fields = ['business_user', 'rating', 'description']
 
-    def validate(self, attrs):
-        """Ensure the reviewer has not already reviewed this business user.
+    def prepare_projection(self, rows):
+        """Load the rating aggregates of the listed business users in one query."""
+        column = self.projection_index['business_user']
+        self._ratings = RatingAggregate.objects.summaries(row[column] for row in rows)
 
-        Returns a 400 ValidationError if a duplicate review is attempted.
-        """
-        request = self.context.get("request")
-        business_user = attrs.get("business_user")
-        if request and request.user and request.user.is_authenticated and business_user:
-            if Review.objects.filter(reviewer=request.user, business_user=business_user).exists():
-                raise serializers.ValidationError("You have already reviewed this business user.")
-        return attrs
+    def project_business_rating(self, business_user_id):
+        """Return the row's business rating summary."""
+        return self._ratings[business_user_id]
+
+    def get_business_rating(self, review):
+        """Return the reviewed business user's rating summary (joined by `business_user__rating_aggregate`)."""
+        return RatingAggregate.summary_of(review.business_user)
 
     def validate_business_user(self, value: int):
         """Ensure the target is a BUSINESS user and not the requester."""
@@ -53,9 +64,23 @@ class ReviewSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        """Attach the authenticated user as reviewer and create the review."""
+        """Attach the authenticated user as reviewer and create the review.
+
+        One review per (reviewer, business_user) is enforced by the
+        database constraint; a violation becomes a 400 ValidationError,
+        any other IntegrityError is re-raised.
+        """
         validated_data["reviewer"] = self.context["request"].user
-        return super().create(validated_data)
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            # Review.save() läuft in einem Savepoint, die Transaktion ist hier noch nutzbar
+            duplicate = Review.objects.filter(
+                reviewer=validated_data["reviewer"], business_user=validated_data["business_user"]
+            ).exists()
+            if not duplicate:
+                raise
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [self.duplicate_review_message]})
     
 class ReviewDetailSerializer(serializers.ModelSerializer):
     """Serializer for retrieving/updating a single review instance."""
@@ -0,0 +1,40 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from reviews_app.models import RatingAggregate, Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_counted_rating(sender, instance: Review, raw=False, using=None, **kwargs):
+    """Load the stored (business_user, rating) of an existing review before it is overwritten.
+
+    Locked inside Review.save()'s transaction, like the order counters.
+    """
+    instance._counted = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._counted = (
+        Review.objects.using(using).select_for_update().filter(pk=instance.pk)
+        .values_list('business_user_id', 'rating').first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_aggregate(sender, instance: Review, created=False, raw=False, **kwargs):
+    """Apply the review's create or rating change to RatingAggregate (same transaction)."""
+    if raw:
+        return
+    old = getattr(instance, '_counted', None)
+    if created or old is None:
+        RatingAggregate.objects.apply(instance.business_user_id, new_rating=instance.rating)
+    elif old[0] != instance.business_user_id:
+        RatingAggregate.objects.apply(old[0], old_rating=old[1])
+        RatingAggregate.objects.apply(instance.business_user_id, new_rating=instance.rating)
+    else:
+        RatingAggregate.objects.apply(instance.business_user_id, old[1], instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def remove_from_rating_aggregate(sender, instance: Review, **kwargs):
+    """Remove a deleted review from its business user's aggregate."""
+    RatingAggregate.objects.apply(instance.business_user_id, old_rating=instance.rating)
@@ -1,27 +1,36 @@
 from django_filters.rest_framework import DjangoFilterBackend
 
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework import generics, permissions, status
 from rest_framework.permissions import IsAuthenticated
 
 from reviews_app.models import Review
 from .serializers import ReviewSerializer, ReviewDetailSerializer
+from .pagination import ReviewsCursorPagination
 from .permissions import IsReviewerOrReadOnly, IsCustomerUser
+from shared_app.projection import ProjectionListMixin
 
 
 
-class ReviewView(generics.ListCreateAPIView):
-    """List reviews and allow authenticated customers to create one per business."""
-    queryset = Review.objects.all()
+class ReviewView(ProjectionListMixin, generics.ListCreateAPIView):
+    """List reviews (cursor-paginated, `?ordering=`) and allow authenticated customers to create one per business."""
+    queryset = Review.objects.select_related('reviewer', 'business_user__rating_aggregate')
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated, IsCustomerUser]
+    pagination_class = ReviewsCursorPagination
     ordering_fields = ['updated_at', 'rating']
-    filter_backends = [DjangoFilterBackend]
+    ordering = ['-updated_at']
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['business_user_id', 'reviewer_id']
 
+    def projection_extra_columns(self):
+        """The cursor reads (sort key, id) from the last row of the page."""
+        return (self.paginator.get_ordering(self.request, self)[0], 'id')
+
 class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a review with reviewer-only write access."""
-    queryset = Review.objects.all()
+    queryset = Review.objects.select_related('reviewer')
     serializer_class = ReviewDetailSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsReviewerOrReadOnly]
     lookup_field = 'id'
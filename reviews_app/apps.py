@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReviewsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews_app'
+
+    def ready(self):
+        # Hält RatingAggregate bei jedem Review-Schreibzugriff aktuell
+        import reviews_app.api.signals  # noqa: F401
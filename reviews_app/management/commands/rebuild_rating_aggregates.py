@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews_app.models import RatingAggregate
+
+
+class Command(BaseCommand):
+    """Verify or rebuild RatingAggregate rows from the Review table."""
+    help = "Recompute per-business rating aggregates from Review and report drifted business users (--check only verifies)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--check', action='store_true', help="Only compare; exit with an error if anything drifted.")
+
+    def handle(self, *args, **options):
+        """Rebuild in one transaction (or just compare) and list what had drifted."""
+        if options['check']:
+            drifted = RatingAggregate.objects.drifted()
+        else:
+            drifted = RatingAggregate.objects.rebuild(batch_size=options['batch_size'])
+        for business_user_id in drifted:
+            self.stdout.write(f"business_user={business_user_id}: {'drifted' if options['check'] else 'corrected'}")
+        if options['check']:
+            if drifted:
+                raise CommandError(f"{len(drifted)} rating aggregate(s) differ from the Review table.")
+            self.stdout.write(self.style.SUCCESS("Rating aggregates match the Review table."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating aggregates ({len(drifted)} drifted)."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    """Build one aggregate row per reviewed business user from the existing reviews."""
+    Review = apps.get_model('reviews_app', 'Review')
+    RatingAggregate = apps.get_model('reviews_app', 'RatingAggregate')
+    aggregates = {}
+    rows = Review.objects.order_by().values_list('business_user_id', 'rating').annotate(n=models.Count('id'))
+    for business_user_id, rating, n in rows:
+        aggregate = aggregates.setdefault(business_user_id, RatingAggregate(business_user_id=business_user_id))
+        aggregate.review_count += n
+        aggregate.rating_sum += rating * n
+        if 1 <= rating <= 5:
+            setattr(aggregate, f'rating_{rating}', getattr(aggregate, f'rating_{rating}') + n)
+    RatingAggregate.objects.bulk_create(aggregates.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_add_query_indexes'),
+        ('reviews_app', '0002_add_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingAggregate',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_aggregate', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['review_count', 'rating_sum'], name='rating_totals_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.5 on 2026-10-18 21:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def dedupe_reviews(apps, schema_editor):
+    """Keep the most recently updated review per (reviewer, business_user); delete the rest in batches.
+
+    Historical models send no signals, so the rating aggregates of the
+    affected business users are recomputed afterwards.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    RatingAggregate = apps.get_model('reviews_app', 'RatingAggregate')
+    pairs = list(
+        Review.objects.order_by().values_list('reviewer_id', 'business_user_id')
+        .annotate(n=models.Count('id')).filter(n__gt=1).values_list('reviewer_id', 'business_user_id')
+    )
+    affected = set()
+    for start in range(0, len(pairs), BATCH_SIZE):
+        batch = pairs[start:start + BATCH_SIZE]
+        condition = models.Q()
+        for reviewer_id, business_user_id in batch:
+            condition |= models.Q(reviewer_id=reviewer_id, business_user_id=business_user_id)
+        seen, doomed = set(), []
+        rows = Review.objects.filter(condition).order_by('-updated_at', '-id').values_list(
+            'id', 'reviewer_id', 'business_user_id'
+        )
+        for pk, reviewer_id, business_user_id in rows:
+            if (reviewer_id, business_user_id) in seen:
+                doomed.append(pk)
+            seen.add((reviewer_id, business_user_id))
+        Review.objects.filter(id__in=doomed).delete()
+        affected.update(business_user_id for _, business_user_id in batch)
+
+    affected = list(affected)
+    for start in range(0, len(affected), BATCH_SIZE):
+        ids = affected[start:start + BATCH_SIZE]
+        RatingAggregate.objects.filter(business_user_id__in=ids).delete()
+        aggregates = {}
+        rows = Review.objects.filter(business_user_id__in=ids).order_by().values_list(
+            'business_user_id', 'rating'
+        ).annotate(n=models.Count('id'))
+        for business_user_id, rating, n in rows:
+            aggregate = aggregates.setdefault(business_user_id, RatingAggregate(business_user_id=business_user_id))
+            aggregate.review_count += n
+            aggregate.rating_sum += rating * n
+            if 1 <= rating <= 5:
+                setattr(aggregate, f'rating_{rating}', getattr(aggregate, f'rating_{rating}') + n)
+        RatingAggregate.objects.bulk_create(aggregates.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0004_review_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='review_reviewer_business_uniq'),
+        ),
+    ]
@@ -1,7 +1,15 @@
-from django.db import models
+import logging
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
 
 from auth_app.models import CustomUser
 
+RATINGS = range(1, 6)
+
+logger = logging.getLogger(__name__)
+
+
 class Review(models.Model):
     """A rating and optional text a customer writes for a business user."""
     business_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='reviews')
@@ -15,6 +23,161 @@ class Review(models.Model):
         verbose_name = "Review"
         verbose_name_plural = "Reviews"
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['business_user', 'reviewer'], name='review_business_reviewer_idx'),
+            models.Index(fields=['rating'], name='review_rating_idx'),
+            # Listen-Sortierung (?ordering=) je Business-User bzw. Reviewer; id kommt über den Index mit
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+        ]
+        constraints = [
+            # Ein Review pro Reviewer und Business-User, auch bei parallelen Requests
+            models.UniqueConstraint(fields=['reviewer', 'business_user'], name='review_reviewer_business_uniq'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save in a transaction so the rating aggregate (signals) commits together with the review."""
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Review by {self.reviewer.username} for {self.business_user.username} - Rating: {self.rating}"
+
+
+def _histogram_field(rating):
+    """Column holding the number of reviews with this rating."""
+    return f'rating_{rating}'
+
+
+def _zero_values():
+    """Aggregate field values of a business user without reviews."""
+    return {'review_count': 0, 'rating_sum': 0, **{_histogram_field(r): 0 for r in RATINGS}}
+
+
+class RatingAggregateQuerySet(models.QuerySet):
+    """Delta updates, batch reads and rebuild of the per-business rating aggregates."""
+
+    def apply(self, business_user_id, old_rating=None, new_rating=None):
+        """Replace old_rating by new_rating in one aggregate with a single UPDATE (None = no review).
+
+        Creates the row when the business user's first review arrives; a
+        removal without a row means drift and is logged.
+        """
+        if old_rating == new_rating:
+            return
+        deltas = {}
+        for rating, sign in ((old_rating, -1), (new_rating, 1)):
+            if rating is not None:
+                deltas['review_count'] = deltas.get('review_count', 0) + sign
+                deltas['rating_sum'] = deltas.get('rating_sum', 0) + sign * rating
+                if rating in RATINGS:
+                    deltas[_histogram_field(rating)] = sign
+        aggregate = self.filter(business_user_id=business_user_id)
+        if aggregate.update(**{name: F(name) + delta for name, delta in deltas.items()}):
+            return
+        if old_rating is not None:
+            logger.warning(
+                'RatingAggregate missing for business_user=%s (rating %s -> %s); run rebuild_rating_aggregates',
+                business_user_id, old_rating, new_rating,
+            )
+            return
+        try:
+            with transaction.atomic():
+                self.create(business_user_id=business_user_id, **deltas)
+        except IntegrityError:
+            # Created concurrently by another transaction
+            aggregate.update(**{name: F(name) + delta for name, delta in deltas.items()})
+
+    def summaries(self, business_user_ids):
+        """Return {business_user_id: summary} for the given users (one query; empty summary if unrated)."""
+        business_user_ids = set(business_user_ids)
+        found = {a.business_user_id: a.summary() for a in self.filter(business_user_id__in=business_user_ids)}
+        return {pk: found.get(pk) or RatingAggregate.empty_summary() for pk in business_user_ids}
+
+    def totals(self):
+        """Return (review count, average rating) across all business users, from the aggregate rows."""
+        totals = self.aggregate(count=Sum('review_count'), total=Sum('rating_sum'))
+        count = totals['count'] or 0
+        return count, round(totals['total'] / count, 2) if count else 0.0
+
+    def expected(self):
+        """Return {business_user_id: field values} computed from the Review table."""
+        expected = {}
+        rows = Review.objects.order_by().values_list('business_user_id', 'rating').annotate(n=models.Count('id'))
+        for business_user_id, rating, n in rows:
+            values = expected.setdefault(business_user_id, _zero_values())
+            values['review_count'] += n
+            values['rating_sum'] += rating * n
+            if rating in RATINGS:
+                values[_histogram_field(rating)] += n
+        return expected
+
+    def drifted(self):
+        """Return the ids of business users whose stored aggregate differs from the Review table.
+
+        A missing row and an all-zero row (last review deleted) are equal.
+        """
+        expected, zero = self.expected(), _zero_values()
+        stored = {row.pop('business_user_id'): row for row in self.values('business_user_id', *zero)}
+        return sorted(pk for pk in expected.keys() | stored.keys() if expected.get(pk, zero) != stored.get(pk, zero))
+
+    def rebuild(self, batch_size=1000):
+        """Recompute every aggregate from Review in one transaction; return the drifted business user ids."""
+        with transaction.atomic():
+            drifted = self.drifted()
+            self.all().delete()
+            self.bulk_create(
+                [RatingAggregate(business_user_id=pk, **values) for pk, values in self.expected().items()],
+                batch_size=batch_size,
+            )
+        return drifted
+
+
+class RatingAggregate(models.Model):
+    """Review count, rating sum and rating histogram of one business user, maintained on every review write.
+
+    Rebuild or verify with `python manage.py rebuild_rating_aggregates`.
+    """
+    business_user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='rating_aggregate'
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    # Histogramm: Anzahl Bewertungen je Sterne-Wert
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    objects = RatingAggregateQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Gesamtsummen (base-info) lesen nur diesen Index
+            models.Index(fields=['review_count', 'rating_sum'], name='rating_totals_idx'),
+        ]
+
+    @staticmethod
+    def empty_summary():
+        """Summary of a business user without reviews."""
+        return {'count': 0, 'average': 0.0, 'histogram': {str(r): 0 for r in RATINGS}}
+
+    @classmethod
+    def summary_of(cls, user):
+        """Return the rating summary of a user via `user.rating_aggregate` (select_related-friendly)."""
+        aggregate = getattr(user, 'rating_aggregate', None)
+        return aggregate.summary() if aggregate is not None else cls.empty_summary()
+
+    def summary(self):
+        """Return {'count', 'average', 'histogram'} as exposed by the API."""
+        count = self.review_count
+        return {
+            'count': count,
+            'average': round(self.rating_sum / count, 2) if count else 0.0,
+            'histogram': {str(r): getattr(self, _histogram_field(r)) for r in RATINGS},
+        }
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.review_count} reviews, sum {self.rating_sum}"
@@ -1,3 +1,212 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from auth_app.models import CustomUser
+from reviews_app.models import RatingAggregate, Review
+from reviews_app.api.views import ReviewView
+from shared_app.query_plans import QueryPlanAssertionsMixin
+
+
+class ReviewQueryPlanTest(QueryPlanAssertionsMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        for i in range(3):
+            customer = CustomUser.objects.create_user(username=f"cust{i}", email=f"c{i}@mail.de", password="pw")
+            Review.objects.create(business_user=self.business, reviewer=customer, rating=i + 1)
+        self.client.force_authenticate(customer)
+
+    def test_reviews_by_business_user_are_index_served(self):
+        url = reverse("reviews_app:reviews-list-create")
+        self.assertIndexedPlans(lambda: self.client.get(url, {"business_user_id": self.business.id}))
+
+    def test_reviews_by_reviewer_are_index_served(self):
+        url = reverse("reviews_app:reviews-list-create")
+        reviewer = Review.objects.first().reviewer_id
+        self.assertIndexedPlans(lambda: self.client.get(url, {"reviewer_id": reviewer}))
+
+    def test_ordered_pages_by_business_user_are_index_served(self):
+        url = reverse("reviews_app:reviews-list-create")
+        for ordering in ("updated_at", "-updated_at", "rating", "-rating"):
+            with self.subTest(ordering=ordering):
+                params = {"business_user_id": self.business.id, "ordering": ordering, "page_size": 2}
+                first = self.assertIndexedPlans(lambda: self.client.get(url, params))
+                self.assertIndexedPlans(lambda: self.client.get(first.data["next"]))
+
+
+class ReviewListPaginationTest(APITestCase):
+
+    def setUp(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.reviews = []
+        for i in range(12):
+            customer = CustomUser.objects.create_user(username=f"cust{i}", email=f"c{i}@mail.de", password="pw")
+            self.reviews.append(Review.objects.create(business_user=self.business, reviewer=customer, rating=i % 5 + 1))
+        self.client.force_authenticate(customer)
+        self.url = reverse("reviews_app:reviews-list-create")
+
+    def _walk(self, params):
+        ids, resp = [], self.client.get(self.url, params)
+        while True:
+            self.assertEqual(resp.status_code, 200, resp.data)
+            ids += [row["id"] for row in resp.data["results"]]
+            if not resp.data["next"]:
+                return ids, resp
+            resp = self.client.get(resp.data["next"])
+
+    def test_cursor_pages_follow_the_requested_ordering(self):
+        by_rating, last = self._walk({"ordering": "-rating", "page_size": 5})
+        expected = [r.id for r in sorted(self.reviews, key=lambda r: (r.rating, r.id), reverse=True)]
+        self.assertEqual(by_rating, expected)
+        back = self.client.get(last.data["previous"])
+        self.assertEqual([row["id"] for row in back.data["results"]], expected[5:10])
+
+        newest_first, _ = self._walk({"page_size": 5})
+        self.assertEqual(newest_first, [r.id for r in reversed(self.reviews)])
+
+    def test_invalid_cursor_is_404(self):
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 404)
+
+    def test_model_path_needs_no_per_row_user_queries(self):
+        with mock.patch.object(ReviewView, "use_projection", False):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(self.url, {"page_size": 10})
+                [str(review) for review in ReviewView.queryset.all()]
+        self.assertEqual(len(resp.data["results"]), 10)
+        # one page query, then one joined query for all __str__ calls
+        self.assertEqual(len(ctx.captured_queries), 2, [q["sql"] for q in ctx.captured_queries])
+
+
+class RatingAggregateTest(APITestCase):
+
+    def setUp(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.other_business = CustomUser.objects.create_user(
+            username="biz2", email="biz2@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.customers = [
+            CustomUser.objects.create_user(username=f"cust{i}", email=f"c{i}@mail.de", password="pw")
+            for i in range(3)
+        ]
+
+    def summary(self, business=None):
+        return RatingAggregate.objects.summaries([(business or self.business).id])[(business or self.business).id]
+
+    def test_create_update_delete_keep_the_aggregate_in_sync(self):
+        self.client.force_authenticate(self.customers[0])
+        resp = self.client.post(reverse("reviews_app:reviews-list-create"),
+                                {"business_user": self.business.id, "rating": 4}, format="json")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(resp.data["business_rating"]["count"], 1)
+        second = Review.objects.create(business_user=self.business, reviewer=self.customers[1], rating=2)
+        self.assertEqual(self.summary(), {"count": 2, "average": 3.0,
+                                          "histogram": {"1": 0, "2": 1, "3": 0, "4": 1, "5": 0}})
+
+        review_id = resp.data["id"]
+        resp = self.client.patch(reverse("reviews_app:review-detail", kwargs={"id": review_id}),
+                                 {"rating": 5}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(self.summary()["histogram"], {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1})
+        self.assertEqual(self.summary()["average"], 3.5)
+
+        second.business_user = self.other_business
+        second.save()
+        self.assertEqual(self.summary()["count"], 1)
+        self.assertEqual(self.summary(self.other_business)["histogram"]["2"], 1)
+
+        self.client.delete(reverse("reviews_app:review-detail", kwargs={"id": review_id}))
+        self.assertEqual(self.summary(), RatingAggregate.empty_summary())
+        self.assertEqual(RatingAggregate.objects.drifted(), [])
+
+    def test_rebuild_command_verifies_and_corrects_drift(self):
+        for i, customer in enumerate(self.customers):
+            Review.objects.create(business_user=self.business, reviewer=customer, rating=i + 3)
+        call_command("rebuild_rating_aggregates", "--check", stdout=StringIO())
+        # update() sends no signals, so the aggregate drifts
+        Review.objects.filter(reviewer=self.customers[0]).update(rating=1)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_rating_aggregates", "--check", stdout=StringIO())
+        out = StringIO()
+        call_command("rebuild_rating_aggregates", stdout=out)
+        self.assertIn(f"business_user={self.business.id}: corrected", out.getvalue())
+        self.assertEqual(self.summary(), {"count": 3, "average": 3.33,
+                                          "histogram": {"1": 1, "2": 0, "3": 0, "4": 1, "5": 1}})
+        self.assertEqual(RatingAggregate.objects.drifted(), [])
+
+    def test_lists_and_base_info_read_the_aggregate(self):
+        for i, customer in enumerate(self.customers):
+            Review.objects.create(business_user=self.business, reviewer=customer, rating=5 - i)
+        Review.objects.create(business_user=self.other_business, reviewer=self.customers[0], rating=1)
+        self.client.force_authenticate(self.customers[0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("profile_app:business-profile"))
+        rating_queries = [q for q in ctx.captured_queries if "reviews_app_ratingaggregate" in q["sql"]]
+        review_scans = [q for q in ctx.captured_queries if '"reviews_app_review"' in q["sql"]]
+        self.assertEqual((len(rating_queries), len(review_scans)), (1, 0))
+        ratings = {row["user"]: row["rating"] for row in resp.data}
+        self.assertEqual(ratings[self.business.id]["average"], 4.0)
+        self.assertEqual(ratings[self.other_business.id]["count"], 1)
+
+        resp = self.client.get(reverse("reviews_app:reviews-list-create"))
+        self.assertEqual({row["business_rating"]["count"] for row in resp.data["results"]}, {3, 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("shared_app:base-info"))
+        self.assertFalse([q for q in ctx.captured_queries if '"reviews_app_review"' in q["sql"]])
+        self.assertEqual(resp.data["review_count"], 4)
+        # (5 + 4 + 3 + 1) / 4, rendered with one decimal place
+        self.assertEqual(resp.data["average_rating"], "3.2")
+
+
+class ReviewUniquenessTest(APITestCase):
+
+    def setUp(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        self.customer = CustomUser.objects.create_user(username="cust", email="cust@mail.de", password="pw")
+        self.client.force_authenticate(self.customer)
+        self.url = reverse("reviews_app:reviews-list-create")
+
+    def _post(self, rating):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(self.url, {"business_user": self.business.id, "rating": rating}, format="json")
+        return resp, [q["sql"] for q in ctx.captured_queries]
+
+    def test_second_review_is_rejected_by_the_constraint(self):
+        resp, queries = self._post(4)
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertFalse([sql for sql in queries if "EXISTS" in sql.upper() or sql.startswith("SELECT 1 AS")])
+
+        resp, _ = self._post(1)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {"non_field_errors": ["You have already reviewed this business user."]})
+        self.assertEqual(Review.objects.get().rating, 4)
+        self.assertEqual(RatingAggregate.objects.summaries([self.business.id])[self.business.id]["count"], 1)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        error = IntegrityError("NOT NULL constraint failed: reviews_app_review.rating")
+        with mock.patch("rest_framework.serializers.ModelSerializer.create", side_effect=error):
+            with self.assertRaises(IntegrityError):
+                self._post(4)
+        self.assertFalse(Review.objects.exists())
+
+    def test_database_enforces_one_review_per_business_user(self):
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=3)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5)
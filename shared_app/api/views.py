@@ -1,9 +1,7 @@
-from django.db.models import Avg
-
 from rest_framework import permissions, status, generics
 from rest_framework.response import Response
 
-from reviews_app.models import Review
+from reviews_app.models import RatingAggregate
 from auth_app.models import CustomUser
 from offers_app.models import Offer
 from .serializers import BaseInfoSerializer
@@ -15,12 +13,16 @@ class BaseInfoView(generics.GenericAPIView):
     serializer_class = BaseInfoSerializer
 
     def get(self, request):
-        """Compute counts and average rating; return serialized output."""
-        avg = Review.objects.aggregate(avg=Avg('rating'))['avg'] or 0.0
+        """Compute counts and average rating; return serialized output.
+
+        Review totals are summed from the per-business RatingAggregate rows
+        instead of scanning every review.
+        """
+        review_count, average_rating = RatingAggregate.objects.totals()
 
         data = {
-            "review_count": Review.objects.count(),
-            "average_rating": round(float(avg), 2),
+            "review_count": review_count,
+            "average_rating": average_rating,
             "business_profile_count": CustomUser.objects.filter(
                 type=CustomUser.Roles.BUSINESS
             ).count(),
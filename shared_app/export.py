@@ -0,0 +1,132 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.negotiation import DefaultContentNegotiation
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_CHUNK_SIZE = 2000
+# Zellen mit diesen Anfängen würden Excel/LibreOffice als Formel ausführen
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ExportFormatNegotiation(DefaultContentNegotiation):
+    """Render errors as JSON; `?format=` picks the export format, not a DRF renderer."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        """Always use the first renderer."""
+        return (renderers[0], renderers[0].media_type)
+
+
+def parse_bound(value, name, end_of_day=False):
+    """Parse an ISO date or datetime query value into an aware datetime (400 if invalid)."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({name: 'Use an ISO date (YYYY-MM-DD) or datetime.'})
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        """Return value instead of buffering it."""
+        return value
+
+
+def _csv_value(value):
+    """Format one cell as text: ISO datetimes, JSON for lists/dicts, empty for None, formulas quoted with `'`."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        text = value.isoformat()
+    elif isinstance(value, (list, dict)):
+        text = json.dumps(value, ensure_ascii=False)
+    else:
+        text = str(value)
+    # Auch Zahlen (z. B. -5) prüfen: entscheidend ist der Text in der Zelle
+    if text.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + text
+    return text
+
+
+def render_rows(rows, headers, fmt, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as text chunks of up to chunk_size rows; never holds more."""
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(headers)
+
+        def encode(row):
+            return writer.writerow([_csv_value(v) for v in row])
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+        def encode(row):
+            return encoder.encode(dict(zip(headers, row))) + '\n'
+
+    chunk = []
+    for row in rows:
+        chunk.append(encode(row))
+        if len(chunk) >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+class StreamingExportView(generics.GenericAPIView):
+    """Stream a queryset as CSV or NDJSON without materializing it.
+
+    Subclasses set `export_columns` as (header, values() lookup) pairs and
+    `export_filename`, and may override `get_export_rows`. Supports
+    `?format=csv|ndjson` and `?created_after=` / `?created_before=` (ISO
+    date or datetime, inclusive).
+    """
+    export_columns = ()
+    export_filename = 'export'
+    chunk_size = EXPORT_CHUNK_SIZE
+    content_negotiation_class = ExportFormatNegotiation
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        """Return a StreamingHttpResponse fed by QuerySet.iterator(chunk_size)."""
+        fmt = request.query_params.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({'format': f'Must be one of {list(EXPORT_FORMATS)}.'})
+        created = self.created_range()
+        rows = self.get_export_rows(created)
+        headers = [header for header, _ in self.export_columns]
+        response = StreamingHttpResponse(
+            render_rows(rows, headers, fmt, self.chunk_size), content_type=EXPORT_FORMATS[fmt]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.export_filename}.{fmt}"'
+        return response
+
+    def created_range(self):
+        """Return the created_at lookups from `?created_after=` / `?created_before=`."""
+        params, lookups = self.request.query_params, {}
+        if params.get('created_after'):
+            lookups['created_at__gte'] = parse_bound(params['created_after'], 'created_after')
+        if params.get('created_before'):
+            lookups['created_at__lte'] = parse_bound(params['created_before'], 'created_before', end_of_day=True)
+        return lookups
+
+    def get_export_rows(self, created):
+        """Return an iterator of value tuples in export_columns order, oldest first."""
+        lookups = [lookup for _, lookup in self.export_columns]
+        queryset = self.filter_queryset(self.get_queryset()).filter(**created)
+        return queryset.order_by('created_at', 'id').values_list(*lookups).iterator(chunk_size=self.chunk_size)
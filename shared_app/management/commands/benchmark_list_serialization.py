@@ -0,0 +1,111 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from offers_app.api.serializers import OfferSerializer
+from orders_app.models import FeatureSet, Order
+from orders_app.api.serializers import OrderReadSerializer
+from profile_app.models import UserProfile
+from profile_app.api.serializers import TypeSpecificProfileSerializer
+from reviews_app.models import Review
+from reviews_app.api.serializers import ReviewSerializer
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark fixture."""
+
+
+class Command(BaseCommand):
+    """Compare rows/s of ModelSerializer lists with the values() projection path."""
+    help = "Benchmark list serialization: ModelSerializer vs. values() projection (data is rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        """Build a throwaway fixture, time both paths per endpoint, then roll back."""
+        try:
+            with transaction.atomic():
+                self._create_fixture(options['rows'])
+                for label, serializer_class, queryset in self._cases():
+                    self._report(label, serializer_class, queryset, options['repeat'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _cases(self):
+        """Return (label, serializer class, queryset as the list view builds it)."""
+        return [
+            ('offers', OfferSerializer, Offer.objects.select_related('user').prefetch_related('details')),
+            ('orders', OrderReadSerializer, Order.objects.all()),
+            ('reviews', ReviewSerializer, Review.objects.select_related('business_user__rating_aggregate')),
+            ('profiles', TypeSpecificProfileSerializer, UserProfile.objects.all()),
+        ]
+
+    def _report(self, label, serializer_class, queryset, repeat):
+        """Print the best-of-N rows/s for both paths and check they agree."""
+        request = Request(APIRequestFactory().get('/api/'))
+        context = {'request': request}
+
+        def regular():
+            return serializer_class(queryset.all(), many=True, context=context).data
+
+        def projected():
+            serializer = serializer_class(context=context)
+            return serializer.project(serializer.projection_queryset(queryset.all()))
+
+        rows = queryset.count()
+        timings = {name: self._best_of(fn, repeat) for name, fn in (('serializer', regular), ('projection', projected))}
+        if [dict(r) for r in regular()] != projected():
+            self.stderr.write(self.style.ERROR(f"{label}: projection output differs"))
+        self.stdout.write(
+            f"{label:<9} {rows:>6} rows  "
+            f"serializer {rows / timings['serializer']:>9.0f} rows/s  "
+            f"projection {rows / timings['projection']:>9.0f} rows/s  "
+            f"x{timings['serializer'] / timings['projection']:.1f}"
+        )
+
+    def _best_of(self, fn, repeat):
+        """Return the fastest wall time of fn() over repeat runs."""
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def _create_fixture(self, n):
+        """Insert n offers (3 details each), orders, reviews and profiles with bulk_create."""
+        business = CustomUser.objects.create(username='bench-biz', email='bench-biz@example.com', type=CustomUser.Roles.BUSINESS)
+        customers = CustomUser.objects.bulk_create([
+            CustomUser(username=f'bench-cust-{i}', email=f'bench-{i}@example.com', type=CustomUser.Roles.CUSTOMER)
+            for i in range(n)
+        ])
+        UserProfile.objects.bulk_create([
+            UserProfile(user=c, username=c.username, email=c.email, type=c.type, location='Berlin')
+            for c in customers
+        ])
+        offers = Offer.objects.bulk_create([
+            Offer(user=business, title=f'Offer {i}', description='Benchmark offer', min_price=10, min_delivery_time=1)
+            for i in range(n)
+        ])
+        details = OfferDetail.objects.bulk_create([
+            OfferDetail(offer=o, title=t, offer_type=t, price=10 * (k + 1), delivery_time_in_days=k + 1, features=['a', 'b'])
+            for o in offers for k, t in enumerate(OfferDetail.OfferTypes.values)
+        ])
+        feature_sets = FeatureSet.objects.intern_many([d.features for d in details[::3]])
+        Order.objects.bulk_create([
+            Order(offer=d.offer, offer_detail=d, customer_user=c, business_user=business, title=d.title,
+                  price=d.price, feature_set=fs, offer_type=d.offer_type)
+            for d, c, fs in zip(details[::3], customers, feature_sets)
+        ])
+        Review.objects.bulk_create([
+            Review(business_user=business, reviewer=c, rating=1 + i % 5, description='ok')
+            for i, c in enumerate(customers)
+        ])
@@ -0,0 +1,180 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (cursor) pagination over `(sort key, id)`.
+
+    Pages are fetched with `WHERE (key, id) > (last_key, last_id) LIMIT n`
+    instead of OFFSET, so every page costs the same at any depth. The sort
+    key follows `?ordering=` (one of the view's `ordering_fields`) and
+    defaults to `default_ordering`; `id` breaks ties, so the sort key needs
+    an index that ends in (key, id) for the filters in use.
+    No COUNT(*) is run unless `?count=true` is passed, in which case an
+    approximate count is returned.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    default_ordering = '-created_at'
+    approximate_count_cap = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of model instances positioned after/before the cursor."""
+        cursor = self.start_page(queryset.model, request, view)
+        self.total = self.approximate_count(queryset, request)
+
+        queryset = queryset.order_by(*self._order_by(self.scan_descending))
+        if cursor:
+            queryset = queryset.filter(self._after(cursor['v'], cursor['id'], self.scan_descending))
+        return self.finish_page(queryset)
+
+    def start_page(self, model, request, view):
+        """Read page size, sort key and cursor from the request; return the decoded cursor or None."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = model
+        self.key, self.descending = self.get_ordering(request, view)
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['r'])
+        # Rückwärts blättern = in umgekehrter Richtung scannen
+        self.scan_descending = self.descending != self.reverse
+        return self.cursor
+
+    def finish_page(self, queryset):
+        """Fetch page_size + 1 rows of the ordered, cursor-filtered queryset and set the link state."""
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else True
+        self.has_previous = bool(self.cursor) if not self.reverse else has_more
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        """Return results with next/previous cursor links (and count if asked)."""
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.total is not None:
+            payload = {'count': self.total, 'count_is_approximate': True, **payload}
+        return Response(payload)
+
+    def get_page_size(self, request):
+        """Honor `?page_size=` within max_page_size."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request, view):
+        """Return (key field, descending) from `?ordering=` or the default."""
+        allowed = set(getattr(view, 'ordering_fields', None) or [])
+        for term in request.query_params.get('ordering', '').split(','):
+            term = term.strip()
+            if term.lstrip('-') in allowed:
+                return term.lstrip('-'), term.startswith('-')
+        return self.default_ordering.lstrip('-'), self.default_ordering.startswith('-')
+
+    def _order_by(self, descending):
+        """Order by key then id in the scan direction (index-friendly, no NULLS modifier)."""
+        if descending:
+            return [f'-{self.key}', '-id']
+        return [self.key, 'id']
+
+    def _after(self, value, pk, descending):
+        """Build the keyset condition for rows strictly after (value, pk) in scan order.
+
+        NULL keys keep the backend's native position (largest on PostgreSQL,
+        smallest on SQLite) so the (key, id) index still serves the ORDER BY.
+        """
+        cmp = 'lt' if descending else 'gt'
+        id_after = Q(**{f'id__{cmp}': pk})
+        if not self.model._meta.get_field(self.key).null:
+            return Q(**{f'{self.key}__{cmp}': value}) | (Q(**{self.key: value}) & id_after)
+        key_null = Q(**{f'{self.key}__isnull': True})
+        nulls_at_end = descending != connection.features.nulls_order_largest
+        if value is None:
+            if nulls_at_end:
+                return key_null & id_after
+            return (key_null & id_after) | ~key_null
+        key_after = Q(**{f'{self.key}__{cmp}': value}) | (Q(**{self.key: value}) & id_after)
+        return key_after | key_null if nulls_at_end else key_after
+
+    def approximate_count(self, queryset, request):
+        """Return an approximate row count if `?count=true`, else None.
+
+        PostgreSQL uses the planner's row estimate; other backends count at
+        most `approximate_count_cap` rows so the cost stays bounded.
+        """
+        if request.query_params.get(self.count_query_param, '').lower() not in ('1', 'true', 'yes'):
+            return None
+        if connection.vendor == 'postgresql':
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        return queryset.order_by()[:self.approximate_count_cap].count()
+
+    def encode_cursor(self, instance, reverse):
+        """Serialize the boundary row's (key, id) into an opaque cursor token."""
+        value = getattr(instance, self.key)
+        raw = json.dumps({'v': None if value is None else str(value), 'id': instance.id, 'r': int(reverse)})
+        return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """Parse `?cursor=`; empty means first page, garbage raises 404."""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+            data = json.loads(raw)
+            field = self.model._meta.get_field(self.key)
+            value = data['v']
+            return {
+                'v': None if value is None else field.to_python(value),
+                'id': int(data['id']),
+                'r': bool(data.get('r')),
+            }
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _link(self, instance, reverse):
+        """Build a page link carrying the cursor for the given boundary row."""
+        url = replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(instance, reverse))
+        return remove_query_param(url, 'page')
+
+    def get_next_link(self):
+        """Return the link to the page after the current one, if any."""
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Return the link to the page before the current one, if any."""
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
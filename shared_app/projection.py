@@ -0,0 +1,166 @@
+import decimal
+from functools import cached_property
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from rest_framework.relations import RelatedField
+from rest_framework.response import Response
+
+# Fields whose to_representation() is the identity for the Python value values() returns
+_IDENTITY_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.JSONField, serializers.ChoiceField, RelatedField,
+)
+
+
+def _not_none(convert):
+    """Wrap a converter so None passes through, as Serializer.to_representation does."""
+    return lambda value: None if value is None else convert(value)
+
+
+def _datetime_converter(field):
+    """ISO-8601 DateTimeField output with the field's timezone resolved once."""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return _not_none(field.to_representation)
+    slow = field.to_representation
+
+    def convert(value):
+        if value is None or value.tzinfo is None:
+            return slow(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _decimal_converter(field):
+    """String DecimalField output with quantum and context built once."""
+    coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.decimal_places is None or field.normalize_output or field.localize:
+        return _not_none(field.to_representation)
+    quantum = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+    slow = field.to_representation
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return None if value is None else slow(value)
+        return f'{value.quantize(quantum, rounding=rounding, context=context):f}'
+    return convert
+
+
+def compile_converter(field, model):
+    """Return a converter from a raw values() value to the field's representation.
+
+    Identity-like fields get None (no call at all); datetime and Decimal
+    fields get converters with their timezone/quantum resolved up front; file
+    fields build the storage URL without a FieldFile. Anything else falls
+    back to to_representation, which keeps the output identical.
+    """
+    if isinstance(field, serializers.FileField):
+        storage = model._meta.get_field(field.source).storage
+        request = field.context.get('request')
+        if request is not None:
+            return lambda name: request.build_absolute_uri(storage.url(name)) if name else None
+        return lambda name: storage.url(name) if name else None
+    if isinstance(field, _IDENTITY_FIELDS) and not isinstance(field, serializers.ManyRelatedField):
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    return _not_none(field.to_representation)
+
+
+class ProjectionSerializerMixin:
+    """Read-only fast path that renders rows from `QuerySet.values_list()`.
+
+    Skips model instantiation and the per-field attribute pipeline; output
+    is identical to `.data` for the same rows. Fields that are not plain
+    model columns are declared in `projection_columns` (field name -> values()
+    paths) and rendered by a `project_<name>(*values)` method.
+    """
+    projection_columns = {}
+
+    @cached_property
+    def _projection_plan(self):
+        """Return ([column, ...], [(field name, getter, converter, combine), ...])."""
+        columns, plan = {}, []
+
+        def index(path):
+            return columns.setdefault(path, len(columns))
+
+        for name, field in self.fields.items():
+            if name in self.projection_columns:
+                getter = itemgetter(*[index(p) for p in self.projection_columns[name]])
+                arity = len(self.projection_columns[name])
+                plan.append((name, getter, getattr(self, f'project_{name}'), arity > 1))
+                continue
+            if field.write_only:
+                continue
+            if field.source == '*' or '.' in field.source or isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(f'{type(self).__name__}.{name} needs a projection_columns entry.')
+            plan.append((name, itemgetter(index(field.source)), compile_converter(field, self.Meta.model), False))
+        return list(columns), plan
+
+    @property
+    def projection_index(self):
+        """Map each selected values() path to its position in a row."""
+        return {path: i for i, path in enumerate(self._projection_plan[0])}
+
+    def projection_queryset(self, queryset, extra_columns=()):
+        """Return queryset as named value rows holding every column the fields read."""
+        columns = list(self._projection_plan[0])
+        columns += [c for c in extra_columns if c not in columns]
+        return queryset.prefetch_related(None).values_list(*columns, named=True)
+
+    def prepare_projection(self, rows):
+        """Hook: batch-load whatever the project_<name> methods need for these rows."""
+
+    def project(self, rows):
+        """Render value rows to the same list of dicts `many=True` `.data` would give."""
+        rows = list(rows)
+        self.prepare_projection(rows)
+        plan = self._projection_plan[1]
+        out = []
+        for row in rows:
+            item = {}
+            for name, getter, convert, spread in plan:
+                value = getter(row)
+                if spread:
+                    item[name] = convert(*value)
+                else:
+                    item[name] = value if convert is None else convert(value)
+            out.append(item)
+        return out
+
+
+class ProjectionListMixin:
+    """List view mixin serving GET pages through the serializer's projection.
+
+    Set `use_projection = False` to fall back to the regular serializer path.
+    """
+    use_projection = True
+
+    def projection_extra_columns(self):
+        """Extra values() columns the paginator needs on each row."""
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        """Render the (paginated) list from value rows instead of model instances."""
+        if not self.use_projection:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer()
+        rows = serializer.projection_queryset(
+            self.filter_queryset(self.get_queryset()), self.projection_extra_columns()
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.project(page))
+        return Response(serializer.project(rows))
@@ -0,0 +1,54 @@
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# "SCAN <table>" without USING ... = full table scan. Index walks
+# ("SCAN t USING [COVERING] INDEX i") and virtual tables (FTS5) are fine.
+FULL_SCAN_RE = re.compile(r'^SCAN \S+$')
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE')
+_IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE', 'ROLLBACK', 'BEGIN', 'COMMIT')
+
+
+def explain_query_plan(sql, params=None):
+    """Return the SQLite `EXPLAIN QUERY PLAN` detail lines for one statement."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params or ())
+        return [row[3] for row in cursor.fetchall()]
+
+
+class QueryPlanAssertionsMixin:
+    """TestCase mixin that fails when a request's SQL plan regresses.
+
+    Every statement a request executes is re-run through EXPLAIN QUERY PLAN;
+    a full table scan or a temp B-tree sort fails the test. SQLite only.
+    """
+
+    def setUp(self):
+        super().setUp()
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN assertions require SQLite.')
+
+    def capture_plans(self, do_request):
+        """Run do_request() and return (response, [(sql, plan_lines), ...])."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = do_request()
+        plans = [
+            (q['sql'], explain_query_plan(q['sql']))
+            for q in ctx.captured_queries
+            if not q['sql'].lstrip().upper().startswith(_IGNORED_PREFIXES)
+        ]
+        return response, plans
+
+    def assertIndexedPlans(self, do_request, allow_sort=False):
+        """Assert no statement of the request full-scans or (unless allowed) sorts."""
+        response, plans = self.capture_plans(do_request)
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', None))
+        self.assertTrue(plans, 'Request executed no SQL.')
+        for sql, plan in plans:
+            report = f'\n{sql}\n  ' + '\n  '.join(plan)
+            for line in plan:
+                self.assertIsNone(FULL_SCAN_RE.match(line), f'Full table scan:{report}')
+                if not allow_sort:
+                    self.assertIsNone(TEMP_SORT_RE.search(line), f'Temp B-tree sort:{report}')
+        return response
@@ -0,0 +1,90 @@
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+_READ_METHODS = ('GET', 'HEAD')
+
+
+def _split(value):
+    """Split a comma-separated query value into a list of names."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def requested_field_names(request, available):
+    """Return the field names selected by `?fields=`/`?omit=`, or None if unrestricted.
+
+    Only read requests are narrowed. Unknown names are rejected with a 400
+    so typos do not silently return an empty object.
+    """
+    if request is None or request.method not in _READ_METHODS:
+        return None
+    params = getattr(request, 'query_params', request.GET)
+    fields, omit = _split(params.get(FIELDS_PARAM, '')), _split(params.get(OMIT_PARAM, ''))
+    if not fields and not omit:
+        return None
+
+    available = list(available)
+    unknown = sorted(set(fields + omit) - set(available))
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: f'Unknown field(s): {", ".join(unknown)}.'})
+    keep = [name for name in available if name in fields] if fields else available
+    return [name for name in keep if name not in omit]
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer mixin: `?fields=a,b` keeps only those fields, `?omit=a,b` drops them.
+
+    `sparse_columns` maps a serializer field to the model columns it reads
+    (`rel__col` for select_related columns); unmapped fields read the model
+    column of the same name, if any. SparseFieldsetViewMixin uses this to
+    build the matching `.only()`.
+    """
+    sparse_columns = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        names = requested_field_names(self.context.get('request'), self.fields.keys())
+        if names is not None:
+            for name in set(self.fields.keys()) - set(names):
+                self.fields.pop(name)
+
+    @classmethod
+    def sparse_only_columns(cls, names):
+        """Return the model columns needed to render the given serializer fields."""
+        model_fields = {f.name for f in cls.Meta.model._meta.concrete_fields}
+        columns = ['pk']
+        for name in names:
+            if name in cls.sparse_columns:
+                columns.extend(cls.sparse_columns[name])
+            elif name in model_fields:
+                columns.append(name)
+        return list(dict.fromkeys(columns))
+
+
+class SparseFieldsetViewMixin:
+    """View mixin narrowing the queryset to the columns a sparse fieldset reads.
+
+    Unrequested columns are left out via `.only()`; select_related joins and
+    prefetches the remaining fields do not use are dropped.
+    """
+
+    def sparse_queryset(self, queryset, extra_columns=()):
+        """Apply `.only()` and trim relation loading for `?fields=`/`?omit=`."""
+        serializer_class = self.get_serializer_class()
+        names = requested_field_names(self.request, serializer_class().fields.keys())
+        if names is None:
+            return queryset
+
+        columns = serializer_class.sparse_only_columns(names) + list(extra_columns)
+        related = {c.split('__', 1)[0] for c in columns if '__' in c}
+        if isinstance(queryset.query.select_related, dict):
+            keep = [r for r in queryset.query.select_related if r in related]
+            queryset = queryset.select_related(None)
+            if keep:
+                queryset = queryset.select_related(*keep)
+        roots = set(names) | {c.split('__', 1)[0] for c in columns}
+        prefetches = [
+            p for p in queryset._prefetch_related_lookups
+            if getattr(p, 'prefetch_through', p).split('__', 1)[0] in roots
+        ]
+        return queryset.prefetch_related(None).prefetch_related(*prefetches).only(*columns)
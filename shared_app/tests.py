@@ -1,3 +1,89 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from auth_app.models import CustomUser
+from offers_app.models import Offer, OfferDetail
+from offers_app.api.cache import offers_list_cache
+from offers_app.api.views import OffersView
+from orders_app.models import FeatureSet, Order
+from orders_app.api.views import OrdersView
+from profile_app.api.views import BussinessProfileView, CustomerProfileView
+from reviews_app.models import Review
+from reviews_app.api.views import ReviewView
+from shared_app.query_plans import QueryPlanAssertionsMixin
+
+
+class BaseInfoQueryPlanTest(QueryPlanAssertionsMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS
+        )
+        customer = CustomUser.objects.create_user(username="cust", email="cust@mail.de", password="pw")
+        Offer.objects.create(user=business, title="Logo", description="x")
+        Review.objects.create(business_user=business, reviewer=customer, rating=4)
+
+    def test_base_info_is_index_served(self):
+        resp = self.assertIndexedPlans(lambda: self.client.get(reverse("shared_app:base-info")))
+        self.assertEqual(resp.data["review_count"], 1)
+        self.assertEqual(resp.data["business_profile_count"], 1)
+
+
+class ProjectionParityTest(APITestCase):
+
+    def setUp(self):
+        self.business = CustomUser.objects.create_user(
+            username="biz", email="biz@mail.de", password="pw", type=CustomUser.Roles.BUSINESS,
+            first_name="Ada",
+        )
+        self.customer = CustomUser.objects.create_user(
+            username="cust", email="cust@mail.de", password="pw", type=CustomUser.Roles.CUSTOMER
+        )
+        self.business.profile.file = "profile_files/ada.png"
+        self.business.profile.save()
+        with_image = Offer.objects.create(user=self.business, title="Logo", description="x", image="offer_images/logo.png")
+        Offer.objects.create(user=self.business, title="Empty", description="")
+        detail = OfferDetail.objects.create(
+            offer=with_image, title="basic", offer_type="basic", price=99, features=["a", "ü"], delivery_time_in_days=3
+        )
+        Order.objects.create(
+            offer=with_image, offer_detail=detail, customer_user=self.customer, business_user=self.business,
+            title=detail.title, price=detail.price, feature_set=FeatureSet.objects.intern(detail.features),
+            offer_type=detail.offer_type,
+        )
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description="top")
+        self.client.force_authenticate(self.customer)
+
+    def test_projection_output_is_byte_identical(self):
+        cases = [
+            (OffersView, "offers:offers", {}),
+            (OffersView, "offers:offers", {"cursor": "", "ordering": "min_price"}),
+            (OffersView, "offers:offers", {"fields": "id,image,details,user_details"}),
+            (OrdersView, "orders:orders", {}),
+            (ReviewView, "reviews_app:reviews-list-create", {}),
+            (ReviewView, "reviews_app:reviews-list-create", {"ordering": "-rating", "page_size": 1}),
+            (BussinessProfileView, "profile_app:business-profile", {}),
+            (CustomerProfileView, "profile_app:customer-profile", {"omit": "description"}),
+        ]
+        for view, name, params in cases:
+            with self.subTest(name=name, params=params):
+                offers_list_cache.cache.clear()
+                fast = self.client.get(reverse(name), params)
+                offers_list_cache.cache.clear()
+                with mock.patch.object(view, "use_projection", False):
+                    slow = self.client.get(reverse(name), params)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_benchmark_command_reports_each_endpoint(self):
+        out, err = StringIO(), StringIO()
+        call_command("benchmark_list_serialization", rows=5, repeat=1, stdout=out, stderr=err)
+        self.assertEqual(err.getvalue(), "")
+        for label in ("offers", "orders", "reviews", "profiles"):
+            self.assertIn(label, out.getvalue())
+        self.assertFalse(Offer.objects.filter(title__startswith="Offer ").exists())